@@ -9,7 +9,9 @@ Tools to help interfacing with the Game Boy hardware
 from . import constants
 from .gameshark import GameShark
 from .screen import Screen
+from .snapshot import IncrementalSnapshot, Snapshot
 from .sprite import Sprite
+from .state_file import StateFile
 from .tile import Tile
 from .tilemap import TileMap
 
@@ -20,8 +22,11 @@ from .tilemap import TileMap
 __all__ = [
     "constants",
     "GameShark",
+    "IncrementalSnapshot",
     "Screen",
+    "Snapshot",
     "Sprite",
+    "StateFile",
     "Tile",
     "TileMap",
 ]
@@ -1,11 +1,14 @@
-from libc.stdint cimport uint64_t
+cimport cython
 
 
 cdef class MemoryScanner:
     cdef object pyboy
-    cdef dict _memory_cache
+    cdef object _addresses, _values
     cdef int _memory_cache_byte_width
+    cdef object _value_type
 
     cpdef list rescan_memory(self, object new_value=*, dynamic_comparison_type=*, byteorder=*)
     cpdef list scan_memory(self, object target_value=*, int start_addr=*, int end_addr=*, standard_comparison_type=*, value_type=*, int byte_width=*, byteorder=*)
-    cpdef bint _check_value(self, uint64_t, uint64_t, int)noexcept
+    @cython.locals(start_addr=int, multiplier=object)
+    cdef object _read_values(self, object, int, object, object)
+    cdef object _check_values(self, object, object, int)
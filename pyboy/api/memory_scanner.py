@@ -1,6 +1,6 @@
 from enum import Enum
 
-from pyboy.utils import bcd_to_dec
+import numpy as np
 
 
 class StandardComparisonType(Enum):
@@ -35,8 +35,11 @@ class MemoryScanner:
 
     def __init__(self, pyboy):
         self.pyboy = pyboy
-        self._memory_cache = {}
+        # Candidate addresses and their last seen values, kept as NumPy arrays
+        self._addresses = np.zeros(0, dtype=np.int64)
+        self._values = np.zeros(0, dtype=np.int64)
         self._memory_cache_byte_width = 1
+        self._value_type = ScanMode.INT
 
     def scan_memory(
         self,
@@ -71,22 +74,20 @@ class MemoryScanner:
         Returns:
             list of int: A list of addresses where the target value is found.
         """
-        self._memory_cache = {}
         self._memory_cache_byte_width = byte_width
-        for addr in range(
-            start_addr, end_addr - (byte_width - 1) + 1
-        ):  # Adjust the loop to prevent reading past end_addr
-            # Read multiple bytes based on byte_width and byteorder
-            value_bytes = self.pyboy.memory[addr : addr + byte_width]
-            value = int.from_bytes(value_bytes, byteorder)
+        self._value_type = value_type
+        # Adjust the range to prevent reading past end_addr
+        addresses = np.arange(start_addr, max(start_addr, end_addr - (byte_width - 1) + 1), dtype=np.int64)
+        values = self._read_values(addresses, byte_width, value_type, byteorder)
 
-            if value_type == ScanMode.BCD:
-                value = bcd_to_dec(value, byte_width, byteorder)
-
-            if target_value is None or self._check_value(value, target_value, standard_comparison_type.value):
-                self._memory_cache[addr] = value
+        if target_value is not None:
+            mask = self._check_values(values, target_value, standard_comparison_type.value)
+            addresses = addresses[mask]
+            values = values[mask]
 
-        return list(self._memory_cache.keys())
+        self._addresses = addresses
+        self._values = values
+        return addresses.tolist()
 
     def rescan_memory(
         self, new_value=None, dynamic_comparison_type=DynamicComparisonType.UNCHANGED, byteorder="little"
@@ -117,62 +118,83 @@ class MemoryScanner:
         Returns:
             list of int: A list of addresses remaining in the memory cache after the rescan.
         """
-        for addr, value in self._memory_cache.copy().items():
-            current_value = int.from_bytes(
-                self.pyboy.memory[addr : addr + self._memory_cache_byte_width], byteorder=byteorder
-            )
-            if dynamic_comparison_type == DynamicComparisonType.UNCHANGED:
-                if value != current_value:
-                    self._memory_cache.pop(addr)
-                else:
-                    self._memory_cache[addr] = current_value
-            elif dynamic_comparison_type == DynamicComparisonType.CHANGED:
-                if value == current_value:
-                    self._memory_cache.pop(addr)
-                else:
-                    self._memory_cache[addr] = current_value
-            elif dynamic_comparison_type == DynamicComparisonType.INCREASED:
-                if value >= current_value:
-                    self._memory_cache.pop(addr)
-                else:
-                    self._memory_cache[addr] = current_value
-            elif dynamic_comparison_type == DynamicComparisonType.DECREASED:
-                if value <= current_value:
-                    self._memory_cache.pop(addr)
-                else:
-                    self._memory_cache[addr] = current_value
-            elif dynamic_comparison_type == DynamicComparisonType.MATCH:
-                if new_value is None:
-                    raise ValueError("new_value must be specified when using DynamicComparisonType.MATCH")
-                if current_value != new_value:
-                    self._memory_cache.pop(addr)
-                else:
-                    self._memory_cache[addr] = current_value
+        current_values = self._read_values(self._addresses, self._memory_cache_byte_width, self._value_type, byteorder)
+        if dynamic_comparison_type == DynamicComparisonType.UNCHANGED:
+            mask = current_values == self._values
+        elif dynamic_comparison_type == DynamicComparisonType.CHANGED:
+            mask = current_values != self._values
+        elif dynamic_comparison_type == DynamicComparisonType.INCREASED:
+            mask = current_values > self._values
+        elif dynamic_comparison_type == DynamicComparisonType.DECREASED:
+            mask = current_values < self._values
+        elif dynamic_comparison_type == DynamicComparisonType.MATCH:
+            if new_value is None:
+                raise ValueError("new_value must be specified when using DynamicComparisonType.MATCH")
+            mask = current_values == new_value
+        else:
+            raise ValueError("Invalid comparison type")
+
+        self._addresses = self._addresses[mask]
+        self._values = current_values[mask]
+        return self._addresses.tolist()
+
+    def _read_values(self, addresses, byte_width, value_type, byteorder):
+        """
+        Decodes the value of `byte_width` bytes at each of the sorted `addresses`, from a single snapshot of the memory
+        they span.
+
+        Args:
+            addresses (numpy.ndarray): The sorted addresses to decode.
+            byte_width (int): The number of bytes to consider for each value.
+            value_type (ScanMode): The type of value (INT or BCD) to decode.
+            byteorder (str): The endian type to use for INT values.
+
+        Returns:
+            numpy.ndarray: The decoded values. `int64` if they fit, otherwise Python ints in an `object` array.
+        """
+        # Up to 7 bytes fit in int64 for both INT and BCD, wider values fall back to Python ints
+        dtype = np.int64 if byte_width <= 7 else object
+        values = np.zeros(len(addresses), dtype=dtype)
+        if len(addresses) == 0:
+            return values
+
+        start_addr = int(addresses[0])
+        snapshot = self.pyboy.memory._copy(start_addr, int(addresses[-1]) + byte_width)
+        offsets = addresses - start_addr
+        multiplier = 1
+        for n in range(byte_width):
+            byte = snapshot[offsets + n].astype(dtype)
+            if value_type == ScanMode.BCD:
+                # Same as bcd_to_dec: the first byte in memory holds the two least significant digits
+                values += ((byte >> 4) * 10 + (byte & 0x0F)) * multiplier
+                multiplier *= 100
+            elif byteorder == "little":
+                values |= byte << (8 * n)
             else:
-                raise ValueError("Invalid comparison type")
-        return list(self._memory_cache.keys())
+                values |= byte << (8 * (byte_width - 1 - n))
+        return values
 
-    def _check_value(self, value, target_value, standard_comparison_type):
+    def _check_values(self, values, target_value, standard_comparison_type):
         """
-        Compares a value with the target value based on the specified compare type.
+        Compares the values with the target value based on the specified compare type.
 
         Args:
-            value (int): The value to compare.
-            target_value (int or None): The target value to compare against.
+            values (numpy.ndarray): The values to compare.
+            target_value (int): The target value to compare against.
             standard_comparison_type (StandardComparisonType): The type of comparison to use.
 
         Returns:
-            bool: True if the comparison condition is met, False otherwise.
+            numpy.ndarray: Boolean mask of the values meeting the comparison condition.
         """
         if standard_comparison_type == StandardComparisonType.EXACT.value:
-            return value == target_value
+            return values == target_value
         elif standard_comparison_type == StandardComparisonType.LESS_THAN.value:
-            return value < target_value
+            return values < target_value
         elif standard_comparison_type == StandardComparisonType.GREATER_THAN.value:
-            return value > target_value
+            return values > target_value
         elif standard_comparison_type == StandardComparisonType.LESS_THAN_OR_EQUAL.value:
-            return value <= target_value
+            return values <= target_value
         elif standard_comparison_type == StandardComparisonType.GREATER_THAN_OR_EQUAL.value:
-            return value >= target_value
+            return values >= target_value
         else:
             raise ValueError("Invalid comparison type")
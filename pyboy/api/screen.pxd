@@ -14,9 +14,12 @@ cdef class Screen:
     cpdef ((int, int), (int, int)) get_tilemap_position(self) noexcept
     # cdef readonly list tilemap_position_list
     # cdef readonly uint8_t[:,:] tilemap_position_list
-    cdef readonly uint32_t[:,:] raw_buffer
+    cdef readonly object tilemap_position_ndarray
+    cdef object _raw_buffer
     cdef readonly (int, int) raw_buffer_dims
     cdef readonly str raw_buffer_format
 
-    cdef readonly object ndarray
-    cdef readonly object image
+    cdef object _ndarray
+    cdef object _observation
+    cdef object _layers
+    cdef object _image
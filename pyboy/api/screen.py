@@ -33,30 +33,10 @@ class Screen:
     def __init__(self, mb):
         self.mb = mb
 
-        self.raw_buffer = self.mb.lcd.renderer._screenbuffer
-        """
-        Provides a raw, unfiltered `bytes` object with the data from the screen. Check
-        `Screen.raw_buffer_format` to see which dataformat is used. **The returned type and dataformat are
-        subject to change.** The screen buffer is row-major.
-
-        Use this, only if you need to bypass the overhead of `Screen.image` or `Screen.ndarray`.
-
-        Example:
-        ```python
-        >>> import numpy as np
-        >>> rows, cols = pyboy.screen.raw_buffer_dims
-        >>> ndarray = np.frombuffer(
-        ...     pyboy.screen.raw_buffer,
-        ...     dtype=np.uint8,
-        ... ).reshape(rows, cols, 4) # Just an example, use pyboy.screen.ndarray instead
-
-        ```
-
-        Returns
-        -------
-        memoryview:
-            92160 bytes memoryview of screen data.
-        """
+        if self.mb.lcd.renderer.indexed:
+            self._raw_buffer = self.mb.lcd.renderer._screenbuffer_indexed
+        else:
+            self._raw_buffer = self.mb.lcd.renderer._screenbuffer
         self.raw_buffer_dims = self.mb.lcd.renderer.buffer_dims
         """
         Returns the dimensions of the raw screen buffer. The screen buffer is row-major.
@@ -73,7 +53,7 @@ class Screen:
         tuple:
             A two-tuple of the buffer dimensions. E.g. (144, 160).
         """
-        self.raw_buffer_format = self.mb.lcd.renderer.color_format
+        self.raw_buffer_format = "P" if self.mb.lcd.renderer.indexed else self.mb.lcd.renderer.color_format
         """
         Returns the color format of the raw screen buffer. **This format is subject to change.**
 
@@ -91,12 +71,103 @@ class Screen:
 
         ```
 
+        When PyBoy is started with `screen_indexed=True`, the format is 'P' and each pixel is a single byte with the
+        palette index instead of the color. On DMG, this is the shade (0-3) after applying BGP, OBP0 or OBP1. On CGB,
+        it is `palette * 4 + color` for the background and window (0-31), and `32 + palette * 4 + color` for sprites
+        (32-63).
+
+        ```python
+        >>> pyboy_indexed = PyBoy("game_rom.gb", screen_indexed=True)
+        >>> pyboy_indexed.screen.raw_buffer_format
+        'P'
+        >>> pyboy_indexed.screen.ndarray.shape
+        (144, 160)
+        >>> pyboy_indexed.stop()
+
+        ```
+
         Returns
         -------
         str:
-            Color format of the raw screen buffer. E.g. 'RGBA'.
+            Color format of the raw screen buffer. E.g. 'RGBA' or 'P'.
+        """
+        self._image = None
+        if not Image:
+            logger.warning('Cannot generate screen image. Missing dependency "Pillow".')
+            self._image = utils.PillowImportError()
+        else:
+            self._set_image()
+
+        if self.mb.lcd.renderer.indexed:
+            self._ndarray = np.frombuffer(
+                self.mb.lcd.renderer._screenbuffer_indexed_raw,
+                dtype=np.uint8,
+            ).reshape(ROWS, COLS)
+        else:
+            self._ndarray = np.frombuffer(
+                self.mb.lcd.renderer._screenbuffer_raw,
+                dtype=np.uint8,
+            ).reshape(ROWS, COLS, 4)
+
+        self._observation = None
+        self._layers = None
+
+        self.tilemap_position_ndarray = np.frombuffer(
+            self.mb.lcd._scanlineparameters_raw,
+            dtype=np.intc,
+        ).reshape(ROWS, 5)
+        self.tilemap_position_ndarray.flags.writeable = False
+        """
+        Read-only view of the screen (SCX, SCY) and window (WX, WY) position for each horizontal line, followed by the
+        tile data select of the line. This is the same data as `Screen.tilemap_position_list`, but it is updated in
+        place, so reading it doesn't allocate anything.
+
+        Unlike `Screen.tilemap_position_list`, it keeps the positions of the last frame when the LCD is off.
+
+        Example:
+        ```python
+        >>> pyboy.screen.tilemap_position_ndarray.shape
+        (144, 5)
+        >>> scx = pyboy.screen.tilemap_position_ndarray[:, 0] # SCX of each line, without copying
+
+        ```
+
+        Returns
+        -------
+        numpy.ndarray:
+            Array of SCX, SCY, WX, WY and tile data select for each scanline (144x5).
+        """
+
+    @property
+    def raw_buffer(self):
+        """
+        Provides a raw, unfiltered `bytes` object with the data from the screen. Check
+        `Screen.raw_buffer_format` to see which dataformat is used. **The returned type and dataformat are
+        subject to change.** The screen buffer is row-major.
+
+        Use this, only if you need to bypass the overhead of `Screen.image` or `Screen.ndarray`.
+
+        Example:
+        ```python
+        >>> import numpy as np
+        >>> rows, cols = pyboy.screen.raw_buffer_dims
+        >>> ndarray = np.frombuffer(
+        ...     pyboy.screen.raw_buffer,
+        ...     dtype=np.uint8,
+        ... ).reshape(rows, cols, 4) # Just an example, use pyboy.screen.ndarray instead
+
+        ```
+
+        Returns
+        -------
+        memoryview:
+            92160 bytes memoryview of screen data. 23040 bytes in indexed mode.
         """
-        self.image = None
+        self.mb.lcd.render_deferred()
+        return self._raw_buffer
+
+    @property
+    def image(self):
         """
         Reference to a PIL Image from the screen buffer. **Remember to copy, resize or convert this object** if you
         intend to store it. The backing buffer will update, but it will be the same `PIL.Image` object.
@@ -114,21 +185,21 @@ class Screen:
 
         ```
 
+        When PyBoy is started with `screen_indexed=True`, it's a 'P' image of the palette indices, with the palette
+        of the colors they were last set to. See `Screen.raw_buffer_format`.
+
         Returns
         -------
         PIL.Image:
-            RGB image of (160, 144) pixels
+            RGBA image of (160, 144) pixels, or a 'P' image in indexed mode
         """
-        if not Image:
-            logger.warning('Cannot generate screen image. Missing dependency "Pillow".')
-            self.image = utils.PillowImportError()
-        else:
-            self._set_image()
+        self.mb.lcd.render_deferred()
+        if self.mb.lcd.renderer.indexed and Image:
+            self._set_palette()
+        return self._image
 
-        self.ndarray = np.frombuffer(
-            self.mb.lcd.renderer._screenbuffer_raw,
-            dtype=np.uint8,
-        ).reshape(ROWS, COLS, 4)
+    @property
+    def ndarray(self):
         """
         References the screen data in NumPy format. **Remember to copy this object** if you intend to store it.
         The backing buffer will update, but it will be the same `ndarray` object.
@@ -161,16 +232,193 @@ class Screen:
         Returns
         -------
         numpy.ndarray:
-            Screendata in `ndarray` of bytes with shape (144, 160, 4)
+            Screendata in `ndarray` of bytes with shape (144, 160, 4), or (144, 160) in indexed mode
         """
+        self.mb.lcd.render_deferred()
+        return self._ndarray
+
+    @property
+    def observation(self):
+        """
+        References the downscaled grayscale screen, if enabled with `Screen.set_observation`. Otherwise `None`.
+
+        Returns
+        -------
+        numpy.ndarray:
+            Observation in `ndarray` of bytes with the shape given to `Screen.set_observation`
+        """
+        self.mb.lcd.render_deferred()
+        return self._observation
+
+    def set_observation(self, shape=(72, 80), mode="box"):
+        """
+        Maintains a downscaled grayscale copy of the screen, which is updated as each scanline is rendered. This is
+        much cheaper than resizing `Screen.ndarray` after every frame. Like `Screen.ndarray`, the returned object stays
+        the same and is updated in place.
+
+        With `mode="box"`, each pixel is the average of the screen pixels it covers. This requires the shape to divide
+        (144, 160), like (72, 80) for 2x2 boxes. With `mode="nearest"`, each pixel is sampled from the screen, and any
+        shape up to (144, 160) is allowed, like (84, 84).
+
+        The grayscale value is the luma of the RGBA color. When PyBoy is started with `screen_indexed=True`, the palette
+        indices are used instead.
+
+        Example:
+        ```python
+        >>> observation = pyboy.screen.set_observation((72, 80), "box")
+        >>> observation.shape
+        (72, 80)
+        >>> pyboy.tick(1, True)
+        True
+        >>> observation is pyboy.screen.observation
+        True
+
+        ```
+
+        Args:
+            shape (tuple): Rows and columns of the observation.
+            mode (str): "box" or "nearest".
+
+        Returns
+        -------
+        numpy.ndarray:
+            Observation in `ndarray` of bytes with the given shape
+        """
+        rows, cols = shape
+        if not (0 < rows <= ROWS and 0 < cols <= COLS):
+            raise utils.PyBoyInvalidInputException(f"Observation shape has to be within ({ROWS}, {COLS})")
+        if mode == "box":
+            if ROWS % rows or COLS % cols:
+                raise utils.PyBoyInvalidInputException(f"Box observation shape has to divide ({ROWS}, {COLS})")
+        elif mode != "nearest":
+            raise utils.PyBoyInvalidInputException(f'Unknown observation mode: {mode}. Use "box" or "nearest"')
+
+        self._observation = np.frombuffer(
+            self.mb.lcd.renderer.set_observation(rows, cols, mode == "box"),
+            dtype=np.uint8,
+        ).reshape(rows, cols)
+        return self._observation
+
+    @property
+    def layers(self):
+        """
+        References the background, window and sprite planes, if enabled with `Screen.set_layers`. Otherwise `None`.
+
+        Returns
+        -------
+        numpy.ndarray:
+            Palette indices in `ndarray` of bytes with shape (3, 144, 160)
+        """
+        self.mb.lcd.render_deferred()
+        return self._layers
+
+    def set_layers(self):
+        """
+        Renders the background, the window and the sprites into three separate planes, besides the composited screen.
+        The planes are filled in the same pass as the screen, and like `Screen.ndarray`, the returned object stays the
+        same and is updated in place.
+
+        Each pixel is a palette index, like when PyBoy is started with `screen_indexed=True` (see
+        `Screen.raw_buffer_format`). Pixels which a layer doesn't cover are 255. This is the case for the background
+        where the window is drawn, and the other way around. The sprite plane has all the sprite pixels, also the ones
+        that are hidden behind the background.
+
+        Example:
+        ```python
+        >>> layers = pyboy.screen.set_layers()
+        >>> layers.shape
+        (3, 144, 160)
+        >>> pyboy.tick(1, True)
+        True
+        >>> background, window, sprites = layers
+        >>> layers is pyboy.screen.layers
+        True
+
+        ```
+
+        Returns
+        -------
+        numpy.ndarray:
+            Background, window and sprite planes in `ndarray` of bytes with shape (3, 144, 160)
+        """
+        if self._layers is None:
+            self._layers = np.frombuffer(
+                self.mb.lcd.renderer.set_layers(),
+                dtype=np.uint8,
+            ).reshape(3, ROWS, COLS)
+        return self._layers
+
+    @property
+    def frame_hash(self):
+        """
+        A 64-bit hash of the pixels in the screen buffer. It is updated as each scanline is rendered, so reading it
+        is free. Identical frames have the same hash, which can be used to skip encoding or processing repeated frames.
+
+        The hash is only updated for frames that are rendered. See `pyboy.PyBoy.tick`.
+
+        Example:
+        ```python
+        >>> pyboy.tick(1, True)
+        True
+        >>> frame_hash = pyboy.screen.frame_hash
+        >>> frame_hash == pyboy.screen.frame_hash
+        True
+
+        ```
+
+        Returns
+        -------
+        int:
+            Hash of the last rendered frame
+        """
+        self.mb.lcd.render_deferred()
+        return self.mb.lcd.renderer.frame_hash
+
+    @property
+    def changed_since_last_frame(self):
+        """
+        Whether the last rendered frame differs from the one rendered before it, based on `Screen.frame_hash`.
+
+        Example:
+        ```python
+        >>> pyboy.tick(1, True)
+        True
+        >>> if pyboy.screen.changed_since_last_frame:
+        ...     image = pyboy.screen.image.copy()
+
+        ```
+
+        Returns
+        -------
+        bool:
+            True if the screen changed between the last two rendered frames
+        """
+        self.mb.lcd.render_deferred()
+        return self.mb.lcd.renderer.frame_hash != self.mb.lcd.renderer.prev_frame_hash
 
     def _set_image(self):
-        self.image = Image.frombuffer(
-            self.mb.lcd.renderer.color_format,
+        self._image = Image.frombuffer(
+            self.raw_buffer_format,
             self.mb.lcd.renderer.buffer_dims[::-1],
-            self.mb.lcd.renderer._screenbuffer_raw,
+            self.mb.lcd.renderer._screenbuffer_indexed_raw
+            if self.mb.lcd.renderer.indexed
+            else self.mb.lcd.renderer._screenbuffer_raw,
         )
 
+    def _set_palette(self):
+        # Colors of the palette indices. See raw_buffer_format
+        if self.mb.lcd.renderer.cgb:
+            colors = [self.mb.lcd.bcpd.palette_mem_rgb[n] for n in range(32)]
+            colors += [self.mb.lcd.ocpd.palette_mem_rgb[n] for n in range(32)]
+        else:
+            colors = [self.mb.lcd.BGP.palette_mem_rgb[n] for n in range(4)]
+
+        palette = []
+        for color in colors:
+            # Stored as RGBA in little-endian
+            palette += [color & 0xFF, (color >> 8) & 0xFF, (color >> 16) & 0xFF]
+        self._image.putpalette(palette)
+
     @property
     def tilemap_position_list(self):
         """
@@ -178,7 +426,8 @@ class Screen:
         screen buffer. These parameters are often used for visual effects, and some games will reset the registers at
         the end of each call to `pyboy.PyBoy.tick()`.
 
-        See `Screen.get_tilemap_position` for more information.
+        See `Screen.get_tilemap_position` for more information. `Screen.tilemap_position_ndarray` provides the same data
+        without building a new list on each call.
 
         Example:
         ```python
@@ -207,7 +456,7 @@ class Screen:
         """
 
         if self.mb.lcd._LCDC.lcd_enable:
-            return [[line[0], line[1], line[2] - 7, line[3]] for line in self.mb.lcd._scanlineparameters]
+            return self.tilemap_position_ndarray[:, :4].tolist()
         else:
             return [[0, 0, 0, 0] for line in range(144)]
 
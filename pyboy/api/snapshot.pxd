@@ -0,0 +1,39 @@
+#
+# License: See LICENSE.md file
+# GitHub: https://github.com/Baekalfen/PyBoy
+#
+
+cimport cython
+from libc.stdint cimport int64_t, uint8_t
+
+from pyboy.utils cimport IntIOInterface
+
+
+cdef int64_t PAGE_SIZE
+
+cdef class Snapshot(IntIOInterface):
+    cdef bytearray _state
+    cdef int64_t _position
+    cdef list _pages
+
+    cpdef int truncate(self) except -1
+    @cython.locals(n=int64_t)
+    cpdef list _get_pages(self)
+
+
+cdef class IncrementalSnapshot(IntIOInterface):
+    cdef list _pages
+    cdef int64_t _length
+    cdef int64_t _position
+    cdef bytearray _page
+    cdef int64_t _page_index
+
+    cpdef list _get_pages(self)
+    cdef int _load_page(self, int64_t) except -1
+    cdef int _flush_page(self) except -1
+    @cython.locals(length=int64_t, n=int64_t, offset=int64_t, chunk=int64_t)
+    cpdef int64_t write_buffer(self, const uint8_t[:]) except -1
+    @cython.locals(length=int64_t, page=int64_t, start=int64_t, end=int64_t)
+    cpdef int64_t write_buffer_dirty(self, const uint8_t[:], const uint8_t[:]) except -1
+    @cython.locals(length=int64_t, n=int64_t, offset=int64_t, chunk=int64_t)
+    cpdef int64_t read_buffer(self, uint8_t[:]) except -1
@@ -0,0 +1,258 @@
+#
+# License: See LICENSE.md file
+# GitHub: https://github.com/Baekalfen/PyBoy
+#
+"""
+In-memory copies of the emulator state. See `pyboy.PyBoy.snapshot`.
+"""
+
+from pyboy.utils import IntIOInterface, PyBoyAssertException, PyBoyException
+
+# Granularity of the pages shared between snapshots. See IncrementalSnapshot
+PAGE_SIZE = 0x100
+
+
+class Snapshot(IntIOInterface):
+    """
+    An in-memory copy of the complete state of the emulator, created with `pyboy.PyBoy.snapshot` and restored with
+    `pyboy.PyBoy.restore`.
+
+    The memory of the Game Boy is copied in whole blocks, and nothing is encoded to or decoded from a file. The content
+    is the same as a `.state` file, so it can be stored with `Snapshot.save_state` and created from a file with
+    `Snapshot.from_state`.
+
+    Example:
+    ```python
+    >>> snapshot = pyboy.snapshot()
+    >>> pyboy.tick(60)
+    True
+    >>> pyboy.restore(snapshot)
+    >>> with open("state_file.state", "wb") as f:
+    ...     snapshot.save_state(f)
+
+    ```
+    """
+
+    def __init__(self, state=b""):
+        self._state = bytearray(state)
+        self._position = 0
+        self._pages = None
+
+    def write(self, byte):
+        if self._position < len(self._state):
+            self._state[self._position] = byte
+        else:
+            self._state.append(byte)
+        self._position += 1
+        return 1
+
+    def write_buffer(self, buffer):
+        length = len(buffer)
+        self._state[self._position : self._position + length] = buffer
+        self._position += length
+        return length
+
+    def read(self):
+        if not (self._position < len(self._state)):
+            raise PyBoyAssertException("No data")
+        byte = self._state[self._position]
+        self._position += 1
+        return byte
+
+    def read_buffer(self, buffer):
+        length = len(buffer)
+        if not (self._position + length <= len(self._state)):
+            raise PyBoyAssertException("No data")
+        memoryview(buffer)[:] = memoryview(self._state)[self._position : self._position + length]
+        self._position += length
+        return length
+
+    def seek(self, pos):
+        self._position = pos
+        return 0
+
+    def truncate(self):
+        # Drops what is left of a longer, earlier state, when the snapshot is reused
+        del self._state[self._position :]
+        self._pages = None
+        return 0
+
+    def _get_pages(self):
+        # Split into pages the first time an incremental snapshot is made from this one. All of its children share the
+        # same pages.
+        if self._pages is None:
+            self._pages = [bytes(self._state[n : n + PAGE_SIZE]) for n in range(0, len(self._state), PAGE_SIZE)]
+        return self._pages
+
+    def flush(self):
+        return 0
+
+    def tell(self):
+        return self._position
+
+    def save_state(self, file_like_object):
+        """
+        Writes the snapshot to a file in the same format as `pyboy.PyBoy.save_state`.
+
+        Args:
+            file_like_object (io.BufferedIOBase): A file-like object for which to write the emulator state.
+        """
+        file_like_object.write(self._state)
+
+    @staticmethod
+    def from_state(file_like_object):
+        """
+        Creates a snapshot from a file written by `pyboy.PyBoy.save_state` or `Snapshot.save_state`.
+
+        Args:
+            file_like_object (io.BufferedIOBase): A file-like object for which to read the emulator state.
+
+        Returns
+        -------
+        `Snapshot`:
+            The snapshot, which can be given to `pyboy.PyBoy.restore`.
+        """
+        return Snapshot(file_like_object.read())
+
+
+class IncrementalSnapshot(IntIOInterface):
+    """
+    A copy of the state of the emulator, which only stores the pages of the state that changed since its parent. It is
+    created with `pyboy.PyBoy.snapshot_incremental` and restored with `pyboy.PyBoy.restore`.
+
+    The state is split into pages of 256 bytes, and the pages that didn't change are shared with the parent, so a chain
+    of snapshots taken every frame only costs the memory the game touched in each frame. The parent can be discarded
+    after a child has been made from it. Use `IncrementalSnapshot.materialize` to get a full `Snapshot` of the state.
+
+    Example:
+    ```python
+    >>> base = pyboy.snapshot()
+    >>> pyboy.tick()
+    True
+    >>> child = pyboy.snapshot_incremental(base)
+    >>> pyboy.tick()
+    True
+    >>> grandchild = pyboy.snapshot_incremental(child)
+    >>> pyboy.restore(child)
+    >>> full = grandchild.materialize()
+
+    ```
+    """
+
+    def __init__(self, parent):
+        if not isinstance(parent, (Snapshot, IncrementalSnapshot)):
+            raise PyBoyAssertException("Expected a Snapshot or IncrementalSnapshot object")
+        self._pages = list(parent._get_pages())
+        self._length = 0
+        if len(self._pages) > 0:
+            self._length = (len(self._pages) - 1) * PAGE_SIZE + len(self._pages[len(self._pages) - 1])
+        self._position = 0
+        # Page being written. It starts as a copy of the page of the parent.
+        self._page = bytearray(PAGE_SIZE)
+        self._page_index = -1
+
+    def _get_pages(self):
+        return self._pages
+
+    def _load_page(self, index):
+        self._flush_page()
+        if not (index < len(self._pages)):
+            raise PyBoyException("The state doesn't match the parent snapshot")
+        self._page[:] = self._pages[index]
+        self._page_index = index
+        return 0
+
+    def _flush_page(self):
+        # Only pages that are different from the parent are stored
+        if self._page_index != -1:
+            if self._page != self._pages[self._page_index]:
+                self._pages[self._page_index] = bytes(self._page)
+            self._page_index = -1
+        return 0
+
+    def write(self, byte):
+        if self._position // PAGE_SIZE != self._page_index:
+            self._load_page(self._position // PAGE_SIZE)
+        self._page[self._position % PAGE_SIZE] = byte
+        self._position += 1
+        return 1
+
+    def write_buffer(self, buffer):
+        length = len(buffer)
+        n = 0
+        while n < length:
+            offset = self._position % PAGE_SIZE
+            chunk = min(PAGE_SIZE - offset, length - n)
+            if self._position // PAGE_SIZE != self._page_index:
+                self._load_page(self._position // PAGE_SIZE)
+            self._page[offset : offset + chunk] = buffer[n : n + chunk]
+            self._position += chunk
+            n += chunk
+        return length
+
+    def write_buffer_dirty(self, buffer, dirty):
+        # Clean pages of the buffer are the same as in the parent, so they are skipped
+        length = len(buffer)
+        for page in range(len(dirty)):
+            start = page * PAGE_SIZE
+            end = min(start + PAGE_SIZE, length)
+            if dirty[page]:
+                self.write_buffer(buffer[start:end])
+            else:
+                self._position += end - start
+        return length
+
+    def read(self):
+        if not (self._position < self._length):
+            raise PyBoyAssertException("No data")
+        byte = self._pages[self._position // PAGE_SIZE][self._position % PAGE_SIZE]
+        self._position += 1
+        return byte
+
+    def read_buffer(self, buffer):
+        length = len(buffer)
+        if not (self._position + length <= self._length):
+            raise PyBoyAssertException("No data")
+        view = memoryview(buffer)
+        n = 0
+        while n < length:
+            offset = self._position % PAGE_SIZE
+            chunk = min(PAGE_SIZE - offset, length - n)
+            view[n : n + chunk] = self._pages[self._position // PAGE_SIZE][offset : offset + chunk]
+            self._position += chunk
+            n += chunk
+        return length
+
+    def seek(self, pos):
+        self._position = pos
+        return 0
+
+    def flush(self):
+        self._flush_page()
+        if self._position != self._length:
+            raise PyBoyException("The state doesn't match the parent snapshot")
+        return 0
+
+    def tell(self):
+        return self._position
+
+    def materialize(self):
+        """
+        Joins the pages of this snapshot and its parents into a full copy of the state.
+
+        Returns
+        -------
+        `Snapshot`:
+            A snapshot of the same state, which doesn't share memory with other snapshots.
+        """
+        return Snapshot(b"".join(self._pages))
+
+    def save_state(self, file_like_object):
+        """
+        Writes the full state to a file in the same format as `pyboy.PyBoy.save_state`.
+
+        Args:
+            file_like_object (io.BufferedIOBase): A file-like object for which to write the emulator state.
+        """
+        for page in self._pages:
+            file_like_object.write(page)
@@ -0,0 +1,207 @@
+#
+# License: See LICENSE.md file
+# GitHub: https://github.com/Baekalfen/PyBoy
+#
+"""
+Compressed state files with a header. See `pyboy.PyBoy.save_state`.
+"""
+
+import io
+import json
+import lzma
+import struct
+import zlib
+
+from pyboy.api.snapshot import Snapshot
+from pyboy.utils import STATE_VERSION, PyBoyException, PyBoyInvalidInputException
+
+# The first byte of a plain state is the state version, so the two formats can't be confused
+MAGIC = b"PYBOYSTATE"
+CONTAINER_VERSION = 1
+
+COMPRESSIONS = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+
+def is_state_file(file_like_object):
+    """
+    Checks if the file starts with the header of a compressed state file. The position of the file is left unchanged.
+
+    Streams which cannot seek, like pipes, are peeked at instead. Without `peek`, they are assumed to be plain states.
+
+    Args:
+        file_like_object (io.BufferedIOBase): A file-like object to check.
+
+    Returns
+    -------
+    bool:
+        True for a compressed state file, and False for a plain state.
+    """
+    if not file_like_object.seekable():
+        # The first byte is enough to tell the formats apart. See MAGIC.
+        if not hasattr(file_like_object, "peek"):
+            return False
+        return file_like_object.peek(1)[:1] == MAGIC[:1]
+
+    position = file_like_object.tell()
+    magic = file_like_object.read(len(MAGIC))
+    file_like_object.seek(position)
+    return magic == MAGIC
+
+
+def write_state_file(file_like_object, state, sections, metadata, compression):
+    """
+    Writes a state from `pyboy.PyBoy.save_state` as a compressed state file.
+
+    Args:
+        file_like_object (io.BufferedIOBase): A file-like object for which to write the state file.
+        state (bytes): The plain state.
+        sections (list): Name and offset into the state of each section, in order.
+        metadata (dict): Header fields describing the state. It has to be serializable as JSON.
+        compression (str): "zlib" or "lzma"
+    """
+    if compression not in COMPRESSIONS:
+        raise PyBoyInvalidInputException(f"Unknown compression: {compression}. Use 'zlib' or 'lzma'")
+    compress = COMPRESSIONS[compression][0]
+
+    table = []
+    data = []
+    offset = 0
+    for n, (name, start) in enumerate(sections):
+        end = sections[n + 1][1] if n + 1 < len(sections) else len(state)
+        compressed = compress(state[start:end])
+        table.append({"name": name, "offset": offset, "length": len(compressed), "size": end - start})
+        data.append(compressed)
+        offset += len(compressed)
+
+    header = dict(metadata, state_version=STATE_VERSION, compression=compression, sections=table)
+    header = json.dumps(header).encode("utf-8")
+
+    file_like_object.write(MAGIC)
+    file_like_object.write(bytes([CONTAINER_VERSION]))
+    file_like_object.write(struct.pack("<I", len(header)))
+    file_like_object.write(header)
+    for compressed in data:
+        file_like_object.write(compressed)
+
+
+class StateFile:
+    """
+    Reads a compressed state file, written by `pyboy.PyBoy.save_state` with `compression`. Only the header is read
+    when the file is opened, and each section is read and decompressed on demand. The state files can be loaded with
+    `pyboy.PyBoy.load_state` as well.
+
+    Example:
+    ```python
+    >>> from pyboy.api.state_file import StateFile
+    >>> with open("state_file.state", "wb") as f:
+    ...     pyboy.save_state(f, compression="zlib")
+    >>> with open("state_file.state", "rb") as f:
+    ...     state_file = StateFile(f)
+    ...     state_file.title
+    ...     ram = state_file.read_section("ram")
+    'DEFAULT-ROM'
+
+    ```
+    """
+
+    def __init__(self, file_like_object):
+        if file_like_object.read(len(MAGIC)) != MAGIC:
+            raise PyBoyException("Not a compressed state file")
+        container_version = file_like_object.read(1)[0]
+        if container_version > CONTAINER_VERSION:
+            raise PyBoyException("Cannot load state file from a newer version of PyBoy")
+        (length,) = struct.unpack("<I", file_like_object.read(4))
+        header = json.loads(file_like_object.read(length).decode("utf-8"))
+
+        self.rom_sha256 = header["rom_sha256"]
+        """
+        SHA-256 hex digest of the ROM the state was saved with
+
+        Returns
+        -------
+        str:
+        """
+        self.title = header["title"]
+        """
+        Title of the cartridge
+
+        Returns
+        -------
+        str:
+        """
+        self.frame_count = header["frame_count"]
+        """
+        `pyboy.PyBoy.frame_count` when the state was saved
+
+        Returns
+        -------
+        int:
+        """
+        self.options = header["options"]
+        """
+        Keyword arguments given to `pyboy.PyBoy`, except paths to local files, and the actual CGB mode
+
+        Returns
+        -------
+        dict:
+        """
+        self.state_version = header["state_version"]
+        self.compression = header["compression"]
+        if self.compression not in COMPRESSIONS:
+            raise PyBoyException(f"Unknown compression in state file: {self.compression}")
+
+        self.sections = [section["name"] for section in header["sections"]]
+        """
+        Names of the sections in the order they are loaded
+
+        Returns
+        -------
+        list:
+        """
+        self._sections = {section["name"]: section for section in header["sections"]}
+        data_length = sum(section["length"] for section in header["sections"])
+        if not file_like_object.seekable():
+            # The sections are read out of order, so they are kept in memory instead
+            file_like_object = io.BytesIO(file_like_object.read(data_length))
+        self._file = file_like_object
+        self._data_start = file_like_object.tell()
+        self._data_end = self._data_start + data_length
+
+    def read_section(self, name):
+        """
+        Reads and decompresses a single section, without reading the other sections of the file.
+
+        Args:
+            name (str): Name of the section. See `StateFile.sections`
+
+        Returns
+        -------
+        bytes:
+            The section of the plain state
+        """
+        if name not in self._sections:
+            raise PyBoyInvalidInputException(f"No section named {name} in state file")
+        section = self._sections[name]
+        self._file.seek(self._data_start + section["offset"])
+        data = COMPRESSIONS[self.compression][1](self._file.read(section["length"]))
+        if len(data) != section["size"]:
+            raise PyBoyException(f"Section {name} of state file is corrupted")
+        return data
+
+    def snapshot(self):
+        """
+        Decompresses all sections into a snapshot. The file is left at the end of the state file.
+
+        Returns
+        -------
+        `pyboy.api.snapshot.Snapshot`:
+            The state, which can be given to `pyboy.PyBoy.restore`.
+        """
+        state = io.BytesIO()
+        for name in self.sections:
+            state.write(self.read_section(name))
+        self._file.seek(self._data_end)
+        return Snapshot(state.getvalue())
@@ -16,7 +16,9 @@ cdef class BaseMBC:
     cdef str filename
     cdef str gamename
     cdef uint8_t[:, :] rombanks
+    cdef bint rombanks_shared
     cdef uint8_t[:,:] rambanks
+    cdef uint8_t[:] _rambanks_flat
     cdef uint8_t carttype
     cdef bint battery
     cdef bint rtc_enabled
@@ -36,6 +38,8 @@ cdef class BaseMBC:
     cdef int save_ram(self, IntIOInterface) except -1
     cdef int load_ram(self, IntIOInterface) except -1
     cdef void init_rambanks(self, uint8_t) noexcept
+    cdef uint8_t[:, :] copy_rombanks(self)
+    cdef int unshare_rombanks(self) except -1
     cdef str getgamename(self, uint8_t[:,:])
 
     cdef uint8_t getitem(self, uint16_t) noexcept nogil
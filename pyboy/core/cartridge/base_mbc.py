@@ -18,6 +18,7 @@ class BaseMBC:
     def __init__(self, filename, rombanks, external_ram_count, carttype, sram, battery, rtc_enabled):
         self.filename = filename + ".ram"
         self.rombanks = rombanks
+        self.rombanks_shared = False
         self.carttype = carttype
 
         self.battery = battery
@@ -79,9 +80,7 @@ class BaseMBC:
             logger.warning("Saving RAM is not supported on %0.2x", self.carttype)
             return 0
 
-        for bank in range(self.external_ram_count):
-            for byte in range(8 * 1024):
-                f.write(self.rambanks[bank, byte])
+        f.write_buffer(self._rambanks_flat[: self.external_ram_count * 8 * 1024])
 
         logger.debug("RAM saved.")
 
@@ -90,9 +89,7 @@ class BaseMBC:
             logger.warning("Loading RAM is not supported on %0.2x", self.carttype)
             return 0
 
-        for bank in range(self.external_ram_count):
-            for byte in range(8 * 1024):
-                self.rambanks[bank, byte] = f.read()
+        f.read_buffer(self._rambanks_flat[: self.external_ram_count * 8 * 1024])
 
         logger.debug("RAM loaded.")
 
@@ -100,7 +97,21 @@ class BaseMBC:
         self.rambank_initialized = True
         # In real life the values in RAM are scrambled on initialization.
         # Allocating the maximum, as it is easier in Cython. And it's just 128KB...
-        self.rambanks = memoryview(array.array("B", [0] * (8 * 1024 * 16))).cast("B", shape=(16, 8 * 1024))
+        rambanks = memoryview(array.array("B", [0] * (8 * 1024 * 16)))
+        self._rambanks_flat = rambanks
+        self.rambanks = rambanks.cast("B", shape=(16, 8 * 1024))
+
+    def copy_rombanks(self):
+        return memoryview(array.array("B", bytes(memoryview(self.rombanks)))).cast(
+            "B", shape=(self.external_rom_count, 16 * 1024)
+        )
+
+    def unshare_rombanks(self):
+        # Copy-on-write of ROM banks shared with a clone of the emulator. Called before patching the ROM.
+        if self.rombanks_shared:
+            self.rombanks = self.copy_rombanks()
+            self.rombanks_shared = False
+        return 0
 
     def getgamename(self, rombanks):
         # Title was originally 0x134-0x143.
@@ -15,8 +15,8 @@ from .base_mbc cimport BaseMBC
 
 cdef Logger logger
 
-@cython.locals(carttype=uint8_t, cart_name=basestring, cart_line=basestring)
-cpdef BaseMBC load_cartridge(str)
+@cython.locals(carttype=uint8_t, cart_name=basestring, cart_line=basestring, cart=BaseMBC, shared=bint)
+cpdef BaseMBC load_cartridge(str, object rombanks=*)
 cdef bint validate_checksum(uint8_t[:,:]) noexcept
 
 @cython.locals(romdata=array, banksize=int)
@@ -17,8 +17,11 @@ from .mbc5 import MBC5
 logger = pyboy.logging.get_logger(__name__)
 
 
-def load_cartridge(filename):
-    rombanks = load_romfile(filename)
+def load_cartridge(filename, rombanks=None):
+    # ROM banks can be given by PyBoy.clone, to share them with another emulator
+    shared = rombanks is not None
+    if not shared:
+        rombanks = load_romfile(filename)
     if not validate_checksum(rombanks):
         raise PyBoyException("Cartridge header checksum mismatch!")
 
@@ -36,7 +39,9 @@ def load_cartridge(filename):
     logger.debug("Cartridge size: %d ROM banks of 16KB, %s RAM banks of 8KB", len(rombanks), external_ram_count)
     cartmeta = CARTRIDGE_TABLE[carttype]
 
-    return cartmeta[0](filename, rombanks, external_ram_count, carttype, *cartmeta[1:])
+    cart = cartmeta[0](filename, rombanks, external_ram_count, carttype, *cartmeta[1:])
+    cart.rombanks_shared = shared
+    return cart
 
 
 def validate_checksum(rombanks):
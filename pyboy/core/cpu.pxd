@@ -4,7 +4,7 @@
 #
 
 
-from libc.stdint cimport int16_t, int64_t, uint8_t, uint16_t
+from libc.stdint cimport int16_t, int64_t, uint8_t, uint16_t, uint32_t, uint64_t
 
 cimport pyboy.core.mb
 from pyboy.utils cimport IntIOInterface
@@ -21,6 +21,13 @@ cdef Logger logger
 cdef uint16_t IF_ADDRESS, IE_ADDRESS
 cdef int16_t FLAGC, FLAGH, FLAGN, FLAGZ
 cdef uint8_t INTR_VBLANK, INTR_LCDC, INTR_TIMER, INTR_SERIAL, INTR_HIGHTOLOW
+cdef uint8_t[256] BLOCK_END_OPCODES
+cdef int MAX_BLOCK_LENGTH
+cdef uint8_t IDLE_LOOP_REGISTER, IDLE_LOOP_READ_HL, IDLE_LOOP_READ_BC, IDLE_LOOP_READ_DE, IDLE_LOOP_READ_A16
+cdef uint8_t IDLE_LOOP_READ_A8, IDLE_LOOP_READ_C, IDLE_LOOP_BRANCH
+cdef int MAX_IDLE_LOOP_LENGTH
+cdef uint8_t[512] IDLE_LOOP_OPCODES
+cdef bint idle_loop_readable(int) noexcept nogil
 
 
 
@@ -36,16 +43,37 @@ cdef class CPU:
     cdef void set_interruptflag(self, int) noexcept nogil
     cdef bint handle_interrupt(self, uint8_t, uint16_t) noexcept nogil
 
-    @cython.locals(opcode=uint16_t)
+    cdef uint32_t[:] decode_cache
+    cdef bint decode_cache_shared
+    cdef int unshare_decode_cache(self) except -1
+    @cython.locals(n=int64_t)
+    cdef void invalidate_decode_cache(self, int64_t) noexcept nogil
+    @cython.locals(pc=int, opcode=uint16_t, length=int, oplen=int, v=uint32_t)
+    cdef void decode_block(self, int64_t) noexcept nogil
+    cdef bint profiling
+    cdef uint64_t[:] opcode_counts, opcode_cycles
+    @cython.locals(opcode=uint16_t, offset=int64_t, entry=uint32_t, cycles=int64_t)
     cdef inline uint8_t fetch_and_execute(self) noexcept nogil
-    @cython.locals(_cycles0=int64_t)
+    cdef void profile_opcode(self, uint16_t, int64_t) noexcept nogil
+    @cython.locals(_cycles0=int64_t, _target=int64_t, pc=int)
     cdef int tick(self, int64_t) noexcept nogil
+
+    cdef int64_t idle_loop_pc
+    cdef uint64_t idle_loop_state
+    cdef int64_t idle_loop_cycles
+    @cython.locals(state=uint64_t, period=int64_t, iterations=int64_t)
+    cdef void skip_idle_loop(self, int, int64_t) noexcept nogil
+    @cython.locals(pc=int, offset=int64_t, entry=uint32_t, opcode=uint16_t, v=int, kind=uint8_t, address=int, length=int)
+    cdef bint is_idle_loop(self, int, int) noexcept nogil
     cdef int save_state(self, IntIOInterface) except -1
     cdef int load_state(self, IntIOInterface, int) except -1
 
     # Only char (8-bit) needed, but I'm not sure all intermittent
     # results do not overflow
     cdef int16_t A, F, B, C, D, E
+    cdef uint8_t lazy_flags
+    cdef int lazy_result, lazy_operands
+    cdef int16_t materialize_flags(self) noexcept nogil
 
     # Only short (16-bit) needed, but I'm not sure all intermittent
     # results do not overflow
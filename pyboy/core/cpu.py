@@ -2,6 +2,8 @@
 # License: See LICENSE.md file
 # GitHub: https://github.com/Baekalfen/PyBoy
 #
+from array import array
+
 import pyboy
 
 from . import opcodes
@@ -9,12 +11,86 @@ from . import opcodes
 FLAGC, FLAGH, FLAGN, FLAGZ = range(4, 8)
 INTR_VBLANK, INTR_LCDC, INTR_TIMER, INTR_SERIAL, INTR_HIGHTOLOW = [1 << x for x in range(5)]
 
+# Opcodes ending a decoded block: jumps, calls, returns, restarts, HALT, STOP and the illegal opcodes (including BRK)
+# fmt: off
+BLOCK_END_OPCODES = array(
+    "B",
+    [
+        x
+        in (
+            0x10, 0x18, 0x20, 0x28, 0x30, 0x38, 0x76, 0xC0, 0xC2, 0xC3, 0xC4, 0xC7, 0xC8, 0xC9, 0xCA, 0xCC, 0xCD,
+            0xCF, 0xD0, 0xD2, 0xD3, 0xD4, 0xD7, 0xD8, 0xD9, 0xDA, 0xDB, 0xDC, 0xDD, 0xDF, 0xE3, 0xE4, 0xE7, 0xE9,
+            0xEB, 0xEC, 0xED, 0xEF, 0xF4, 0xF7, 0xFC, 0xFD, 0xFF,
+        )
+        for x in range(0x100)
+    ],
+)
+# fmt: on
+MAX_BLOCK_LENGTH = 64
+
+# Instructions allowed in an idle loop, and which memory they read from
+(
+    IDLE_LOOP_REGISTER,
+    IDLE_LOOP_READ_HL,
+    IDLE_LOOP_READ_BC,
+    IDLE_LOOP_READ_DE,
+    IDLE_LOOP_READ_A16,
+    IDLE_LOOP_READ_A8,
+    IDLE_LOOP_READ_C,
+    IDLE_LOOP_BRANCH,
+) = range(1, 9)
+MAX_IDLE_LOOP_LENGTH = 16
+
+
+def _idle_loop_opcodes():
+    table = [0] * 512
+    for x in (0x00, 0x07, 0x0F, 0x17, 0x1F, 0x27, 0x2F, 0x37, 0x3F):
+        table[x] = IDLE_LOOP_REGISTER
+    for x in range(0x00, 0x40, 0x08):
+        table[x | 0x04] = IDLE_LOOP_REGISTER  # INC r
+        table[x | 0x05] = IDLE_LOOP_REGISTER  # DEC r
+        table[x | 0x06] = IDLE_LOOP_REGISTER  # LD r,d8
+    for x in (0x03, 0x0B, 0x13, 0x1B, 0x23, 0x2B):
+        table[x] = IDLE_LOOP_REGISTER  # INC/DEC rr, except SP
+    for x in (0xC6, 0xCE, 0xD6, 0xDE, 0xE6, 0xEE, 0xF6, 0xFE):
+        table[x] = IDLE_LOOP_REGISTER  # ALU d8
+    for x in range(0x40, 0xC0):
+        if 0x70 <= x <= 0x77:
+            continue  # LD (HL),r and HALT
+        table[x] = IDLE_LOOP_READ_HL if x & 0x07 == 0x06 else IDLE_LOOP_REGISTER
+    for x in range(0x100, 0x200):
+        if x & 0x07 != 0x06:
+            table[x] = IDLE_LOOP_REGISTER
+        elif 0x140 <= x < 0x180:
+            table[x] = IDLE_LOOP_READ_HL  # BIT n,(HL)
+    # Reading (HL) from INC/DEC/LD (HL) is not allowed, as they write back
+    table[0x34] = table[0x35] = table[0x36] = 0
+    table[0x0A] = IDLE_LOOP_READ_BC
+    table[0x1A] = IDLE_LOOP_READ_DE
+    table[0xFA] = IDLE_LOOP_READ_A16
+    table[0xF0] = IDLE_LOOP_READ_A8
+    table[0xF2] = IDLE_LOOP_READ_C
+    for x in (0x18, 0x20, 0x28, 0x30, 0x38, 0xC2, 0xC3, 0xCA, 0xD2, 0xDA):
+        table[x] = IDLE_LOOP_BRANCH  # JR and JP
+    return array("B", table)
+
+
+IDLE_LOOP_OPCODES = _idle_loop_opcodes()
+
+
+def idle_loop_readable(address):
+    # Memory that cannot change while the CPU is running towards the next event. Timer, sound and cartridge RAM (RTC)
+    # change on their own, so loops polling them are not idle.
+    if address < 0xA000 or 0xC000 <= address < 0xFF00:
+        return True
+    return address == 0xFF00 or address == 0xFF0F or 0xFF40 <= address < 0xFF4C or 0xFF80 <= address
+
 
 logger = pyboy.logging.get_logger(__name__)
 
 
 class CPU:
-    def __init__(self, mb):
+    def __init__(self, mb, decode_cache=None):
         self.A = 0
         self.F = 0
         self.B = 0
@@ -25,6 +101,12 @@ class CPU:
         self.SP = 0
         self.PC = 0
 
+        # Bits of F which the last ALU operation left to be computed from its result and operands. These bits are zero
+        # in F until materialize_flags is called. The carry flag is never deferred.
+        self.lazy_flags = 0
+        self.lazy_result = 0
+        self.lazy_operands = 0
+
         self.interrupts_flag_register = 0
         self.interrupts_enabled_register = 0
         self.interrupt_master_enable = False
@@ -32,12 +114,44 @@ class CPU:
 
         self.mb = mb
 
+        # Decoded instructions of the cartridge ROM, indexed by the offset into the ROM (bank * 0x4000 + address). Each
+        # entry is ((opcode + 1) << 16) | operand, or 0 when not yet decoded. A clone shares it together with the ROM
+        # banks. See Motherboard.clone_rombanks.
+        self.decode_cache_shared = decode_cache is not None
+        if decode_cache is None:
+            decode_cache = array("I", bytes(4 * self.mb.cartridge.external_rom_count * 0x4000))
+        self.decode_cache = decode_cache
+
         self.halted = False
         self.stopped = False
         self.is_stuck = False
         self.cycles = 0
 
+        # Loop head, register state and cycles of the last short backward branch. See skip_idle_loop.
+        self.idle_loop_pc = -1
+        self.idle_loop_state = 0
+        self.idle_loop_cycles = 0
+
+        # Number of executions and cycles spent per opcode. Only counted when profiling is enabled. CB-prefixed opcodes
+        # are at 0x100 and up.
+        self.profiling = False
+        self.opcode_counts = array("Q", bytes(8 * 512))
+        self.opcode_cycles = array("Q", bytes(8 * 512))
+
+    def materialize_flags(self):
+        # Most flags are overwritten before they are read, so the generated opcodes only store the result and operands
+        # of the operation. Z is set if the 8-bit result is zero, and H is the carry out of bit 3, which is bit 4 of
+        # the operands XOR'ed with the result.
+        if self.lazy_flags:
+            if self.lazy_flags & (1 << FLAGZ):
+                self.F |= ((self.lazy_result & 0xFF) == 0) << FLAGZ
+            if self.lazy_flags & (1 << FLAGH):
+                self.F |= (((self.lazy_operands ^ self.lazy_result) >> 4) & 1) << FLAGH
+            self.lazy_flags = 0
+        return self.F
+
     def save_state(self, f):
+        self.materialize_flags()
         for n in [self.A, self.F, self.B, self.C, self.D, self.E]:
             f.write(n & 0xFF)
 
@@ -54,6 +168,7 @@ class CPU:
 
     def load_state(self, f, state_version):
         self.A, self.F, self.B, self.C, self.D, self.E = [f.read() for _ in range(6)]
+        self.lazy_flags = 0
         self.HL = f.read_16bit()
         self.SP = f.read_16bit()
         self.PC = f.read_16bit()
@@ -86,7 +201,7 @@ class CPU:
 
         return (
             "\n"
-            f"A: {self.mb.cpu.A:02X}, F: {self.mb.cpu.F:02X}, B: {self.mb.cpu.B:02X}, "
+            f"A: {self.mb.cpu.A:02X}, F: {self.mb.cpu.materialize_flags():02X}, B: {self.mb.cpu.B:02X}, "
             f"C: {self.mb.cpu.C:02X}, D: {self.mb.cpu.D:02X}, E: {self.mb.cpu.E:02X}, "
             f"HL: {self.mb.cpu.HL:04X}, SP: {self.mb.cpu.SP:04X}, PC: {self.mb.cpu.PC:04X} ({sym_label})\n"
             f"{opcode_str} "
@@ -135,12 +250,82 @@ class CPU:
         self.interrupt_queued = False
 
         self.bail = False
+        self.idle_loop_pc = -1
         while self.cycles < _target:
             # TODO: cpu-stuck check for blargg tests?
+            pc = self.PC
             self.fetch_and_execute()
             if self.bail:  # Possible cycles-target changes
                 break
 
+            if not (0 < self.PC - pc <= 3):  # Jump
+                # The skipped iterations wouldn't be counted by the profiler
+                if 0 <= pc - self.PC <= MAX_IDLE_LOOP_LENGTH and not self.profiling:
+                    self.skip_idle_loop(pc, _target)
+                else:
+                    self.idle_loop_pc = -1
+
+    def skip_idle_loop(self, branch_pc, target):
+        # Games often busy-wait on LY, STAT or a flag in RAM. When a short loop comes back around without changing any
+        # registers, and it only reads memory that cannot change before the next event, each iteration will be the
+        # same until then. Like HALT, we fast-forward the cycles instead, but only by whole iterations.
+        state = (self.A << 8) | self.materialize_flags()
+        state = (state << 8) | self.B
+        state = (state << 8) | self.C
+        state = (state << 8) | self.D
+        state = (state << 8) | self.E
+        state = (state << 16) | self.HL
+
+        if self.PC == self.idle_loop_pc and state == self.idle_loop_state and self.is_idle_loop(self.PC, branch_pc):
+            period = self.cycles - self.idle_loop_cycles
+            iterations = (target - self.cycles - 1) // period
+            if iterations > 0:
+                self.cycles += iterations * period
+
+        self.idle_loop_pc = self.PC
+        self.idle_loop_state = state
+        self.idle_loop_cycles = self.cycles
+
+    def is_idle_loop(self, head, branch_pc):
+        offset = self.mb.rom_offset(head)
+        if offset < 0 or self.mb.rom_offset(branch_pc) != offset + branch_pc - head:
+            return False
+
+        pc = head
+        while pc <= branch_pc:
+            entry = self.decode_cache[offset]
+            if entry == 0 or self.mb.hook_map[pc]:
+                # Deferred hooks have to see every iteration
+                return False
+            opcode = (entry >> 16) - 1
+            v = entry & 0xFFFF
+            kind = IDLE_LOOP_OPCODES[opcode]
+            if pc == branch_pc:
+                return kind == IDLE_LOOP_BRANCH
+            elif kind == 0 or kind == IDLE_LOOP_BRANCH:
+                return False
+
+            address = -1
+            if kind == IDLE_LOOP_READ_HL:
+                address = self.HL
+            elif kind == IDLE_LOOP_READ_BC:
+                address = (self.B << 8) + self.C
+            elif kind == IDLE_LOOP_READ_DE:
+                address = (self.D << 8) + self.E
+            elif kind == IDLE_LOOP_READ_A16:
+                address = v
+            elif kind == IDLE_LOOP_READ_A8:
+                address = 0xFF00 + v
+            elif kind == IDLE_LOOP_READ_C:
+                address = 0xFF00 + self.C
+            if address >= 0 and not idle_loop_readable(address):
+                return False
+
+            length = 2 if opcode >= 0x100 else opcodes.OPCODE_LENGTHS[opcode]
+            pc += length
+            offset += length
+        return False
+
     def check_interrupts(self):
         if self.interrupt_queued:
             # Interrupt already queued. This happens only when using a debugger.
@@ -180,10 +365,85 @@ class CPU:
         self.PC = addr
         self.interrupt_master_enable = False
 
+    def unshare_decode_cache(self):
+        # Copy-on-write of the decoded instructions shared with a clone. Called with Motherboard.unshare_rombanks.
+        if self.decode_cache_shared:
+            decode_cache = array("I")
+            decode_cache.frombytes(bytes(memoryview(self.decode_cache)))
+            self.decode_cache = decode_cache
+            self.decode_cache_shared = False
+        return 0
+
+    def invalidate_decode_cache(self, offset):
+        # Clear any decoded instruction covering the given ROM offset. Instructions are at most 3 bytes long.
+        for n in range(max(0, offset - 2), offset + 1):
+            self.decode_cache[n] = 0
+
+    def decode_block(self, offset):
+        # Decode the instructions from PC until the next branch, and store them in the decode cache
+        pc = self.PC
+        for _ in range(MAX_BLOCK_LENGTH):
+            opcode = self.mb.getitem(pc)
+            length = opcodes.OPCODE_LENGTHS[opcode]
+            if opcode == 0xCB:  # Extension code
+                opcode = self.mb.getitem(pc + 1)
+                opcode += 0x100  # Internally shifting look-up table
+                length = 2
+
+            if length == 0 or self.mb.rom_offset(pc + length - 1) != offset + length - 1:
+                # Illegal opcode, or instruction spans a ROM bank or boot ROM boundary
+                break
+
+            oplen = opcodes.OPCODE_LENGTHS[opcode]
+
+            v = 0
+            if oplen == 2:
+                # 8-bit immediate
+                v = self.mb.getitem(pc + 1)
+            elif oplen == 3:
+                # 16-bit immediate
+                v = (self.mb.getitem(pc + 2) << 8) + self.mb.getitem(pc + 1)
+            self.decode_cache[offset] = ((opcode + 1) << 16) | v
+
+            if opcode < 0x100 and BLOCK_END_OPCODES[opcode]:
+                break
+            pc += length
+            offset += length
+            if self.mb.rom_offset(pc) != offset or self.decode_cache[offset] != 0:
+                # End of ROM bank, or rest of the block is already decoded
+                break
+
     def fetch_and_execute(self):
+        if self.mb.hook_map[self.PC]:
+            self.mb.hook_reached(self.PC)
+
+        offset = self.mb.rom_offset(self.PC)
+        if offset >= 0:
+            entry = self.decode_cache[offset]
+            if entry == 0:
+                self.decode_block(offset)
+                entry = self.decode_cache[offset]
+            if entry != 0:
+                opcode = (entry >> 16) - 1
+                if not self.profiling:
+                    return opcodes.dispatch_opcode(self, opcode, entry & 0xFFFF)
+                cycles = self.cycles
+                opcodes.dispatch_opcode(self, opcode, entry & 0xFFFF)
+                self.profile_opcode(opcode, self.cycles - cycles)
+                return 0
+
         opcode = self.mb.getitem(self.PC)
         if opcode == 0xCB:  # Extension code
             opcode = self.mb.getitem(self.PC + 1)
             opcode += 0x100  # Internally shifting look-up table
 
-        return opcodes.execute_opcode(self, opcode)
+        if not self.profiling:
+            return opcodes.execute_opcode(self, opcode)
+        cycles = self.cycles
+        opcodes.execute_opcode(self, opcode)
+        self.profile_opcode(opcode, self.cycles - cycles)
+        return 0
+
+    def profile_opcode(self, opcode, cycles):
+        self.opcode_counts[opcode] += 1
+        self.opcode_cycles[opcode] += cycles
@@ -17,8 +17,13 @@ from pyboy.utils cimport IntIOInterface
 cdef uint8_t INTR_VBLANK, INTR_LCDC, INTR_TIMER, INTR_SERIAL, INTR_HIGHTOLOW
 cdef uint16_t LCDC, STAT, SCY, SCX, LY, LYC, DMA, BGP, OBP0, OBP1, WY, WX
 cdef int ROWS, COLS, TILES, FRAME_CYCLES, VIDEO_RAM, OBJECT_ATTRIBUTE_MEMORY
+cdef int DEFERRED_LOG_SIZE, DEFERRED_SCANLINE, DEFERRED_BLANK
 cdef uint32_t COL0_FLAG, BG_PRIORITY_FLAG
-cdef uint8_t CGB_NUM_PALETTES
+cdef uint64_t FNV_OFFSET, FNV_PRIME, FNV_MASK
+cdef int LAYER_BACKGROUND, LAYER_WINDOW, LAYER_SPRITES
+cdef uint8_t LAYER_EMPTY
+cdef uint8_t CGB_NUM_PALETTES, CGB_OBJ_INDEX
+cdef uint32_t[:] CGB_RGB_LUT
 
 cdef Logger logger
 
@@ -29,6 +34,8 @@ cdef class LCD:
     cdef bint disable_renderer
     cdef uint8_t[8 * 1024] VRAM0
     cdef uint8_t[0xA0] OAM
+    cdef uint8_t[32] VRAM0_dirty
+    cdef uint8_t[1] OAM_dirty
 
     cdef uint8_t SCY
     cdef uint8_t SCX
@@ -48,7 +55,8 @@ cdef class LCD:
     cdef PaletteRegister OBP0
     cdef PaletteRegister OBP1
     cdef Renderer renderer
-    cdef uint8_t[144][5] _scanlineparameters
+    cdef array _scanlineparameters_raw
+    cdef int[:,:] _scanlineparameters
     cdef uint64_t last_cycles
     cdef int64_t _cycles_to_interrupt, _cycles_to_frame
 
@@ -59,16 +67,38 @@ cdef class LCD:
 
     cdef int64_t cycles_to_mode0(self) noexcept nogil
 
+    @cython.locals(n=int)
+    cdef void set_dirty(self, uint8_t) noexcept nogil
     cdef int save_state(self, IntIOInterface) except -1
     cdef int load_state(self, IntIOInterface, int) except -1
+    @cython.locals(state=uint8_t[:], n=int)
+    cdef int load_vram(self, IntIOInterface, uint8_t[:], int) except -1
 
     cdef inline (int, int) getwindowpos(self) noexcept nogil
     cdef inline (int, int) getviewport(self) noexcept nogil
 
+    cdef void render_scanline(self, int, bint) noexcept nogil
+
+    cdef bint deferred, deferred_recording
+    cdef int _deferred_count, _deferred_ly_window
+    cdef int[:] _deferred_keys, _deferred_values
+    cdef void begin_deferred(self, bint) noexcept nogil
+    @cython.locals(key=int, value=int)
+    cdef void deferred_log(self, uint16_t, int) noexcept nogil
+    cdef void _deferred_push(self, int, int) noexcept nogil
+    @cython.locals(address=int, index=int)
+    cdef int _deferred_get(self, int) noexcept nogil
+    @cython.locals(address=int, index=int)
+    cdef void _deferred_set(self, int, int) noexcept nogil
+    cdef void render_deferred(self) noexcept nogil
+    @cython.locals(n=int, key=int, value=int, disable_renderer=bint)
+    cdef void _deferred_replay(self) noexcept nogil
+
     # CGB
     cdef bint cgb
     cdef uint8_t speed_shift
     cdef uint8_t[8 * 1024] VRAM1
+    cdef uint8_t[32] VRAM1_dirty
     cdef VBKregister vbk
     cdef PaletteIndexRegister bcps
     cdef PaletteColorRegister bcpd
@@ -85,6 +115,7 @@ cdef class PaletteRegister:
     cdef bint set(self, uint64_t) noexcept nogil
     cdef uint8_t get(self) noexcept nogil
     cdef inline uint32_t getcolor(self, uint8_t) noexcept nogil
+    cdef inline uint8_t getshade(self, uint8_t) noexcept nogil
 
 cdef class STATRegister:
     cdef uint8_t value
@@ -120,19 +151,45 @@ cdef class Renderer:
     cdef str color_format
     cdef tuple buffer_dims
     cdef bint cgb
+    cdef bint indexed
 
     cdef array _screenbuffer_raw
     cdef array _screenbuffer_attributes_raw
+    cdef array _screenbuffer_indexed_raw
     cdef object _screenbuffer_ptr
     cdef array _tilecache0_raw, _spritecache0_raw, _spritecache1_raw
     cdef uint32_t[:,:] _screenbuffer
-    cdef uint8_t[:,:] _screenbuffer_attributes
+    cdef uint8_t[:,:] _screenbuffer_attributes, _screenbuffer_indexed
     cdef uint8_t[:,:] _tilecache0, _spritecache0, _spritecache1
     cdef uint64_t[:] _tilecache0_64, _tilecache1_64, _spritecache0_64, _spritecache1_64
     cdef uint32_t[:] colorcode_table
 
     cdef int[10] sprites_to_render
+    cdef bint sprites_dirty
+    cdef int sprites_height
+    cdef int[1440] _sprite_buckets
+    cdef uint8_t[144] _sprite_bucket_count
     cdef int ly_window
+
+    cdef bint observation, observation_box
+    cdef int observation_fx, observation_fy
+    cdef array _observation_raw, _observation_acc_raw, _observation_x_raw, _observation_y_raw
+    cdef uint8_t[:,:] _observation
+    cdef uint32_t[:] _observation_acc
+    cdef int[:] _observation_x, _observation_y
+    @cython.locals(r=int, y=int)
+    cdef array set_observation(self, int, int, bint)
+    @cython.locals(pixel=uint32_t)
+    cdef inline uint8_t _grayscale(self, int, int) noexcept nogil
+    @cython.locals(r=int, c=int, x=int, x0=int, cols=int)
+    cdef void scanline_observation(self, LCD, int) noexcept nogil
+
+    cdef bint layers
+    cdef array _layers_raw
+    cdef uint8_t[:,:,:] _layers
+    cdef array set_layers(self)
+    @cython.locals(layer=int, x=int)
+    cdef void clear_layers(self, int) noexcept nogil
     cdef void invalidate_tile(self, int, int) noexcept nogil
 
     cdef void blank_screen(self, LCD) noexcept nogil
@@ -162,15 +219,31 @@ cdef class Renderer:
 
     @cython.locals(tile_addr=uint64_t, tile=int)
     cdef inline (int, int, uint16_t) _get_tile(self, uint8_t, uint8_t, uint16_t, LCD) noexcept nogil
+    cdef inline void _setpixel(self, uint32_t[:,:], int, int, uint32_t) noexcept nogil
     @cython.locals(col0=uint8_t)
     cdef inline void _pixel(self, uint8_t[:,:], uint32_t, int, int, int, int, uint32_t) noexcept nogil
+    cdef uint32_t[4] _bg_colors
+    cdef uint8_t[4] _bg_shades
+    @cython.locals(c=uint8_t)
+    cdef inline void _bg_palette(self, PaletteRegister) noexcept nogil
+    cdef inline void _tilerow(self, int, int, uint64_t, int, int, int) noexcept nogil
+    @cython.locals(k=int, color_code=uint8_t)
+    cdef inline void _tilerow_rgba(self, int, int, uint64_t, int) noexcept nogil
+    @cython.locals(k=int, color_code=uint8_t)
+    cdef inline void _tilerow_indexed(self, int, int, uint64_t, int) noexcept nogil
+    @cython.locals(k=int)
+    cdef inline void _tilerow_layer(self, int, int, uint64_t, int, int) noexcept nogil
+    @cython.locals(x=int, end=int, b_xx=int, n=int, bt=int, b_yy=int)
     cdef int scanline_background(self, int, int, int, int, int, LCD) noexcept nogil
+    @cython.locals(x=int, end=int, xx=int, n=int, wt=int, yy=int)
     cdef int scanline_window(self, int, int, int, int, int, LCD) noexcept nogil
     cdef int scanline_blank(self, int, int, int, LCD) noexcept nogil
 
     @cython.locals(
         spriteheight=int,
         spritecount=int,
+        sprite_count=int,
+        i=int,
         n=int,
         x=int,
         y=int,
@@ -191,7 +264,14 @@ cdef class Renderer:
         bgmappriority=bint,
     )
     cdef void scanline_sprites(self, LCD, int, uint32_t[:,:], uint8_t[:,:], bint) noexcept nogil
-    cdef void sort_sprites(self, int) noexcept nogil
+    cdef uint64_t frame_hash, prev_frame_hash, _frame_hash_acc
+    @cython.locals(h=uint64_t, x=int)
+    cdef void scanline_hash(self, int) noexcept nogil
+
+    @cython.locals(i=int, j=int, key=int)
+    cdef void sort_sprites(self, int, int) noexcept nogil
+    @cython.locals(ly=int, n=int, x=int, y=int, sprite_count=int)
+    cdef void update_sprite_buckets(self, LCD, int) noexcept nogil
 
     cdef void clear_cache(self) noexcept nogil
     cdef void clear_tilecache0(self) noexcept nogil
@@ -246,7 +326,9 @@ cdef class Renderer:
     @cython.locals(colorcode_low=uint64_t, colorcode_high=uint64_t)
     cdef inline uint64_t colorcode(self, uint64_t, uint64_t) noexcept nogil
 
+    @cython.locals(state=uint8_t[:], screenbuffer=uint8_t[:], attributes=uint8_t[:], k=int)
     cdef int save_state(self, IntIOInterface) except -1
+    @cython.locals(state=uint8_t[:], screenbuffer=uint8_t[:], attributes=uint8_t[:], indexed=array, k=int, y=int)
     cdef int load_state(self, IntIOInterface, int) except -1
 
 
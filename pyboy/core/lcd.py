@@ -19,6 +19,10 @@ ROWS, COLS = 144, 160
 TILES = 384
 
 FRAME_CYCLES = 70224
+# Capacity and event keys of the log for deferred rendering. See LCD.render_deferred.
+DEFERRED_LOG_SIZE = 0x8000
+DEFERRED_SCANLINE = 0x1000000
+DEFERRED_BLANK = 0x2000000
 
 
 def rgb_to_bgr(color):
@@ -30,11 +34,25 @@ def rgb_to_bgr(color):
 
 
 class LCD:
-    def __init__(self, cgb, cartridge_cgb, color_palette, cgb_color_palette, randomize=False):
+    def __init__(
+        self, cgb, cartridge_cgb, color_palette, cgb_color_palette, randomize=False, indexed=False, deferred=False
+    ):
         self.VRAM0 = array("B", [0] * VIDEO_RAM)
         self.OAM = array("B", [0] * OBJECT_ATTRIBUTE_MEMORY)
+        # Pages of VRAM and OAM written since the last snapshot. See PyBoy.snapshot_incremental
+        self.VRAM0_dirty = array("B", [0] * (VIDEO_RAM >> 8))
+        self.OAM_dirty = array("B", [0])
         self.disable_renderer = False
 
+        # Log of the writes and scanlines of frames which are not rendered. See render_deferred.
+        self.deferred = deferred
+        self.deferred_recording = False
+        self._deferred_count = 0
+        self._deferred_ly_window = -1
+        log_size = DEFERRED_LOG_SIZE if deferred else 0
+        self._deferred_keys = memoryview(array("i", [0] * log_size))
+        self._deferred_values = memoryview(array("i", [0] * log_size))
+
         if randomize:
             for i in range(VIDEO_RAM):
                 self.VRAM0[i] = getrandbits(8)
@@ -64,7 +82,9 @@ class LCD:
         self.WX = 0x00
 
         self.cgb = cgb
-        self._scanlineparameters = [[0, 0, 0, 0, 0] for _ in range(ROWS)]
+        # SCX, SCY, WX - 7, WY and tile data select of each scanline. Exposed through Screen.tilemap_position_ndarray
+        self._scanlineparameters_raw = array("i", [0, 0, -7, 0, 0] * ROWS)
+        self._scanlineparameters = memoryview(self._scanlineparameters_raw).cast("B").cast("i", shape=(ROWS, 5))
         self.last_cycles = 0
         self._cycles_to_interrupt = 0
         self._cycles_to_frame = (FRAME_CYCLES << self.speed_shift) - self.clock
@@ -77,17 +97,17 @@ class LCD:
             self.OBP1 = PaletteRegister(0xFF, [(rgb_to_bgr(c)) for c in obj1_pal])
             if cartridge_cgb:
                 logger.debug("Starting CGB renderer")
-                self.renderer = CGBRenderer()
+                self.renderer = CGBRenderer(indexed)
             else:
                 logger.debug("Starting CGB renderer in DMG-mode")
                 # Running DMG ROM on CGB hardware uses the palettes above
-                self.renderer = Renderer(False)
+                self.renderer = Renderer(False, indexed)
         else:
             logger.debug("Starting DMG renderer")
             self.BGP = PaletteRegister(0xFC, [(rgb_to_bgr(c)) for c in color_palette])
             self.OBP0 = PaletteRegister(0xFF, [(rgb_to_bgr(c)) for c in color_palette])
             self.OBP1 = PaletteRegister(0xFF, [(rgb_to_bgr(c)) for c in color_palette])
-            self.renderer = Renderer(False)
+            self.renderer = Renderer(False, indexed)
 
     def set_lcdc(self, value):
         _lcd_enable = self._LCDC.lcd_enable
@@ -201,16 +221,16 @@ class LCD:
                     # Recorded for API
                     bx, by = self.getviewport()
                     wx, wy = self.getwindowpos()
-                    self._scanlineparameters[self.LY][0] = bx
-                    self._scanlineparameters[self.LY][1] = by
-                    self._scanlineparameters[self.LY][2] = wx + 7
-                    self._scanlineparameters[self.LY][3] = wy
-                    self._scanlineparameters[self.LY][4] = self._LCDC.tiledata_select
-
-                    self.renderer.scanline(self, self.LY)
-                    self.renderer.scanline_sprites(
-                        self, self.LY, self.renderer._screenbuffer, self.renderer._screenbuffer_attributes, False
-                    )
+                    self._scanlineparameters[self.LY, 0] = bx
+                    self._scanlineparameters[self.LY, 1] = by
+                    self._scanlineparameters[self.LY, 2] = wx
+                    self._scanlineparameters[self.LY, 3] = wy
+                    self._scanlineparameters[self.LY, 4] = self._LCDC.tiledata_select
+
+                    if self.deferred_recording:
+                        self._deferred_push(DEFERRED_SCANLINE | self.LY, self.first_frame)
+                    else:
+                        self.render_scanline(self.LY, self.first_frame)
                     if self.LY < 143:
                         self.next_stat_mode = 2
                     else:
@@ -228,7 +248,10 @@ class LCD:
                             # Pan Docs: https://gbdev.io/pandocs/LCDC.html#lcdc7--lcd-enable
                             # When re-enabling the LCD, the PPU will immediately start drawing again, but the screen
                             # will stay blank during the first frame.
-                            self.renderer.blank_screen(self)
+                            if self.deferred_recording:
+                                self._deferred_push(DEFERRED_BLANK, 0)
+                            else:
+                                self.renderer.blank_screen(self)
                             self.first_frame = False
             else:
                 # See also `self.set_lcdc`
@@ -237,19 +260,172 @@ class LCD:
                 self.clock_target = FRAME_CYCLES << self.speed_shift
 
                 # Renderer
-                self.renderer.blank_screen(self)
+                if self.deferred_recording:
+                    self._deferred_push(DEFERRED_BLANK, 0)
+                else:
+                    self.renderer.blank_screen(self)
 
         self._cycles_to_interrupt = self.clock_target - self.clock
         # TODO: STAT Cycles to interrupts
         self._cycles_to_frame = (FRAME_CYCLES << self.speed_shift) - self.clock
         return interrupt_flag
 
+    def render_scanline(self, y, first_frame):
+        self.renderer.scanline(self, y)
+        self.renderer.scanline_sprites(
+            self, y, self.renderer._screenbuffer, self.renderer._screenbuffer_attributes, False
+        )
+        # The first frame is blanked instead. See tick.
+        if not self.disable_renderer and not first_frame:
+            self.renderer.scanline_hash(y)
+        if self.renderer.observation:
+            self.renderer.scanline_observation(self, y)
+
+    def begin_deferred(self, record):
+        # Drops the frame recorded before, and starts recording this one if it's not rendered
+        self._deferred_count = 0
+        self._deferred_ly_window = self.renderer.ly_window
+        self.deferred_recording = record
+
+    def deferred_log(self, address, index):
+        # Called before writes to VRAM, OAM and the registers used for rendering. The index is the VRAM bank, or the
+        # palette index for BCPD and OCPD.
+        key = address | (index << 16)
+        value = self._deferred_get(key)
+        if value != -1:
+            self._deferred_push(key, value)
+
+    def _deferred_push(self, key, value):
+        self._deferred_keys[self._deferred_count] = key
+        self._deferred_values[self._deferred_count] = value
+        self._deferred_count += 1
+
+        if self._deferred_count == DEFERRED_LOG_SIZE:
+            # The log is full. Render what we have so far, and render the rest of the frame as usual.
+            self._deferred_replay()
+            self.deferred_recording = False
+            self.disable_renderer = False
+
+    def _deferred_get(self, key):
+        address = key & 0xFFFF
+        index = key >> 16
+        if 0x8000 <= address < 0xA000:
+            if index:
+                return self.VRAM1[address - 0x8000]
+            return self.VRAM0[address - 0x8000]
+        elif 0xFE00 <= address < 0xFEA0:
+            return self.OAM[address - 0xFE00]
+        elif address == 0xFF40:
+            return self._LCDC.value
+        elif address == 0xFF42:
+            return self.SCY
+        elif address == 0xFF43:
+            return self.SCX
+        elif address == 0xFF47:
+            return self.BGP.value
+        elif address == 0xFF48:
+            return self.OBP0.value
+        elif address == 0xFF49:
+            return self.OBP1.value
+        elif address == 0xFF4A:
+            return self.WY
+        elif address == 0xFF4B:
+            return self.WX
+        elif address == 0xFF69:
+            return self.bcpd.palette_mem[index]
+        elif address == 0xFF6B:
+            return self.ocpd.palette_mem[index]
+        return -1  # Not used for rendering
+
+    def _deferred_set(self, key, value):
+        # Same side-effects as in Motherboard.setitem, but without ticking the LCD
+        address = key & 0xFFFF
+        index = key >> 16
+        if 0x8000 <= address < 0xA000:
+            if index:
+                self.VRAM1[address - 0x8000] = value
+            else:
+                self.VRAM0[address - 0x8000] = value
+            if address < 0x9800:
+                self.renderer.invalidate_tile((address - 0x8000) // 16, index)
+        elif 0xFE00 <= address < 0xFEA0:
+            self.OAM[address - 0xFE00] = value
+            self.renderer.sprites_dirty = True
+        elif address == 0xFF40:
+            # Not using set_lcdc, as it would reset the clock of the LCD
+            self._LCDC.set(value)
+        elif address == 0xFF42:
+            self.SCY = value
+        elif address == 0xFF43:
+            self.SCX = value
+        elif address == 0xFF47:
+            if self.BGP.set(value):
+                self.renderer.clear_tilecache0()
+        elif address == 0xFF48:
+            if self.OBP0.set(value):
+                self.renderer.clear_spritecache0()
+        elif address == 0xFF49:
+            if self.OBP1.set(value):
+                self.renderer.clear_spritecache1()
+        elif address == 0xFF4A:
+            self.WY = value
+        elif address == 0xFF4B:
+            self.WX = value
+        elif address == 0xFF69:
+            self.bcpd.palette_mem[index] = value
+            self.bcpd.palette_mem_rgb[index] = self.bcpd.cgb_to_rgb(value, index)
+            self.renderer.clear_tilecache0()
+            self.renderer.clear_tilecache1()
+        elif address == 0xFF6B:
+            self.ocpd.palette_mem[index] = value
+            self.ocpd.palette_mem_rgb[index] = self.ocpd.cgb_to_rgb(value, index)
+            self.renderer.clear_spritecache0()
+            self.renderer.clear_spritecache1()
+
+    def render_deferred(self):
+        # Renders the last recorded frame, if it hasn't been rendered already
+        if self.deferred_recording or self._deferred_count == 0:
+            return
+        self._deferred_replay()
+
+    def _deferred_replay(self):
+        # Undo the logged writes to get VRAM, OAM and the registers as they were at the start of the frame. The value
+        # from before the undo is kept in the log, so any changes made after the frame are preserved.
+        for n in range(self._deferred_count - 1, -1, -1):
+            key = self._deferred_keys[n]
+            if key < DEFERRED_SCANLINE:
+                value = self._deferred_get(key)
+                self._deferred_set(key, self._deferred_values[n])
+                self._deferred_values[n] = value
+
+        # Redo the writes in order between the scanlines
+        disable_renderer = self.disable_renderer
+        self.disable_renderer = False
+        self.renderer.ly_window = self._deferred_ly_window
+        for n in range(self._deferred_count):
+            key = self._deferred_keys[n]
+            if key == DEFERRED_BLANK:
+                self.renderer.blank_screen(self)
+            elif key & DEFERRED_SCANLINE:
+                self.render_scanline(key & 0xFF, self._deferred_values[n])
+            else:
+                self._deferred_set(key, self._deferred_values[n])
+        self.disable_renderer = disable_renderer
+        self._deferred_count = 0
+
+    def set_dirty(self, value):
+        for n in range(VIDEO_RAM >> 8):
+            self.VRAM0_dirty[n] = value
+            if self.cgb:
+                self.VRAM1_dirty[n] = value
+        self.OAM_dirty[0] = value
+
     def save_state(self, f):
-        for n in range(VIDEO_RAM):
-            f.write(self.VRAM0[n])
+        # The screen buffer is saved by the renderer
+        self.render_deferred()
 
-        for n in range(OBJECT_ATTRIBUTE_MEMORY):
-            f.write(self.OAM[n])
+        f.write_buffer_dirty(self.VRAM0, self.VRAM0_dirty)
+        f.write_buffer_dirty(self.OAM, self.OAM_dirty)
 
         f.write(self._LCDC.value)  # TODO: Mode to class
         f.write(self.BGP.value)
@@ -266,12 +442,12 @@ class LCD:
         f.write(self.WX)
 
         for y in range(ROWS):
-            f.write(self._scanlineparameters[y][0])
-            f.write(self._scanlineparameters[y][1])
-            # We store (WX + 7). We added 7 earlier to make it easier to serialize
-            f.write(self._scanlineparameters[y][2])
-            f.write(self._scanlineparameters[y][3])
-            f.write(self._scanlineparameters[y][4])
+            f.write(self._scanlineparameters[y, 0])
+            f.write(self._scanlineparameters[y, 1])
+            # We store (WX + 7), as (WX - 7) can be negative
+            f.write(self._scanlineparameters[y, 2] + 7)
+            f.write(self._scanlineparameters[y, 3])
+            f.write(self._scanlineparameters[y, 4])
 
         f.write(self.cgb)
         f.write(self.speed_shift)
@@ -284,8 +460,7 @@ class LCD:
         f.write(self.next_stat_mode)
 
         if self.cgb:
-            for n in range(VIDEO_RAM):
-                f.write(self.VRAM1[n])
+            f.write_buffer_dirty(self.VRAM1, self.VRAM1_dirty)
             f.write(self.vbk.active_bank)
             self.bcps.save_state(f)
             self.bcpd.save_state(f)
@@ -293,11 +468,12 @@ class LCD:
             self.ocpd.save_state(f)
 
     def load_state(self, f, state_version):
-        for n in range(VIDEO_RAM):
-            self.VRAM0[n] = f.read()
+        # The screen buffer is loaded by the renderer
+        self._deferred_count = 0
 
-        for n in range(OBJECT_ATTRIBUTE_MEMORY):
-            self.OAM[n] = f.read()
+        self.load_vram(f, self.VRAM0, 0)
+        f.read_buffer(self.OAM)
+        self.renderer.sprites_dirty = True
 
         self.set_lcdc(f.read())  # TODO: Mode to class
         self.BGP.set(f.read())
@@ -316,13 +492,13 @@ class LCD:
 
         if state_version >= 11:
             for y in range(ROWS):
-                self._scanlineparameters[y][0] = f.read()
-                self._scanlineparameters[y][1] = f.read()
+                self._scanlineparameters[y, 0] = f.read()
+                self._scanlineparameters[y, 1] = f.read()
                 # Restore (WX - 7) as described above
-                self._scanlineparameters[y][2] = f.read()
-                self._scanlineparameters[y][3] = f.read()
+                self._scanlineparameters[y, 2] = f.read() - 7
+                self._scanlineparameters[y, 3] = f.read()
                 if state_version > 3:
-                    self._scanlineparameters[y][4] = f.read()
+                    self._scanlineparameters[y, 4] = f.read()
 
         if state_version >= 8:
             _cgb = f.read()
@@ -346,14 +522,22 @@ class LCD:
             self.next_stat_mode = f.read()
 
             if self.cgb:
-                for n in range(VIDEO_RAM):
-                    self.VRAM1[n] = f.read()
+                self.load_vram(f, self.VRAM1, 1)
                 self.vbk.active_bank = f.read()
                 self.bcps.load_state(f, state_version)
                 self.bcpd.load_state(f, state_version)
                 self.ocps.load_state(f, state_version)
                 self.ocpd.load_state(f, state_version)
 
+    def load_vram(self, f, vram, bank):
+        state = array("B", bytes(VIDEO_RAM))
+        f.read_buffer(state)
+        # Only invalidate the cached tiles which change, instead of clearing the whole cache
+        for n in range(0x1800):
+            if vram[n] != state[n]:
+                self.renderer.invalidate_tile(n // 16, bank)
+        vram[:] = state
+
     def getwindowpos(self):
         return (self.WX - 7, self.WY)
 
@@ -384,6 +568,9 @@ class PaletteRegister:
     def getcolor(self, i):
         return self.lookup[i]
 
+    def getshade(self, i):
+        return (self.value >> (i * 2)) & 0b11
+
 
 class STATRegister:
     def __init__(self):
@@ -461,21 +648,39 @@ class LCDCRegister:
 COL0_FLAG = 0b01
 BG_PRIORITY_FLAG = 0b10
 
+# 64-bit FNV-1a parameters for Renderer.scanline_hash
+FNV_OFFSET = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+FNV_MASK = 0xFFFFFFFFFFFFFFFF
+# Planes of Renderer.set_layers, and the value of the pixels a layer doesn't cover
+LAYER_BACKGROUND, LAYER_WINDOW, LAYER_SPRITES = 0, 1, 2
+LAYER_EMPTY = 0xFF
+
 
 class Renderer:
-    def __init__(self, cgb):
+    def __init__(self, cgb, indexed=False):
         self.cgb = cgb
         self.color_format = "RGBA"
+        # Write palette indices to _screenbuffer_indexed instead of RGBA to _screenbuffer
+        self.indexed = indexed
 
         self.buffer_dims = (ROWS, COLS)
 
         # Init buffers as white
         self._screenbuffer_raw = array("B", [0x00] * (ROWS * COLS * 4))
         self._screenbuffer_attributes_raw = array("B", [0x00] * (ROWS * COLS))
+        self._screenbuffer_indexed_raw = array("B", [0x00] * (ROWS * COLS))
         self._tilecache0_raw = array("B", [0x00] * (TILES * 8 * 8))
         self._spritecache0_raw = array("B", [0x00] * (TILES * 8 * 8))
         self._spritecache1_raw = array("B", [0x00] * (TILES * 8 * 8))
         self.sprites_to_render = array("i", [0] * 10)
+        self._bg_colors = array("I", [0] * 4)
+        self._bg_shades = array("B", [0] * 4)
+        # The first 10 sprites of each scanline, sorted by priority. Rebuilt when OAM or the sprite height changes.
+        self.sprites_dirty = True
+        self.sprites_height = 0
+        self._sprite_buckets = array("i", [0] * (ROWS * 10))
+        self._sprite_bucket_count = array("B", [0] * ROWS)
 
         self._tilecache0_state = array("B", [0] * TILES)
         self._spritecache0_state = array("B", [0] * TILES)
@@ -484,6 +689,7 @@ class Renderer:
 
         self._screenbuffer = memoryview(self._screenbuffer_raw).cast("I", shape=(ROWS, COLS))
         self._screenbuffer_attributes = memoryview(self._screenbuffer_attributes_raw).cast("B", shape=(ROWS, COLS))
+        self._screenbuffer_indexed = memoryview(self._screenbuffer_indexed_raw).cast("B", shape=(ROWS, COLS))
         self._tilecache0 = memoryview(self._tilecache0_raw).cast("B", shape=(TILES * 8, 8))
         self._tilecache0_64 = memoryview(self._tilecache0_raw).cast("Q", shape=(TILES * 8,))
 
@@ -520,9 +726,59 @@ class Renderer:
 
         self.ly_window = 0
 
+        # Downscaled grayscale copy of the screen. See set_observation.
+        self.observation = False
+        self.observation_box = False
+        self.observation_fx = 1
+        self.observation_fy = 1
+
+        # Palette indices of the background, window and sprites in separate planes. See set_layers.
+        self.layers = False
+
+        # Hash of the last rendered frame and the one before it. See scanline_hash.
+        self.frame_hash = 0
+        self.prev_frame_hash = 0
+        self._frame_hash_acc = FNV_OFFSET
+
+    def set_observation(self, rows, cols, box):
+        self._observation_raw = array("B", [0x00] * (rows * cols))
+        self._observation = memoryview(self._observation_raw).cast("B", shape=(rows, cols))
+        # Box filtering sums up fx * fy pixels of the screen for each pixel. Nearest sampling takes the pixel at the
+        # start of each box, and skips the scanlines in between.
+        self.observation_box = box
+        self.observation_fx = COLS // cols
+        self.observation_fy = ROWS // rows
+        self._observation_acc_raw = array("I", [0] * cols)
+        self._observation_acc = memoryview(self._observation_acc_raw)
+        self._observation_x_raw = array("i", [c * COLS // cols for c in range(cols)])
+        self._observation_x = memoryview(self._observation_x_raw)
+        self._observation_y_raw = array("i", [-1] * ROWS)
+        for r in range(rows):
+            self._observation_y_raw[r * ROWS // rows] = r
+        if box:
+            for y in range(ROWS):
+                self._observation_y_raw[y] = y // self.observation_fy
+        self._observation_y = memoryview(self._observation_y_raw)
+        self.observation = True
+        return self._observation_raw
+
+    def set_layers(self):
+        # The planes are filled as each scanline is rendered, so they don't cost an extra pass over the frame
+        self._layers_raw = array("B", [LAYER_EMPTY] * (3 * ROWS * COLS))
+        self._layers = memoryview(self._layers_raw).cast("B", shape=(3, ROWS, COLS))
+        self.layers = True
+        return self._layers_raw
+
+    def clear_layers(self, y):
+        for layer in range(3):
+            for x in range(COLS):
+                self._layers[layer, y, x] = LAYER_EMPTY
+
     def scanline(self, lcd, y):
         if lcd.disable_renderer:
             return
+        if self.layers:
+            self.clear_layers(y)
 
         bx, by = lcd.getviewport()
         wx, wy = lcd.getwindowpos()
@@ -561,91 +817,197 @@ class Renderer:
         yy = 8 * tile + y % 8
         return tile, yy, tile_addr
 
+    def _setpixel(self, buffer, y, x, pixel):
+        # In indexed mode, the pixel is a palette index and goes to the indexed buffer instead
+        if self.indexed:
+            self._screenbuffer_indexed[y, x] = pixel
+        else:
+            buffer[y, x] = pixel
+
     def _pixel(self, tilecache, pixel, x, y, xx, yy, bg_priority_apply):
         col0 = (tilecache[yy, xx] == 0) & 1
-        self._screenbuffer[y, x] = pixel
+        self._setpixel(self._screenbuffer, y, x, pixel)
         # COL0_FLAG is 1
         self._screenbuffer_attributes[y, x] = bg_priority_apply | col0
 
+    def _bg_palette(self, palette):
+        # Colors and shades of the 4 color codes, resolved once per scanline instead of for each pixel
+        for c in range(4):
+            self._bg_colors[c] = palette.getcolor(c)
+            self._bg_shades[c] = palette.getshade(c)
+
+    def _tilerow(self, y, x, row, xx, n, layer):
+        # Blits n pixels of a 64-bit tile cache row, starting from pixel xx. Each byte of the row is a color code.
+        row >>= 8 * xx
+        if self.indexed:
+            self._tilerow_indexed(y, x, row, n)
+        else:
+            self._tilerow_rgba(y, x, row, n)
+        if self.layers:
+            self._tilerow_layer(y, x, row, n, layer)
+
+    def _tilerow_rgba(self, y, x, row, n):
+        for k in range(x, x + n):
+            color_code = row & 0xFF
+            self._screenbuffer[y, k] = self._bg_colors[color_code]
+            # COL0_FLAG is 1
+            self._screenbuffer_attributes[y, k] = color_code == 0
+            row >>= 8
+
+    def _tilerow_indexed(self, y, x, row, n):
+        for k in range(x, x + n):
+            color_code = row & 0xFF
+            self._screenbuffer_indexed[y, k] = self._bg_shades[color_code]
+            # COL0_FLAG is 1
+            self._screenbuffer_attributes[y, k] = color_code == 0
+            row >>= 8
+
+    def _tilerow_layer(self, y, x, row, n, layer):
+        for k in range(x, x + n):
+            self._layers[layer, y, k] = self._bg_shades[row & 0xFF]
+            row >>= 8
+
     def scanline_window(self, y, _x, wx, wy, cols, lcd):
-        for x in range(_x, _x + cols):
+        self._bg_palette(lcd.BGP)
+        x = _x
+        end = _x + cols
+        while x < end:
+            # Whole tile rows at a time, only the first tile can be partial
             xx = (x - wx) % 8
-            if xx == 0 or x == _x:
-                wt, yy, _ = self._get_tile(self.ly_window, x - wx, lcd._LCDC.windowmap_offset, lcd)
-                self.update_tilecache0(lcd, wt, 0)
-
-            pixel = lcd.BGP.getcolor(self._tilecache0[yy, xx])
-            self._pixel(self._tilecache0, pixel, x, y, xx, yy, 0)
+            n = min(8 - xx, end - x)
+            wt, yy, _ = self._get_tile(self.ly_window, x - wx, lcd._LCDC.windowmap_offset, lcd)
+            self.update_tilecache0(lcd, wt, 0)
+            self._tilerow(y, x, self._tilecache0_64[yy], xx, n, LAYER_WINDOW)
+            x += n
         return cols
 
     def scanline_background(self, y, _x, bx, by, cols, lcd):
-        for x in range(_x, _x + cols):
-            # bx mask used for the half tile at the left side when scrolling
+        self._bg_palette(lcd.BGP)
+        x = _x
+        end = _x + cols
+        while x < end:
+            # bx mask used for the half tile at the left side when scrolling. The last tile is cut at end.
             b_xx = (x + (bx & 0b111)) % 8
-            if b_xx == 0 or x == 0:
-                bt, b_yy, _ = self._get_tile(y + by, x + bx, lcd._LCDC.backgroundmap_offset, lcd)
-                self.update_tilecache0(lcd, bt, 0)
-
-            xx = b_xx
-            yy = b_yy
-
-            pixel = lcd.BGP.getcolor(self._tilecache0[yy, xx])
-            self._pixel(self._tilecache0, pixel, x, y, xx, yy, 0)
+            n = min(8 - b_xx, end - x)
+            bt, b_yy, _ = self._get_tile(y + by, x + bx, lcd._LCDC.backgroundmap_offset, lcd)
+            self.update_tilecache0(lcd, bt, 0)
+            self._tilerow(y, x, self._tilecache0_64[b_yy], b_xx, n, LAYER_BACKGROUND)
+            x += n
         return cols
 
     def scanline_blank(self, y, _x, cols, lcd):
         # If background is disabled, it becomes white
+        pixel = lcd.BGP.getshade(0) if self.indexed else lcd.BGP.getcolor(0)
         for x in range(_x, _x + cols):
-            self._screenbuffer[y, x] = lcd.BGP.getcolor(0)
+            self._setpixel(self._screenbuffer, y, x, pixel)
             self._screenbuffer_attributes[y, x] = 0
         return cols
 
-    def sort_sprites(self, sprite_count):
-        # Use insertion sort, as it has O(n) on already sorted arrays. This
-        # functions is likely called multiple times with unchanged data.
+    def _grayscale(self, y, x):
+        if self.indexed:
+            return self._screenbuffer_indexed[y, x]
+        pixel = self._screenbuffer[y, x]
+        # ITU-R 601 luma of the red, green and blue bytes
+        return ((pixel & 0xFF) * 77 + ((pixel >> 8) & 0xFF) * 150 + ((pixel >> 16) & 0xFF) * 29) >> 8
+
+    def scanline_observation(self, lcd, y):
+        if lcd.disable_renderer:
+            return
+
+        r = self._observation_y[y]
+        if r == -1:
+            return
+
+        cols = self._observation.shape[1]
+        if self.observation_box:
+            if y % self.observation_fy == 0:
+                for c in range(cols):
+                    self._observation_acc[c] = 0
+            for c in range(cols):
+                x0 = self._observation_x[c]
+                for x in range(x0, x0 + self.observation_fx):
+                    self._observation_acc[c] += self._grayscale(y, x)
+            if (y + 1) % self.observation_fy == 0:
+                for c in range(cols):
+                    self._observation[r, c] = self._observation_acc[c] // (self.observation_fx * self.observation_fy)
+        else:
+            for c in range(cols):
+                self._observation[r, c] = self._grayscale(y, self._observation_x[c])
+
+    def scanline_hash(self, y):
+        # Hash the pixels of the scanline into the hash of the frame, and finish it on the last scanline
+        h = FNV_OFFSET if y == 0 else self._frame_hash_acc
+        if self.indexed:
+            for x in range(COLS):
+                h = ((h ^ self._screenbuffer_indexed[y, x]) * FNV_PRIME) & FNV_MASK
+        else:
+            for x in range(COLS):
+                h = ((h ^ self._screenbuffer[y, x]) * FNV_PRIME) & FNV_MASK
+        self._frame_hash_acc = h
+
+        if y == ROWS - 1:
+            self.prev_frame_hash = self.frame_hash
+            self.frame_hash = h
+
+    def sort_sprites(self, offset, sprite_count):
+        # Use insertion sort, as it has O(n) on already sorted arrays.
         # Sort descending because of the sprite priority.
 
-        for i in range(1, sprite_count):
-            key = self.sprites_to_render[i]  # The current element to be inserted into the sorted portion
+        for i in range(offset + 1, offset + sprite_count):
+            key = self._sprite_buckets[i]  # The current element to be inserted into the sorted portion
             j = i - 1  # Index of the last element in the sorted portion of the array
 
             # Move elements of the sorted portion greater than the key to the right
-            while j >= 0 and key > self.sprites_to_render[j]:
-                self.sprites_to_render[j + 1] = self.sprites_to_render[j]
+            while j >= offset and key > self._sprite_buckets[j]:
+                self._sprite_buckets[j + 1] = self._sprite_buckets[j]
                 j -= 1
 
             # Insert the key into its correct position in the sorted portion
-            self.sprites_to_render[j + 1] = key
+            self._sprite_buckets[j + 1] = key
 
-    def scanline_sprites(self, lcd, ly, buffer, buffer_attributes, ignore_priority):
-        if not lcd._LCDC.sprite_enable or lcd.disable_renderer:
-            return
+    def update_sprite_buckets(self, lcd, spriteheight):
+        for ly in range(ROWS):
+            self._sprite_bucket_count[ly] = 0
 
-        # Find the first 10 sprites in OAM that appears on this scanline.
+        # Find the first 10 sprites in OAM that appears on each scanline.
         # The lowest X-coordinate has priority, when overlapping
-        spriteheight = 16 if lcd._LCDC.sprite_height else 8
-        sprite_count = 0
         for n in range(0x00, 0xA0, 4):
             y = lcd.OAM[n] - 16  # Documentation states the y coordinate needs to be subtracted by 16
             x = lcd.OAM[n + 1] - 8  # Documentation states the x coordinate needs to be subtracted by 8
 
-            if y <= ly < y + spriteheight:
+            for ly in range(max(y, 0), min(y + spriteheight, ROWS)):
+                sprite_count = self._sprite_bucket_count[ly]
+                if sprite_count == 10:
+                    continue
                 # x is used for sorting for priority
                 if self.cgb:
-                    self.sprites_to_render[sprite_count] = n
+                    self._sprite_buckets[ly * 10 + sprite_count] = n
                 else:
-                    self.sprites_to_render[sprite_count] = x << 16 | n
-                sprite_count += 1
-
-            if sprite_count == 10:
-                break
+                    self._sprite_buckets[ly * 10 + sprite_count] = x << 16 | n
+                self._sprite_bucket_count[ly] = sprite_count + 1
 
         # Pan docs:
         # When these 10 sprites overlap, the highest priority one will appear above all others, etc. (Thus, no
         # Z-fighting.) In CGB mode, the first sprite in OAM ($FE00-$FE03) has the highest priority, and so on. In
         # Non-CGB mode, the smaller the X coordinate, the higher the priority. The tie breaker (same X coordinates) is
         # the same priority as in CGB mode.
-        self.sort_sprites(sprite_count)
+        for ly in range(ROWS):
+            self.sort_sprites(ly * 10, self._sprite_bucket_count[ly])
+
+        self.sprites_height = spriteheight
+        self.sprites_dirty = False
+
+    def scanline_sprites(self, lcd, ly, buffer, buffer_attributes, ignore_priority):
+        if not lcd._LCDC.sprite_enable or lcd.disable_renderer:
+            return
+
+        spriteheight = 16 if lcd._LCDC.sprite_height else 8
+        if self.sprites_dirty or spriteheight != self.sprites_height:
+            self.update_sprite_buckets(lcd, spriteheight)
+
+        sprite_count = self._sprite_bucket_count[ly]
+        for i in range(sprite_count):
+            self.sprites_to_render[i] = self._sprite_buckets[ly * 10 + i]
 
         for _n in self.sprites_to_render[:sprite_count]:
             if self.cgb:
@@ -695,35 +1057,52 @@ class Renderer:
                 xx = 7 - dx if xflip else dx
                 color_code = spritecache[8 * tileindex + yy, xx]
                 if 0 <= x < COLS and not color_code == 0:  # If pixel is not transparent
+                    if self.layers:
+                        # The sprite plane has every sprite pixel, also the ones behind the background
+                        if self.cgb:
+                            self._layers[LAYER_SPRITES, ly, x] = CGB_OBJ_INDEX | (palette * 4 + color_code)
+                        elif attributes & 0b10000:
+                            self._layers[LAYER_SPRITES, ly, x] = lcd.OBP1.getshade(color_code)
+                        else:
+                            self._layers[LAYER_SPRITES, ly, x] = lcd.OBP0.getshade(color_code)
+
                     if self.cgb:
-                        pixel = lcd.ocpd.getcolor(palette, color_code)
+                        if self.indexed:
+                            pixel = CGB_OBJ_INDEX | (palette * 4 + color_code)
+                        else:
+                            pixel = lcd.ocpd.getcolor(palette, color_code)
                         bgmappriority = buffer_attributes[ly, x] & BG_PRIORITY_FLAG
 
                         if lcd._LCDC.cgb_master_priority:  # If 0, sprites are always on top, if 1 follow priorities
                             if bgmappriority:  # If 0, use spritepriority, if 1 take priority
                                 if buffer_attributes[ly, x] & COL0_FLAG:
-                                    buffer[ly, x] = pixel
+                                    self._setpixel(buffer, ly, x, pixel)
                             elif (
                                 spritepriority
                             ):  # If 1, sprite is behind bg/window. Color 0 of window/bg is transparent
                                 if buffer_attributes[ly, x] & COL0_FLAG:
-                                    buffer[ly, x] = pixel
+                                    self._setpixel(buffer, ly, x, pixel)
                             else:
-                                buffer[ly, x] = pixel
+                                self._setpixel(buffer, ly, x, pixel)
                         else:
-                            buffer[ly, x] = pixel
+                            self._setpixel(buffer, ly, x, pixel)
                     else:
                         # TODO: Unify with CGB
-                        if attributes & 0b10000:
+                        if self.indexed:
+                            if attributes & 0b10000:
+                                pixel = lcd.OBP1.getshade(color_code)
+                            else:
+                                pixel = lcd.OBP0.getshade(color_code)
+                        elif attributes & 0b10000:
                             pixel = lcd.OBP1.getcolor(color_code)
                         else:
                             pixel = lcd.OBP0.getcolor(color_code)
 
                         if spritepriority:  # If 1, sprite is behind bg/window. Color 0 of window/bg is transparent
                             if buffer_attributes[ly, x] & COL0_FLAG:  # if BG pixel is transparent
-                                buffer[ly, x] = pixel
+                                self._setpixel(buffer, ly, x, pixel)
                         else:
-                            buffer[ly, x] = pixel
+                            self._setpixel(buffer, ly, x, pixel)
                 x += 1
             x -= 8
 
@@ -809,16 +1188,31 @@ class Renderer:
 
     def blank_screen(self, lcd):
         # If the screen is off, fill it with a color.
+        pixel = lcd.BGP.getshade(0) if self.indexed else lcd.BGP.getcolor(0)
         for y in range(ROWS):
             for x in range(COLS):
-                self._screenbuffer[y, x] = lcd.BGP.getcolor(0)
+                self._setpixel(self._screenbuffer, y, x, pixel)
                 self._screenbuffer_attributes[y, x] = 0
+            if self.layers:
+                self.clear_layers(y)
+            self.scanline_hash(y)
+            if self.observation:
+                self.scanline_observation(lcd, y)
 
     def save_state(self, f):
-        for y in range(ROWS):
-            for x in range(COLS):
-                f.write_32bit(self._screenbuffer[y, x])
-                f.write(self._screenbuffer_attributes[y, x])
+        # Each pixel is stored as the 32-bit color, followed by the attributes
+        state = array("B", bytes(ROWS * COLS * 5))
+        screenbuffer = self._screenbuffer_raw
+        for k in range(4):
+            state[k::5] = screenbuffer[k::4]
+        attributes = self._screenbuffer_attributes_raw
+        state[4::5] = attributes
+        f.write_buffer(state)
+
+        # The palette indices are only rendered in indexed mode
+        f.write(self.indexed)
+        if self.indexed:
+            f.write_buffer(self._screenbuffer_indexed_raw)
 
     def load_state(self, f, state_version):
         if 2 <= state_version < 11:
@@ -831,14 +1225,28 @@ class Renderer:
                 if state_version > 3:
                     f.read()
 
+        if state_version >= 10:
+            state = array("B", bytes(ROWS * COLS * 5))
+            f.read_buffer(state)
+            screenbuffer = self._screenbuffer_raw
+            for k in range(4):
+                screenbuffer[k::4] = state[k::5]
+            attributes = self._screenbuffer_attributes_raw
+            attributes[:] = state[4::5]
+        elif state_version >= 6:
+            # Without the attributes
+            f.read_buffer(self._screenbuffer_raw)
+
+        indexed = array("B", bytes(ROWS * COLS))
+        if state_version >= 15 and f.read():
+            f.read_buffer(indexed)
+        if self.indexed:
+            # Blank if the state wasn't saved in indexed mode
+            self._screenbuffer_indexed_raw[:] = indexed
+
         if state_version >= 6:
             for y in range(ROWS):
-                for x in range(COLS):
-                    self._screenbuffer[y, x] = f.read_32bit()
-                    if state_version >= 10:
-                        self._screenbuffer_attributes[y, x] = f.read()
-
-        self.clear_cache()
+                self.scanline_hash(y)
 
 
 ####################################
@@ -852,9 +1260,21 @@ class Renderer:
 
 
 class CGBLCD(LCD):
-    def __init__(self, cgb, cartridge_cgb, color_palette, cgb_color_palette, randomize=False):
-        LCD.__init__(self, cgb, cartridge_cgb, color_palette, cgb_color_palette, randomize=False)
+    def __init__(
+        self, cgb, cartridge_cgb, color_palette, cgb_color_palette, randomize=False, indexed=False, deferred=False
+    ):
+        LCD.__init__(
+            self,
+            cgb,
+            cartridge_cgb,
+            color_palette,
+            cgb_color_palette,
+            randomize=False,
+            indexed=indexed,
+            deferred=deferred,
+        )
         self.VRAM1 = array("B", [0] * VIDEO_RAM)
+        self.VRAM1_dirty = array("B", [0] * (VIDEO_RAM >> 8))
 
         self.vbk = VBKregister()
         self.bcps = PaletteIndexRegister()
@@ -864,9 +1284,9 @@ class CGBLCD(LCD):
 
 
 class CGBRenderer(Renderer):
-    def __init__(self):
+    def __init__(self, indexed=False):
         self._tilecache1_state = array("B", [0] * TILES)
-        Renderer.__init__(self, True)
+        Renderer.__init__(self, True, indexed)
 
         self._tilecache1_raw = array("B", [0xFF] * (TILES * 8 * 8))
 
@@ -919,7 +1339,12 @@ class CGBRenderer(Renderer):
             if w_horiflip:
                 xx = 7 - xx
 
-            pixel = lcd.bcpd.getcolor(w_palette, tilecache[yy, xx])
+            if self.indexed:
+                pixel = w_palette * 4 + tilecache[yy, xx]
+            else:
+                pixel = lcd.bcpd.getcolor(w_palette, tilecache[yy, xx])
+            if self.layers:
+                self._layers[LAYER_WINDOW, y, x] = w_palette * 4 + tilecache[yy, xx]
             self._pixel(tilecache, pixel, x, y, xx, yy, bg_priority_apply)
         return cols
 
@@ -942,13 +1367,20 @@ class CGBRenderer(Renderer):
             if b_horiflip:
                 xx = 7 - xx
 
-            pixel = lcd.bcpd.getcolor(b_palette, tilecache[yy, xx])
+            if self.indexed:
+                pixel = b_palette * 4 + tilecache[yy, xx]
+            else:
+                pixel = lcd.bcpd.getcolor(b_palette, tilecache[yy, xx])
+            if self.layers:
+                self._layers[LAYER_BACKGROUND, y, x] = b_palette * 4 + tilecache[yy, xx]
             self._pixel(tilecache, pixel, x, y, xx, yy, bg_priority_apply)
         return cols
 
     def scanline(self, lcd, y):
         if lcd.disable_renderer:
             return
+        if self.layers:
+            self.clear_layers(y)
 
         bx, by = lcd.getviewport()
         wx, wy = lcd.getwindowpos()
@@ -1109,6 +1541,20 @@ class PaletteIndexRegister:
 
 
 CGB_NUM_PALETTES = 8
+# Offset of the sprite palettes in indexed mode. Background palettes are 0-31, sprite palettes 32-63.
+CGB_OBJ_INDEX = 0x20
+
+# All 15-bit CGB colors converted to 32-bit colors. Computed once, and shared by all palettes.
+# NOTE: Actually ABGR, not RGBA
+CGB_RGB_LUT = memoryview(
+    array(
+        "I",
+        [
+            0xFF000000 | (((c >> 10) & 0x1F) << 19) | (((c >> 5) & 0x1F) << 11) | ((c & 0x1F) << 3)
+            for c in range(0x8000)
+        ],
+    )
+)
 
 
 class PaletteColorRegister:
@@ -1126,13 +1572,7 @@ class PaletteColorRegister:
                 self.palette_mem_rgb[n + m] = self.cgb_to_rgb(c[m], m)
 
     def cgb_to_rgb(self, cgb_color, index):
-        alpha = 0xFF
-        red = (cgb_color & 0x1F) << 3
-        green = ((cgb_color >> 5) & 0x1F) << 3
-        blue = ((cgb_color >> 10) & 0x1F) << 3
-        # NOTE: Actually BGR, not RGB
-        rgb_color = (alpha << 24) | (blue << 16) | (green << 8) | red
-        return rgb_color
+        return CGB_RGB_LUT[cgb_color & 0x7FFF]
 
     def set(self, val):
         i_val = self.palette_mem[self.index_reg.getindex()]
@@ -26,6 +26,10 @@ cdef uint16_t STAT, LY, LYC
 cdef short VBLANK, LCDC, TIMER, SERIAL, HIGHTOLOW
 cdef int INTR_VBLANK, INTR_LCDC, INTR_TIMER, INTR_SERIAL, INTR_HIGHTOLOW
 cdef int STATE_VERSION
+cdef uint8_t PAGE_IO, PAGE_BOOTROM, PAGE_ROM, PAGE_VRAM0, PAGE_VRAM1, PAGE_WRAM
+cdef uint8_t EVENT_LCD, EVENT_TIMER, EVENT_SOUND, EVENT_HDMA
+cdef int64_t HOOK_QUEUE_LENGTH
+cdef uint8_t WATCH_FLAG, WATCH_CALLBACK
 
 
 cdef class Motherboard:
@@ -55,21 +59,72 @@ cdef class Motherboard:
     cdef int64_t breakpoint_remove(self, int64_t, int64_t) except -1 with gil
     cdef inline tuple[int64_t, int64_t, int64_t] breakpoint_reached(self) noexcept with gil
     cdef inline void breakpoint_reinject(self) noexcept nogil
+    cdef int64_t current_bank(self, uint16_t) noexcept nogil
+    @cython.locals(rombanks=uint8_t[:, :], restore=list, bank=int64_t, addr=int64_t, opcode=int64_t)
+    cdef tuple clone_rombanks(self)
+    cdef int unshare_rombanks(self) except -1
+    @cython.locals(bank=int64_t, addr=int64_t, opcode=int64_t)
+    cdef int clone_remove_breakpoints(self, dict) except -1
+    cdef int breakpoint_restore_opcode(self, int64_t, int64_t, int64_t) except -1
+
+    cdef uint8_t[:] hook_map
+    cdef uint32_t[:] hook_queue
+    cdef int64_t hook_queue_count
+    cdef void hook_add(self, uint16_t) noexcept
+    cdef void hook_remove(self, uint16_t) noexcept
+    cdef void hook_reached(self, uint16_t) noexcept nogil
+
+    cdef uint8_t[:] watch_map, watch_changed
+    cdef uint16_t[:] watch_changes
+    cdef int64_t watch_changes_count
+    cdef dict watch_callbacks
+    cdef void watch_set(self, uint16_t, object) noexcept
+    @cython.locals(n=int64_t)
+    cdef void watch_clear_changes(self) noexcept nogil
+    cdef void watch_write(self, uint16_t, uint8_t) noexcept nogil
+    cdef void watch_callback(self, uint16_t, uint8_t) noexcept with gil
+
+    cdef uint8_t[256] page_type
+    cdef uint32_t[256] page_offset
+    cdef void update_page_table(self) noexcept nogil
+    cdef int rom_pages_bank, rom_pages_bank_low
+    cdef bint rom_pages_bootrom
+    @cython.locals(page=int)
+    cdef void update_rom_pages(self) noexcept nogil
+    @cython.locals(page=int, page_type=uint8_t)
+    cdef void update_vram_pages(self) noexcept nogil
+    @cython.locals(page=int, bank=int, bank_offset=uint32_t, offset=uint32_t)
+    cdef void update_wram_pages(self) noexcept nogil
+    @cython.locals(page=uint8_t)
+    cdef inline int64_t rom_offset(self, uint16_t) noexcept nogil
+    @cython.locals(i=int, page=int, page_type=uint8_t, offset=uint32_t)
+    cdef int copy_memory(self, int, int, uint8_t[:]) except -1
+
+    cdef int64_t[4] events
+    @cython.locals(n=int)
+    cdef void reset_events(self) noexcept nogil
+    cdef inline int64_t next_event(self) noexcept nogil
+    @cython.locals(cycles=int64_t, lcd_interrupt=uint8_t)
+    cdef void tick_events(self) noexcept nogil
 
     cdef void buttonevent(self, WindowEvent) noexcept
     cdef void stop(self, bint) noexcept
-    @cython.locals(cycles=int64_t, cycles_target=int64_t, mode0_cycles=int64_t, breakpoint_index=int64_t)
+    @cython.locals(cycles_target=int64_t, breakpoint_index=int64_t)
     cdef bint tick(self) noexcept nogil
 
     cdef void switch_speed(self) noexcept nogil
 
+    @cython.locals(page=uint8_t, page_type=uint8_t, offset=uint32_t)
     cdef uint8_t getitem(self, uint16_t) noexcept nogil
+    @cython.locals(page=uint8_t)
     cdef void setitem(self, uint16_t, uint8_t) noexcept nogil
 
     @cython.locals(offset=cython.int, dst=cython.int, n=cython.int)
     cdef void transfer_DMA(self, uint8_t) noexcept nogil
-    cdef int save_state(self, IntIOInterface) except -1
+    cdef int save_state(self, IntIOInterface, list sections=*) except -1
+    cdef int save_section(self, IntIOInterface, list, str) except -1
     cdef int load_state(self, IntIOInterface) except -1
+    cdef void set_dirty(self, bint) noexcept
 
 cdef class HDMA:
     cdef uint8_t hdma1
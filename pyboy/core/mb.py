@@ -3,6 +3,8 @@
 # GitHub: https://github.com/Baekalfen/PyBoy
 #
 
+from array import array
+
 import pyboy
 from pyboy.utils import STATE_VERSION, PyBoyException, PyBoyOutOfBoundsException
 
@@ -16,6 +18,19 @@ logger = pyboy.logging.get_logger(__name__)
 
 MAX_CYCLES = 1 << 31
 
+# Backing buffer of each 256-byte page in the page table. PAGE_IO means the page has to be decoded by the full address
+# decoder in getitem/setitem.
+PAGE_IO, PAGE_BOOTROM, PAGE_ROM, PAGE_VRAM0, PAGE_VRAM1, PAGE_WRAM = range(6)
+
+# Subsystems in the event scheduler
+EVENT_LCD, EVENT_TIMER, EVENT_SOUND, EVENT_HDMA = range(4)
+
+# Enough for a hook on every instruction of a double-speed frame
+HOOK_QUEUE_LENGTH = 0x10000
+
+# Kinds of write watchpoints. See PyBoy.watch_write
+WATCH_FLAG, WATCH_CALLBACK = range(1, 3)
+
 
 class Motherboard:
     def __init__(
@@ -29,11 +44,15 @@ class Motherboard:
         sound_sample_rate,
         cgb,
         randomize=False,
+        screen_indexed=False,
+        screen_deferred=False,
+        rombanks=None,
+        decode_cache=None,
     ):
         if bootrom_file is not None:
             logger.info("Boot-ROM file provided")
 
-        self.cartridge = cartridge.load_cartridge(gamerom)
+        self.cartridge = cartridge.load_cartridge(gamerom, rombanks)
         logger.debug("Cartridge started:\n%s", str(self.cartridge))
 
         self.bootrom = bootrom.BootROM(bootrom_file, self.cartridge.cgb)
@@ -48,7 +67,7 @@ class Motherboard:
         self.timer = timer.Timer()
         self.interaction = interaction.Interaction()
         self.ram = ram.RAM(cgb, randomize=randomize)
-        self.cpu = cpu.CPU(self)
+        self.cpu = cpu.CPU(self, decode_cache)
 
         if cgb:
             self.lcd = lcd.CGBLCD(
@@ -57,6 +76,8 @@ class Motherboard:
                 color_palette,
                 cgb_color_palette,
                 randomize=randomize,
+                indexed=screen_indexed,
+                deferred=screen_deferred,
             )
         else:
             self.lcd = lcd.LCD(
@@ -65,6 +86,8 @@ class Motherboard:
                 color_palette,
                 cgb_color_palette,
                 randomize=randomize,
+                indexed=screen_indexed,
+                deferred=screen_deferred,
             )
 
         # breakpoint()
@@ -89,6 +112,34 @@ class Motherboard:
         self.breakpoint_singlestep_latch = False
         self.breakpoint_waiting = -1
 
+        # Deferred hooks don't patch the code. The CPU checks the map on each fetch, and queues the bank and address of
+        # each hit until PyBoy calls the callbacks at the end of the frame. The map counts the banks hooked per address.
+        self.hook_map = array("B", [0] * 0x10000)
+        self.hook_queue = array("I", [0] * HOOK_QUEUE_LENGTH)
+        self.hook_queue_count = 0
+
+        # Write watchpoints. Addresses with WATCH_FLAG are listed in watch_changes the first time they are written with
+        # a new value, until PyBoy clears them. Addresses with WATCH_CALLBACK have their callback called on every write.
+        self.watch_map = array("B", [0] * 0x10000)
+        self.watch_changed = array("B", [0] * 0x10000)
+        self.watch_changes = array("H", [0] * 0x10000)
+        self.watch_changes_count = 0
+        self.watch_callbacks = {}
+
+        # Page table indexed by the high byte of the address. Each entry has the buffer to read from, and the offset of
+        # the page into that buffer. It is rebuilt on bank switches, so the common reads skip the full address decoding.
+        self.page_type = array("B", [PAGE_IO] * 256)
+        self.page_offset = array("I", [0] * 256)
+        # ROM banks and boot ROM state the ROM pages were last built for. See update_rom_pages.
+        self.rom_pages_bank = -1
+        self.rom_pages_bank_low = -1
+        self.rom_pages_bootrom = False
+        self.update_page_table()
+
+        # Event scheduler. Cycle count at which each subsystem next needs to be ticked. 0 means it is due on the next
+        # slice, which is used when a register write could have moved its deadline.
+        self.events = array("q", [0] * 4)
+
         from pyboy.bot_support import BotSupport # added by Justice Russell
         self.botsupport = BotSupport(self) # added by Justice Russell
 
@@ -100,9 +151,102 @@ class Motherboard:
             self.double_speed = not self.double_speed
             self.lcd.speed_shift = 1 if self.double_speed else 0
             self.sound.speed_shift = 1 if self.double_speed else 0
+            self.reset_events()
             logger.debug("CGB double speed is now: %d", self.double_speed)
             self.key1 ^= 0b10000001
 
+    def update_page_table(self):
+        self.update_rom_pages()
+        self.update_vram_pages()
+        self.update_wram_pages()
+
+    def update_rom_pages(self):
+        # Called on MBC bank switches and when the boot ROM is disabled. Most MBC writes don't change the banks.
+        if (
+            self.cartridge.rombank_selected == self.rom_pages_bank
+            and self.cartridge.rombank_selected_low == self.rom_pages_bank_low
+            and self.bootrom_enabled == self.rom_pages_bootrom
+        ):
+            return
+        self.rom_pages_bank = self.cartridge.rombank_selected
+        self.rom_pages_bank_low = self.cartridge.rombank_selected_low
+        self.rom_pages_bootrom = self.bootrom_enabled
+
+        for page in range(0x40):
+            if self.bootrom_enabled and (page == 0x00 or (self.bootrom.cgb and 0x02 <= page < 0x09)):
+                self.page_type[page] = PAGE_BOOTROM
+                self.page_offset[page] = page << 8
+            else:
+                self.page_type[page] = PAGE_ROM
+                self.page_offset[page] = (self.cartridge.rombank_selected_low << 14) | (page << 8)
+
+        for page in range(0x40, 0x80):
+            self.page_type[page] = PAGE_ROM
+            self.page_offset[page] = (self.cartridge.rombank_selected << 14) | ((page - 0x40) << 8)
+
+    def update_vram_pages(self):
+        # Called on writes to VBK (0xFF4F)
+        page_type = PAGE_VRAM0
+        if self.cgb and self.lcd.vbk.active_bank == 1:
+            page_type = PAGE_VRAM1
+
+        for page in range(0x80, 0xA0):
+            self.page_type[page] = page_type
+            self.page_offset[page] = (page - 0x80) << 8
+
+    def update_wram_pages(self):
+        # Called on writes to SVBK (0xFF70)
+        bank_offset = 0
+        if self.cgb:
+            bank = self.ram.non_io_internal_ram1[0xFF70 - 0xFF4C] & 0b111
+            if bank == 0x0:
+                bank = 0x01
+            bank_offset = (bank - 1) * 0x1000
+
+        for page in range(0xC0, 0xFE):
+            # 0xE000-0xFDFF is an echo of the internal RAM
+            offset = ((page - 0xC0) & 0x1F) << 8
+            if offset >= 0x1000:
+                offset += bank_offset
+            self.page_type[page] = PAGE_WRAM
+            self.page_offset[page] = offset
+
+    def rom_offset(self, i):
+        # Offset into the cartridge ROM of the address, or -1 if the address isn't mapped to the cartridge ROM
+        page = i >> 8
+        if self.page_type[page] == PAGE_ROM:
+            return self.page_offset[page] | (i & 0xFF)
+        return -1
+
+    def copy_memory(self, start, stop, buffer):
+        # Copies the memory from start to stop into the buffer, as it's mapped right now. ROM and RAM are copied from
+        # their backing buffers, and only the I/O registers are read through getitem.
+        for i in range(start, stop):
+            page = i >> 8
+            page_type = self.page_type[page]
+            offset = self.page_offset[page] | (i & 0xFF)
+            if page_type == PAGE_ROM:
+                buffer[i - start] = self.cartridge.rombanks[offset >> 14, offset & 0x3FFF]
+            elif page_type == PAGE_WRAM:
+                buffer[i - start] = self.ram.internal_ram0[offset]
+            elif page_type == PAGE_VRAM0:
+                buffer[i - start] = self.lcd.VRAM0[offset]
+            elif page_type == PAGE_VRAM1:
+                buffer[i - start] = self.lcd.VRAM1[offset]
+            elif page_type == PAGE_BOOTROM:
+                buffer[i - start] = self.bootrom.bootrom[offset]
+            elif 0xA000 <= i < 0xC000:
+                buffer[i - start] = self.cartridge.getitem(i)
+            elif 0xFE00 <= i < 0xFEA0:
+                buffer[i - start] = self.lcd.OAM[i - 0xFE00]
+            elif 0xFEA0 <= i < 0xFF00:
+                buffer[i - start] = self.ram.non_io_internal_ram0[i - 0xFEA0]
+            elif 0xFF80 <= i < 0xFFFF:
+                buffer[i - start] = self.ram.internal_ram1[i - 0xFF80]
+            else:
+                buffer[i - start] = self.getitem(i)
+        return 0
+
     def breakpoint_add(self, bank, addr):
         # Replace instruction at address with OPCODE_BRK and save original opcode
         # for later reinsertion and when breakpoint is deleted.
@@ -114,22 +258,28 @@ class Motherboard:
                 raise PyBoyOutOfBoundsException(
                     f"ROM bank out of bounds. Asked for {bank}, max is {self.cartridge.external_rom_count}"
                 )
+            self.unshare_rombanks()
             opcode = self.cartridge.rombanks[bank, addr]
             self.cartridge.rombanks[bank, addr] = OPCODE_BRK
+            self.cpu.invalidate_decode_cache((bank << 14) | addr)
         elif 0x4000 <= addr < 0x8000:
             if self.cartridge.external_rom_count < bank:
                 raise PyBoyOutOfBoundsException(
                     f"ROM bank out of bounds. Asked for {bank}, max is {self.cartridge.external_rom_count}"
                 )
+            self.unshare_rombanks()
             opcode = self.cartridge.rombanks[bank, addr - 0x4000]
             self.cartridge.rombanks[bank, addr - 0x4000] = OPCODE_BRK
+            self.cpu.invalidate_decode_cache((bank << 14) | (addr - 0x4000))
         elif 0x8000 <= addr < 0xA000:
             if bank == 0:
                 opcode = self.lcd.VRAM0[addr - 0x8000]
                 self.lcd.VRAM0[addr - 0x8000] = OPCODE_BRK
+                self.lcd.VRAM0_dirty[(addr - 0x8000) >> 8] = 1
             else:
                 opcode = self.lcd.VRAM1[addr - 0x8000]
                 self.lcd.VRAM1[addr - 0x8000] = OPCODE_BRK
+                self.lcd.VRAM1_dirty[(addr - 0x8000) >> 8] = 1
         elif 0xA000 <= addr < 0xC000:
             if self.cartridge.external_ram_count < bank:
                 raise PyBoyOutOfBoundsException(
@@ -140,6 +290,7 @@ class Motherboard:
         elif 0xC000 <= addr <= 0xE000:
             opcode = self.ram.internal_ram0[addr - 0xC000]
             self.ram.internal_ram0[addr - 0xC000] = OPCODE_BRK
+            self.ram.internal_ram0_dirty[(addr - 0xC000) >> 8] = 1
         else:
             raise PyBoyOutOfBoundsException(
                 "Unsupported breakpoint address. If this a mistake, reach out to the developers"
@@ -147,6 +298,40 @@ class Motherboard:
 
         self.breakpoints[(bank, addr)] = opcode
 
+    def clone_rombanks(self):
+        # ROM banks and decoded instructions for a clone of the emulator. See PyBoy.clone
+        rombanks = self.cartridge.rombanks
+        restore = []
+        for (bank, addr), opcode in self.breakpoints.items():
+            if addr < 0x8000 and not (addr < 0x100 and bank == -1):
+                restore.append((bank, addr & 0x3FFF, opcode))
+
+        if len(restore) == 0:
+            # Shared until either of the emulators patches the ROM
+            self.cartridge.rombanks_shared = True
+            self.cpu.decode_cache_shared = True
+            return rombanks, self.cpu.decode_cache
+
+        # The breakpoints are patched into the ROM, so the clone gets a copy without them, and decodes it on its own
+        rombanks = self.cartridge.copy_rombanks()
+        for bank, addr, opcode in restore:
+            rombanks[bank, addr] = opcode
+        return rombanks, None
+
+    def unshare_rombanks(self):
+        # Copy-on-write of the ROM banks and decoded instructions shared with a clone. Called before patching the ROM.
+        self.cartridge.unshare_rombanks()
+        self.cpu.unshare_decode_cache()
+        return 0
+
+    def clone_remove_breakpoints(self, breakpoints):
+        # The state of a clone is copied with the breakpoints patched into RAM, which it doesn't have. The ROM and
+        # boot ROM of the clone are without breakpoints already. See clone_rombanks.
+        for (bank, addr), opcode in breakpoints.items():
+            if addr >= 0x8000:
+                self.breakpoint_restore_opcode(bank, addr, opcode)
+        return 0
+
     def breakpoint_find(self, bank, addr):
         opcode = self.breakpoints.get((bank, addr))
         if opcode is not None:
@@ -158,41 +343,51 @@ class Motherboard:
         opcode = self.breakpoints.pop((bank, addr), None)
         if opcode is not None:
             logger.debug(f"Breakpoint remove: {bank:02x}:{addr:04x} {opcode:02x}")
+            self.breakpoint_restore_opcode(bank, addr, opcode)
+        else:
+            raise PyBoyException("Breakpoint not found. If this a mistake, reach out to the developers")
 
-            # Restore opcode
-            if addr < 0x100 and bank == -1:
-                self.bootrom.bootrom[addr] = opcode
-            elif addr < 0x4000:
-                self.cartridge.rombanks[bank, addr] = opcode
-            elif 0x4000 <= addr < 0x8000:
-                self.cartridge.rombanks[bank, addr - 0x4000] = opcode
-            elif 0x8000 <= addr < 0xA000:
-                if bank == 0:
-                    self.lcd.VRAM0[addr - 0x8000] = opcode
-                else:
-                    self.lcd.VRAM1[addr - 0x8000] = opcode
-            elif 0xA000 <= addr < 0xC000:
-                self.cartridge.rambanks[bank, addr - 0xA000] = opcode
-            elif 0xC000 <= addr <= 0xE000:
-                self.ram.internal_ram0[addr - 0xC000] = opcode
+    def breakpoint_restore_opcode(self, bank, addr, opcode):
+        # Write back the original opcode of a breakpoint
+        if addr < 0x100 and bank == -1:
+            self.bootrom.bootrom[addr] = opcode
+        elif addr < 0x4000:
+            self.unshare_rombanks()
+            self.cartridge.rombanks[bank, addr] = opcode
+            self.cpu.invalidate_decode_cache((bank << 14) | addr)
+        elif 0x4000 <= addr < 0x8000:
+            self.unshare_rombanks()
+            self.cartridge.rombanks[bank, addr - 0x4000] = opcode
+            self.cpu.invalidate_decode_cache((bank << 14) | (addr - 0x4000))
+        elif 0x8000 <= addr < 0xA000:
+            if bank == 0:
+                self.lcd.VRAM0[addr - 0x8000] = opcode
+                self.lcd.VRAM0_dirty[(addr - 0x8000) >> 8] = 1
             else:
-                raise PyBoyException("Unsupported breakpoint address. If this a mistake, reach out to the developers")
+                self.lcd.VRAM1[addr - 0x8000] = opcode
+                self.lcd.VRAM1_dirty[(addr - 0x8000) >> 8] = 1
+        elif 0xA000 <= addr < 0xC000:
+            self.cartridge.rambanks[bank, addr - 0xA000] = opcode
+        elif 0xC000 <= addr <= 0xE000:
+            self.ram.internal_ram0[addr - 0xC000] = opcode
+            self.ram.internal_ram0_dirty[(addr - 0xC000) >> 8] = 1
         else:
-            raise PyBoyException("Breakpoint not found. If this a mistake, reach out to the developers")
+            raise PyBoyException("Unsupported breakpoint address. If this a mistake, reach out to the developers")
+        return 0
+
+    def current_bank(self, addr):
+        # Bank currently mapped at the address, as given to breakpoints and hooks
+        if addr < 0x100 and self.bootrom_enabled:
+            return -1
+        elif 0x4000 <= addr < 0x8000:
+            return self.cartridge.rombank_selected
+        elif 0xA000 <= addr < 0xC000:
+            return self.cartridge.rambank_selected
+        return 0
 
     def breakpoint_reached(self):
         pc = self.cpu.PC
-        bank = None
-        if pc < 0x100 and self.bootrom_enabled:
-            bank = -1
-        elif pc < 0x4000:
-            bank = 0
-        elif 0x4000 <= pc < 0x8000:
-            bank = self.cartridge.rombank_selected
-        elif 0xA000 <= pc < 0xC000:
-            bank = self.cartridge.rambank_selected
-        elif 0xC000 <= pc <= 0xFFFF:
-            bank = 0
+        bank = self.current_bank(pc)
         opcode = self.breakpoints.get((bank, pc))
         if opcode is not None:
             # Breakpoint hit
@@ -216,6 +411,45 @@ class Motherboard:
         self.breakpoint_add(bank, addr)
         self.breakpoint_waiting = -1
 
+    def hook_add(self, addr):
+        self.hook_map[addr] += 1
+
+    def hook_remove(self, addr):
+        self.hook_map[addr] -= 1
+
+    def hook_reached(self, addr):
+        if self.hook_queue_count < HOOK_QUEUE_LENGTH:
+            self.hook_queue[self.hook_queue_count] = ((self.current_bank(addr) + 1) << 16) | addr
+            self.hook_queue_count += 1
+
+    def watch_set(self, addr, callback_or_flag):
+        if callable(callback_or_flag):
+            self.watch_map[addr] = WATCH_CALLBACK
+            self.watch_callbacks[addr] = callback_or_flag
+        else:
+            self.watch_map[addr] = WATCH_FLAG if callback_or_flag else 0
+            self.watch_callbacks.pop(addr, None)
+
+    def watch_clear_changes(self):
+        for n in range(self.watch_changes_count):
+            self.watch_changed[self.watch_changes[n]] = 0
+        self.watch_changes_count = 0
+
+    def watch_write(self, i, value):
+        if self.watch_map[i] == WATCH_CALLBACK:
+            self.watch_callback(i, value)
+        elif not self.watch_changed[i] and (
+            # The ROM area (MBC registers) and I/O registers aren't read back, as reading them has side effects or
+            # gives another value. Every write to them counts as a change.
+            i < 0x8000 or (0xFF00 <= i < 0xFF80) or i == 0xFFFF or self.getitem(i) != value
+        ):
+            self.watch_changed[i] = 1
+            self.watch_changes[self.watch_changes_count] = i
+            self.watch_changes_count += 1
+
+    def watch_callback(self, i, value):
+        self.watch_callbacks[i](i, value)
+
     def getserial(self):
         b = "".join([chr(x) for x in self.serialbuffer[: self.serialbuffer_count]])
         self.serialbuffer_count = 0
@@ -230,8 +464,16 @@ class Motherboard:
         if save:
             self.cartridge.stop()
 
-    def save_state(self, f):
+    def set_dirty(self, value):
+        # Marks all pages of WRAM, VRAM and OAM as written or not since the last snapshot. Pages are marked on every
+        # write through setitem, which includes OAM DMA and HDMA. See PyBoy.snapshot_incremental
+        self.ram.set_dirty(value)
+        self.lcd.set_dirty(value)
+
+    def save_state(self, f, sections=None):
+        # The name and offset of each part of the state are appended to sections, if given. See pyboy.api.state_file
         logger.debug("Saving state...")
+        self.save_section(f, sections, "motherboard")
         f.write(STATE_VERSION)
         f.write(self.bootrom_enabled)
         f.write(self.key1)
@@ -239,17 +481,29 @@ class Motherboard:
         f.write(self.cgb)
         if self.cgb:
             self.hdma.save_state(f)
+        self.save_section(f, sections, "cpu")
         self.cpu.save_state(f)
+        self.save_section(f, sections, "lcd")
         self.lcd.save_state(f)
+        self.save_section(f, sections, "sound")
         self.sound.save_state(f)
+        self.save_section(f, sections, "renderer")
         self.lcd.renderer.save_state(f)
+        self.save_section(f, sections, "ram")
         self.ram.save_state(f)
+        self.save_section(f, sections, "timer")
         self.timer.save_state(f)
+        self.save_section(f, sections, "cartridge")
         self.cartridge.save_state(f)
+        self.save_section(f, sections, "interaction")
         self.interaction.save_state(f)
         f.flush()
         logger.debug("State saved.")
 
+    def save_section(self, f, sections, name):
+        if sections is not None:
+            sections.append((name, f.tell()))
+
     def load_state(self, f):
         logger.debug("Loading state...")
         state_version = f.read()
@@ -283,7 +537,6 @@ class Motherboard:
         if state_version >= 8:
             self.sound.load_state(f, state_version)
         self.lcd.renderer.load_state(f, state_version)
-        self.lcd.renderer.clear_cache()
         self.ram.load_state(f, state_version)
         if state_version < 5:
             # Interrupt register moved from RAM to CPU
@@ -292,6 +545,9 @@ class Motherboard:
             self.timer.load_state(f, state_version)
         self.cartridge.load_state(f, state_version)
         self.interaction.load_state(f, state_version)
+        self.update_page_table()
+        self.set_dirty(True)
+        self.reset_events()
         f.flush()
         logger.debug("State loaded.")
 
@@ -299,6 +555,42 @@ class Motherboard:
     # Coordinator
     #
 
+    def reset_events(self):
+        for n in range(4):
+            self.events[n] = 0
+
+    def next_event(self):
+        # Sound doesn't raise interrupts, so it doesn't limit how far the CPU can run. It is ticked after the first
+        # slice passing its deadline, or when its registers are accessed.
+        return min(self.events[EVENT_LCD], self.events[EVENT_TIMER], self.events[EVENT_HDMA])
+
+    def tick_events(self):
+        cycles = self.cpu.cycles
+
+        if cycles >= self.events[EVENT_SOUND]:
+            self.sound.tick(cycles)
+            self.events[EVENT_SOUND] = self.sound.last_cycles + self.sound.cycles_to_div_apu()
+
+        if cycles >= self.events[EVENT_TIMER]:
+            if self.timer.tick(cycles):
+                self.cpu.set_interruptflag(INTR_TIMER)
+            self.events[EVENT_TIMER] = self.timer.last_cycles + self.timer._cycles_to_interrupt
+
+        if cycles >= self.events[EVENT_LCD]:
+            if lcd_interrupt := self.lcd.tick(cycles):
+                self.cpu.set_interruptflag(lcd_interrupt)
+            # https://gbdev.io/pandocs/STAT.html
+            # STAT (_cycles_to_interrupt) vs. VBLANK interrupt (_cycles_to_interrupt) vs. end frame (_cycles_to_frame)
+            # TODO: Be more agreesive. Only if actual interrupt enabled.
+            self.events[EVENT_LCD] = self.lcd.last_cycles + min(self.lcd._cycles_to_interrupt, self.lcd._cycles_to_frame)
+            self.events[EVENT_HDMA] = 0  # Follows the LCD mode
+
+        if cycles >= self.events[EVENT_HDMA]:
+            if self.cgb and self.hdma.transfer_active:
+                self.events[EVENT_HDMA] = self.lcd.last_cycles + self.lcd.cycles_to_mode0()
+            else:
+                self.events[EVENT_HDMA] = MAX_CYCLES
+
     def tick(self):
         while not self.lcd.frame_done:
             if self.cgb and self.hdma.transfer_active and self.lcd._STAT._mode & 0b11 == 0:
@@ -311,23 +603,7 @@ class Motherboard:
                 # it gets triggered mid-frame or by next frame
                 # Serial is not implemented, so this isn't a concern
 
-                mode0_cycles = MAX_CYCLES
-                if self.cgb and self.hdma.transfer_active:
-                    mode0_cycles = self.lcd.cycles_to_mode0()
-
-                cycles_target = max(
-                    4,
-                    min(
-                        self.timer._cycles_to_interrupt,
-                        # https://gbdev.io/pandocs/STAT.html
-                        # STAT (_cycles_to_interrupt) vs. VBLANK interrupt (_cycles_to_interrupt) vs. end frame (_cycles_to_frame)
-                        self.lcd._cycles_to_interrupt,  # TODO: Be more agreesive. Only if actual interrupt enabled.
-                        self.lcd._cycles_to_frame,
-                        self.sound._cycles_to_interrupt,
-                        # self.serial.cycles_to_interrupt(),
-                        mode0_cycles,
-                    ),
-                )
+                cycles_target = max(4, self.next_event() - self.cpu.cycles)
                 if self.breakpoint_singlestep:
                     cycles_target = 4
                 self.cpu.tick(cycles_target)
@@ -335,49 +611,38 @@ class Motherboard:
             # TODO: Support General Purpose DMA
             # https://gbdev.io/pandocs/CGB_Registers.html#bit-7--0---general-purpose-dma
 
-            self.sound.tick(self.cpu.cycles)
-
-            if self.timer.tick(self.cpu.cycles):
-                self.cpu.set_interruptflag(INTR_TIMER)
-
-            if lcd_interrupt := self.lcd.tick(self.cpu.cycles):
-                self.cpu.set_interruptflag(lcd_interrupt)
+            # Only the subsystems with a deadline in this slice are ticked
+            self.tick_events()
 
             if self.breakpoint_singlestep:
                 break
 
+        # Bring the rest up to date, so the state is complete between frames and when saving
+        self.reset_events()
+        self.tick_events()
         return self.breakpoint_singlestep
 
     ###################################################################
     # MemoryManager
     #
     def getitem(self, i):
-        if 0x0000 <= i < 0x4000:  # 16kB ROM bank #0
-            if self.bootrom_enabled and (i <= 0xFF or (self.bootrom.cgb and 0x200 <= i < 0x900)):
-                return self.bootrom.getitem(i)
-            else:
-                return self.cartridge.rombanks[self.cartridge.rombank_selected_low, i]
-        elif 0x4000 <= i < 0x8000:  # 16kB switchable ROM bank
-            return self.cartridge.rombanks[self.cartridge.rombank_selected, i - 0x4000]
-        elif 0x8000 <= i < 0xA000:  # 8kB Video RAM
-            if not self.cgb or self.lcd.vbk.active_bank == 0:
-                return self.lcd.VRAM0[i - 0x8000]
-            else:
-                return self.lcd.VRAM1[i - 0x8000]
+        page = i >> 8
+        page_type = self.page_type[page]
+        if page_type == PAGE_ROM:  # 16kB ROM bank #0 and switchable ROM bank
+            offset = self.page_offset[page] | (i & 0xFF)
+            return self.cartridge.rombanks[offset >> 14, offset & 0x3FFF]
+        elif page_type == PAGE_WRAM:  # 8kB Internal RAM and its echo
+            return self.ram.internal_ram0[self.page_offset[page] | (i & 0xFF)]
+        elif page_type == PAGE_VRAM0:  # 8kB Video RAM
+            return self.lcd.VRAM0[self.page_offset[page] | (i & 0xFF)]
+        elif page_type == PAGE_VRAM1:
+            return self.lcd.VRAM1[self.page_offset[page] | (i & 0xFF)]
+        elif page_type == PAGE_BOOTROM:
+            return self.bootrom.getitem(i)
+        elif 0xFF80 <= i < 0xFFFF:  # Internal RAM
+            return self.ram.internal_ram1[i - 0xFF80]
         elif 0xA000 <= i < 0xC000:  # 8kB switchable RAM bank
             return self.cartridge.getitem(i)
-        elif 0xC000 <= i < 0xE000:  # 8kB Internal RAM
-            bank_offset = 0
-            if self.cgb and 0xD000 <= i:
-                # Find which bank to read from at FF70
-                bank = self.ram.non_io_internal_ram1[0xFF70 - 0xFF4C] & 0b111
-                if bank == 0x0:
-                    bank = 0x01
-                bank_offset = (bank - 1) * 0x1000
-            return self.ram.internal_ram0[i - 0xC000 + bank_offset]
-        elif 0xE000 <= i < 0xFE00:  # Echo of 8kB Internal RAM
-            # Redirect to internal RAM
-            return self.getitem(i - 0x2000)
         elif 0xFE00 <= i < 0xFEA0:  # Sprite Attribute Memory (OAM)
             return self.lcd.OAM[i - 0xFE00]
         elif 0xFEA0 <= i < 0xFF00:  # Empty but unusable for I/O
@@ -465,49 +730,54 @@ class Motherboard:
                 self.sound.tick(self.cpu.cycles)
                 return self.sound.pcm34()
             return self.ram.non_io_internal_ram1[i - 0xFF4C]
-        elif 0xFF80 <= i < 0xFFFF:  # Internal RAM
-            return self.ram.internal_ram1[i - 0xFF80]
         elif i == 0xFFFF:  # Interrupt Enable Register
             return self.cpu.interrupts_enabled_register
         # else:
         #     logger.critical("Memory access violation. Tried to read: %0.4x", i)
 
     def setitem(self, i, value):
-        if 0x0000 <= i < 0x4000:  # 16kB ROM bank #0
+        if self.watch_map[i]:
+            self.watch_write(i, value)
+
+        page = i >> 8
+        if self.page_type[page] == PAGE_WRAM:  # 8kB Internal RAM and its echo
+            self.ram.internal_ram0[self.page_offset[page] | (i & 0xFF)] = value
+            self.ram.internal_ram0_dirty[self.page_offset[page] >> 8] = 1
+        elif 0xFF80 <= i < 0xFFFF:  # Internal RAM
+            self.ram.internal_ram1[i - 0xFF80] = value
+        elif 0x0000 <= i < 0x4000:  # 16kB ROM bank #0
             # Doesn't change the data. This is for MBC commands
             self.cartridge.setitem(i, value)
+            self.update_rom_pages()
             self.cpu.bail = True
         elif 0x4000 <= i < 0x8000:  # 16kB switchable ROM bank
             # Doesn't change the data. This is for MBC commands
             self.cartridge.setitem(i, value)
+            self.update_rom_pages()
             self.cpu.bail = True
         elif 0x8000 <= i < 0xA000:  # 8kB Video RAM
+            if self.lcd.deferred_recording:
+                self.lcd.deferred_log(i, self.lcd.vbk.active_bank if self.cgb else 0)
             if not self.cgb or self.lcd.vbk.active_bank == 0:
                 self.lcd.VRAM0[i - 0x8000] = value
+                self.lcd.VRAM0_dirty[(i - 0x8000) >> 8] = 1
                 if i < 0x9800:  # Is within tile data -- not tile maps
                     # Mask out the byte of the tile
                     self.lcd.renderer.invalidate_tile(((i & 0xFFF0) - 0x8000) // 16, 0)
             else:
                 self.lcd.VRAM1[i - 0x8000] = value
+                self.lcd.VRAM1_dirty[(i - 0x8000) >> 8] = 1
                 if i < 0x9800:  # Is within tile data -- not tile maps
                     # Mask out the byte of the tile
                     self.lcd.renderer.invalidate_tile(((i & 0xFFF0) - 0x8000) // 16, 1)
         elif 0xA000 <= i < 0xC000:  # 8kB switchable RAM bank
             self.cartridge.setitem(i, value)
-        elif 0xC000 <= i < 0xE000:  # 8kB Internal RAM
-            bank_offset = 0
-            if self.cgb and 0xD000 <= i:
-                # Find which bank to read from at FF70
-                bank = self.getitem(0xFF70)
-                bank &= 0b111
-                if bank == 0x0:
-                    bank = 0x01
-                bank_offset = (bank - 1) * 0x1000
-            self.ram.internal_ram0[i - 0xC000 + bank_offset] = value
-        elif 0xE000 <= i < 0xFE00:  # Echo of 8kB Internal RAM
-            self.setitem(i - 0x2000, value)  # Redirect to internal RAM
         elif 0xFE00 <= i < 0xFEA0:  # Sprite Attribute Memory (OAM)
+            if self.lcd.deferred_recording:
+                self.lcd.deferred_log(i, 0)
             self.lcd.OAM[i - 0xFE00] = value
+            self.lcd.OAM_dirty[0] = 1
+            self.lcd.renderer.sprites_dirty = True
         elif 0xFEA0 <= i < 0xFF00:  # Empty but unusable for I/O
             self.ram.non_io_internal_ram0[i - 0xFEA0] = value
         elif 0xFF00 <= i < 0xFF4C:  # I/O ports
@@ -531,6 +801,7 @@ class Motherboard:
                         self.sound.tick(self.cpu.cycles)  # Process outstanding cycles
                         # TODO: Force a falling edge tick
                         self.sound.reset_apu_div()
+                        self.events[EVENT_SOUND] = 0
 
                     self.timer.reset()
                 elif i == 0xFF05:
@@ -539,14 +810,19 @@ class Motherboard:
                     self.timer.TMA = value
                 elif i == 0xFF07:
                     self.timer.TAC = value & 0b111  # TODO: Move logic to Timer class
+                self.events[EVENT_TIMER] = 0
             elif i == 0xFF0F:
                 self.cpu.interrupts_flag_register = value
             elif 0xFF10 <= i < 0xFF40:
                 self.sound.tick(self.cpu.cycles)
                 self.sound.set(i - 0xFF10, value)
+                self.events[EVENT_SOUND] = 0
             elif 0xFF40 <= i <= 0xFF4B:
                 if lcd_interrupt := self.lcd.tick(self.cpu.cycles):
                     self.cpu.set_interruptflag(lcd_interrupt)
+                self.events[EVENT_LCD] = 0
+                if self.lcd.deferred_recording:
+                    self.lcd.deferred_log(i, 0)
 
                 if i == 0xFF40:
                     self.lcd.set_lcdc(value)
@@ -586,6 +862,7 @@ class Motherboard:
             if self.bootrom_enabled and i == 0xFF50 and (value == 0x1 or value == 0x11):
                 logger.debug("Bootrom disabled!")
                 self.bootrom_enabled = False
+                self.update_rom_pages()
                 self.cpu.bail = True
             # CGB registers
             elif self.cgb and i == 0xFF4D:
@@ -593,6 +870,7 @@ class Motherboard:
                 self.cpu.bail = True
             elif self.cgb and i == 0xFF4F:
                 self.lcd.vbk.set(value)
+                self.update_vram_pages()
             elif self.cgb and i == 0xFF51:
                 self.hdma.hdma1 = value
             elif self.cgb and i == 0xFF52:
@@ -603,23 +881,29 @@ class Motherboard:
                 self.hdma.hdma4 = value  # & 0xF0
             elif self.cgb and i == 0xFF55:
                 self.hdma.set_hdma5(value, self)
+                self.events[EVENT_HDMA] = 0
                 self.cpu.bail = True
             elif self.cgb and i == 0xFF68:
                 self.lcd.bcps.set(value)
             elif self.cgb and i == 0xFF69:
+                if self.lcd.deferred_recording:
+                    self.lcd.deferred_log(i, self.lcd.bcps.getindex())
                 self.lcd.bcpd.set(value)
                 self.lcd.renderer.clear_tilecache0()
                 self.lcd.renderer.clear_tilecache1()
             elif self.cgb and i == 0xFF6A:
                 self.lcd.ocps.set(value)
             elif self.cgb and i == 0xFF6B:
+                if self.lcd.deferred_recording:
+                    self.lcd.deferred_log(i, self.lcd.ocps.getindex())
                 self.lcd.ocpd.set(value)
                 self.lcd.renderer.clear_spritecache0()
                 self.lcd.renderer.clear_spritecache1()
+            elif self.cgb and i == 0xFF70:
+                self.ram.non_io_internal_ram1[i - 0xFF4C] = value
+                self.update_wram_pages()
             else:
                 self.ram.non_io_internal_ram1[i - 0xFF4C] = value
-        elif 0xFF80 <= i < 0xFFFF:  # Internal RAM
-            self.ram.internal_ram1[i - 0xFF80] = value
         elif i == 0xFFFF:  # Interrupt Enable Register
             self.cpu.interrupts_enabled_register = value
             self.cpu.bail = True
@@ -17,6 +17,7 @@ cdef uint16_t FLAGC, FLAGH, FLAGN, FLAGZ
 cdef uint8_t[512] OPCODE_LENGTHS
 @cython.locals(v=cython.int, a=cython.int, b=cython.int, pc=cython.ushort)
 cdef int execute_opcode(cpu.CPU, uint16_t) noexcept nogil
+cdef int dispatch_opcode(cpu.CPU, uint16_t, int) noexcept nogil
 
 cdef uint8_t no_opcode(cpu.CPU) noexcept nogil
 cdef uint8_t BRK(cpu.CPU) noexcept nogil
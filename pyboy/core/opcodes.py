@@ -52,10 +52,11 @@ def INC_03(cpu): # 03 INC BC
 def INC_04(cpu): # 04 INC B
     t = cpu.B + 1
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.B & 0xF) + (1 & 0xF)) > 0xF) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.B ^ 1
     t &= 0xFF
     cpu.B = t
     cpu.PC += 1
@@ -66,10 +67,11 @@ def INC_04(cpu): # 04 INC B
 def DEC_05(cpu): # 05 DEC B
     t = cpu.B - 1
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.B & 0xF) - (1 & 0xF)) < 0) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.B ^ 1
     t &= 0xFF
     cpu.B = t
     cpu.PC += 1
@@ -90,6 +92,7 @@ def RLCA_07(cpu): # 07 RLCA
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -110,8 +113,9 @@ def ADD_09(cpu): # 09 ADD HL,BC
     flag = 0b00000000
     flag += (((cpu.HL & 0xFFF) + (((cpu.B << 8) + cpu.C) & 0xFFF)) > 0xFFF) << FLAGH
     flag += (t > 0xFFFF) << FLAGC
-    cpu.F &= 0b10000000
+    cpu.F = cpu.materialize_flags() & 0b10000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFFFF
     cpu.HL = t
     cpu.PC += 1
@@ -140,10 +144,11 @@ def DEC_0B(cpu): # 0B DEC BC
 def INC_0C(cpu): # 0C INC C
     t = cpu.C + 1
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.C & 0xF) + (1 & 0xF)) > 0xF) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.C ^ 1
     t &= 0xFF
     cpu.C = t
     cpu.PC += 1
@@ -154,10 +159,11 @@ def INC_0C(cpu): # 0C INC C
 def DEC_0D(cpu): # 0D DEC C
     t = cpu.C - 1
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.C & 0xF) - (1 & 0xF)) < 0) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.C ^ 1
     t &= 0xFF
     cpu.C = t
     cpu.PC += 1
@@ -178,6 +184,7 @@ def RRCA_0F(cpu): # 0F RRCA
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -223,10 +230,11 @@ def INC_13(cpu): # 13 INC DE
 def INC_14(cpu): # 14 INC D
     t = cpu.D + 1
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.D & 0xF) + (1 & 0xF)) > 0xF) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.D ^ 1
     t &= 0xFF
     cpu.D = t
     cpu.PC += 1
@@ -237,10 +245,11 @@ def INC_14(cpu): # 14 INC D
 def DEC_15(cpu): # 15 DEC D
     t = cpu.D - 1
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.D & 0xF) - (1 & 0xF)) < 0) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.D ^ 1
     t &= 0xFF
     cpu.D = t
     cpu.PC += 1
@@ -261,6 +270,7 @@ def RLA_17(cpu): # 17 RLA
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -279,8 +289,9 @@ def ADD_19(cpu): # 19 ADD HL,DE
     flag = 0b00000000
     flag += (((cpu.HL & 0xFFF) + (((cpu.D << 8) + cpu.E) & 0xFFF)) > 0xFFF) << FLAGH
     flag += (t > 0xFFFF) << FLAGC
-    cpu.F &= 0b10000000
+    cpu.F = cpu.materialize_flags() & 0b10000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFFFF
     cpu.HL = t
     cpu.PC += 1
@@ -309,10 +320,11 @@ def DEC_1B(cpu): # 1B DEC DE
 def INC_1C(cpu): # 1C INC E
     t = cpu.E + 1
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.E & 0xF) + (1 & 0xF)) > 0xF) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.E ^ 1
     t &= 0xFF
     cpu.E = t
     cpu.PC += 1
@@ -323,10 +335,11 @@ def INC_1C(cpu): # 1C INC E
 def DEC_1D(cpu): # 1D DEC E
     t = cpu.E - 1
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.E & 0xF) - (1 & 0xF)) < 0) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.E ^ 1
     t &= 0xFF
     cpu.E = t
     cpu.PC += 1
@@ -347,6 +360,7 @@ def RRA_1F(cpu): # 1F RRA
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -356,7 +370,7 @@ def RRA_1F(cpu): # 1F RRA
 
 def JR_20(cpu, v): # 20 JR NZ,r8
     cpu.PC += 2
-    if ((cpu.F & (1 << FLAGZ)) == 0):
+    if ((cpu.materialize_flags() & (1 << FLAGZ)) == 0):
         cpu.PC += ((v ^ 0x80) - 0x80)
         cpu.PC &= 0xFFFF
         cpu.cycles += 12
@@ -394,10 +408,11 @@ def INC_23(cpu): # 23 INC HL
 def INC_24(cpu): # 24 INC H
     t = (cpu.HL >> 8) + 1
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += ((((cpu.HL >> 8) & 0xF) + (1 & 0xF)) > 0xF) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = (cpu.HL >> 8) ^ 1
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 1
@@ -408,10 +423,11 @@ def INC_24(cpu): # 24 INC H
 def DEC_25(cpu): # 25 DEC H
     t = (cpu.HL >> 8) - 1
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += ((((cpu.HL >> 8) & 0xF) - (1 & 0xF)) < 0) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = (cpu.HL >> 8) ^ 1
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 1
@@ -429,7 +445,7 @@ def LD_26(cpu, v): # 26 LD H,d8
 def DAA_27(cpu): # 27 DAA
     t = cpu.A
     corr = 0
-    corr |= 0x06 if ((cpu.F & (1 << FLAGH)) != 0) else 0x00
+    corr |= 0x06 if ((cpu.materialize_flags() & (1 << FLAGH)) != 0) else 0x00
     corr |= 0x60 if ((cpu.F & (1 << FLAGC)) != 0) else 0x00
     if (cpu.F & (1 << FLAGN)) != 0:
         t -= corr
@@ -451,7 +467,7 @@ def DAA_27(cpu): # 27 DAA
 
 def JR_28(cpu, v): # 28 JR Z,r8
     cpu.PC += 2
-    if ((cpu.F & (1 << FLAGZ)) != 0):
+    if ((cpu.materialize_flags() & (1 << FLAGZ)) != 0):
         cpu.PC += ((v ^ 0x80) - 0x80)
         cpu.PC &= 0xFFFF
         cpu.cycles += 12
@@ -465,8 +481,9 @@ def ADD_29(cpu): # 29 ADD HL,HL
     flag = 0b00000000
     flag += (((cpu.HL & 0xFFF) + (cpu.HL & 0xFFF)) > 0xFFF) << FLAGH
     flag += (t > 0xFFFF) << FLAGC
-    cpu.F &= 0b10000000
+    cpu.F = cpu.materialize_flags() & 0b10000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFFFF
     cpu.HL = t
     cpu.PC += 1
@@ -496,10 +513,11 @@ def DEC_2B(cpu): # 2B DEC HL
 def INC_2C(cpu): # 2C INC L
     t = (cpu.HL & 0xFF) + 1
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += ((((cpu.HL & 0xFF) & 0xF) + (1 & 0xF)) > 0xF) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = (cpu.HL & 0xFF) ^ 1
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 1
@@ -510,10 +528,11 @@ def INC_2C(cpu): # 2C INC L
 def DEC_2D(cpu): # 2D DEC L
     t = (cpu.HL & 0xFF) - 1
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += ((((cpu.HL & 0xFF) & 0xF) - (1 & 0xF)) < 0) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = (cpu.HL & 0xFF) ^ 1
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 1
@@ -531,8 +550,9 @@ def LD_2E(cpu, v): # 2E LD L,d8
 def CPL_2F(cpu): # 2F CPL
     cpu.A = (~cpu.A) & 0xFF
     flag = 0b01100000
-    cpu.F &= 0b10010000
+    cpu.F = cpu.materialize_flags() & 0b10010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     cpu.PC += 1
     cpu.PC &= 0xFFFF
     cpu.cycles += 4
@@ -578,10 +598,11 @@ def INC_33(cpu): # 33 INC SP
 def INC_34(cpu): # 34 INC (HL)
     t = cpu.mb.getitem(cpu.HL) + 1
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.mb.getitem(cpu.HL) & 0xF) + (1 & 0xF)) > 0xF) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.mb.getitem(cpu.HL) ^ 1
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -593,10 +614,11 @@ def INC_34(cpu): # 34 INC (HL)
 def DEC_35(cpu): # 35 DEC (HL)
     t = cpu.mb.getitem(cpu.HL) - 1
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.mb.getitem(cpu.HL) & 0xF) - (1 & 0xF)) < 0) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.mb.getitem(cpu.HL) ^ 1
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -615,8 +637,9 @@ def LD_36(cpu, v): # 36 LD (HL),d8
 
 def SCF_37(cpu): # 37 SCF
     flag = 0b00010000
-    cpu.F &= 0b10000000
+    cpu.F = cpu.materialize_flags() & 0b10000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     cpu.PC += 1
     cpu.PC &= 0xFFFF
     cpu.cycles += 4
@@ -638,8 +661,9 @@ def ADD_39(cpu): # 39 ADD HL,SP
     flag = 0b00000000
     flag += (((cpu.HL & 0xFFF) + (cpu.SP & 0xFFF)) > 0xFFF) << FLAGH
     flag += (t > 0xFFFF) << FLAGC
-    cpu.F &= 0b10000000
+    cpu.F = cpu.materialize_flags() & 0b10000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFFFF
     cpu.HL = t
     cpu.PC += 1
@@ -669,10 +693,11 @@ def DEC_3B(cpu): # 3B DEC SP
 def INC_3C(cpu): # 3C INC A
     t = cpu.A + 1
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (1 & 0xF)) > 0xF) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ 1
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -683,10 +708,11 @@ def INC_3C(cpu): # 3C INC A
 def DEC_3D(cpu): # 3D DEC A
     t = cpu.A - 1
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (1 & 0xF)) < 0) << FLAGH
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ 1
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -703,7 +729,7 @@ def LD_3E(cpu, v): # 3E LD A,d8
 
 def CCF_3F(cpu): # 3F CCF
     flag = (cpu.F & 0b00010000) ^ 0b00010000
-    cpu.F &= 0b10000000
+    cpu.F = cpu.materialize_flags() & 0b10000000
     cpu.F |= flag
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -1160,11 +1186,12 @@ def LD_7F(cpu): # 7F LD A,A
 def ADD_80(cpu): # 80 ADD A,B
     t = cpu.A + cpu.B
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.B & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.B
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1175,11 +1202,12 @@ def ADD_80(cpu): # 80 ADD A,B
 def ADD_81(cpu): # 81 ADD A,C
     t = cpu.A + cpu.C
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.C & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.C
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1190,11 +1218,12 @@ def ADD_81(cpu): # 81 ADD A,C
 def ADD_82(cpu): # 82 ADD A,D
     t = cpu.A + cpu.D
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.D & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.D
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1205,11 +1234,12 @@ def ADD_82(cpu): # 82 ADD A,D
 def ADD_83(cpu): # 83 ADD A,E
     t = cpu.A + cpu.E
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.E & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.E
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1220,11 +1250,12 @@ def ADD_83(cpu): # 83 ADD A,E
 def ADD_84(cpu): # 84 ADD A,H
     t = cpu.A + (cpu.HL >> 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + ((cpu.HL >> 8) & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL >> 8)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1235,11 +1266,12 @@ def ADD_84(cpu): # 84 ADD A,H
 def ADD_85(cpu): # 85 ADD A,L
     t = cpu.A + (cpu.HL & 0xFF)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + ((cpu.HL & 0xFF) & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL & 0xFF)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1250,11 +1282,12 @@ def ADD_85(cpu): # 85 ADD A,L
 def ADD_86(cpu): # 86 ADD A,(HL)
     t = cpu.A + cpu.mb.getitem(cpu.HL)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.mb.getitem(cpu.HL) & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.mb.getitem(cpu.HL)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1265,11 +1298,12 @@ def ADD_86(cpu): # 86 ADD A,(HL)
 def ADD_87(cpu): # 87 ADD A,A
     t = cpu.A + cpu.A
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.A & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.A
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1280,11 +1314,12 @@ def ADD_87(cpu): # 87 ADD A,A
 def ADC_88(cpu): # 88 ADC A,B
     t = cpu.A + cpu.B + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.B & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.B
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1295,11 +1330,12 @@ def ADC_88(cpu): # 88 ADC A,B
 def ADC_89(cpu): # 89 ADC A,C
     t = cpu.A + cpu.C + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.C & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.C
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1310,11 +1346,12 @@ def ADC_89(cpu): # 89 ADC A,C
 def ADC_8A(cpu): # 8A ADC A,D
     t = cpu.A + cpu.D + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.D & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.D
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1325,11 +1362,12 @@ def ADC_8A(cpu): # 8A ADC A,D
 def ADC_8B(cpu): # 8B ADC A,E
     t = cpu.A + cpu.E + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.E & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.E
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1340,11 +1378,12 @@ def ADC_8B(cpu): # 8B ADC A,E
 def ADC_8C(cpu): # 8C ADC A,H
     t = cpu.A + (cpu.HL >> 8) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + ((cpu.HL >> 8) & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL >> 8)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1355,11 +1394,12 @@ def ADC_8C(cpu): # 8C ADC A,H
 def ADC_8D(cpu): # 8D ADC A,L
     t = cpu.A + (cpu.HL & 0xFF) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + ((cpu.HL & 0xFF) & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL & 0xFF)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1370,11 +1410,12 @@ def ADC_8D(cpu): # 8D ADC A,L
 def ADC_8E(cpu): # 8E ADC A,(HL)
     t = cpu.A + cpu.mb.getitem(cpu.HL) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.mb.getitem(cpu.HL) & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.mb.getitem(cpu.HL)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1385,11 +1426,12 @@ def ADC_8E(cpu): # 8E ADC A,(HL)
 def ADC_8F(cpu): # 8F ADC A,A
     t = cpu.A + cpu.A + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (cpu.A & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.A
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1400,11 +1442,12 @@ def ADC_8F(cpu): # 8F ADC A,A
 def SUB_90(cpu): # 90 SUB B
     t = cpu.A - cpu.B
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.B & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.B
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1415,11 +1458,12 @@ def SUB_90(cpu): # 90 SUB B
 def SUB_91(cpu): # 91 SUB C
     t = cpu.A - cpu.C
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.C & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.C
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1430,11 +1474,12 @@ def SUB_91(cpu): # 91 SUB C
 def SUB_92(cpu): # 92 SUB D
     t = cpu.A - cpu.D
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.D & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.D
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1445,11 +1490,12 @@ def SUB_92(cpu): # 92 SUB D
 def SUB_93(cpu): # 93 SUB E
     t = cpu.A - cpu.E
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.E & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.E
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1460,11 +1506,12 @@ def SUB_93(cpu): # 93 SUB E
 def SUB_94(cpu): # 94 SUB H
     t = cpu.A - (cpu.HL >> 8)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - ((cpu.HL >> 8) & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL >> 8)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1475,11 +1522,12 @@ def SUB_94(cpu): # 94 SUB H
 def SUB_95(cpu): # 95 SUB L
     t = cpu.A - (cpu.HL & 0xFF)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - ((cpu.HL & 0xFF) & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL & 0xFF)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1490,11 +1538,12 @@ def SUB_95(cpu): # 95 SUB L
 def SUB_96(cpu): # 96 SUB (HL)
     t = cpu.A - cpu.mb.getitem(cpu.HL)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.mb.getitem(cpu.HL) & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.mb.getitem(cpu.HL)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1505,11 +1554,12 @@ def SUB_96(cpu): # 96 SUB (HL)
 def SUB_97(cpu): # 97 SUB A
     t = cpu.A - cpu.A
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.A & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.A
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1520,11 +1570,12 @@ def SUB_97(cpu): # 97 SUB A
 def SBC_98(cpu): # 98 SBC A,B
     t = cpu.A - cpu.B - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.B & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.B
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1535,11 +1586,12 @@ def SBC_98(cpu): # 98 SBC A,B
 def SBC_99(cpu): # 99 SBC A,C
     t = cpu.A - cpu.C - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.C & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.C
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1550,11 +1602,12 @@ def SBC_99(cpu): # 99 SBC A,C
 def SBC_9A(cpu): # 9A SBC A,D
     t = cpu.A - cpu.D - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.D & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.D
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1565,11 +1618,12 @@ def SBC_9A(cpu): # 9A SBC A,D
 def SBC_9B(cpu): # 9B SBC A,E
     t = cpu.A - cpu.E - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.E & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.E
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1580,11 +1634,12 @@ def SBC_9B(cpu): # 9B SBC A,E
 def SBC_9C(cpu): # 9C SBC A,H
     t = cpu.A - (cpu.HL >> 8) - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - ((cpu.HL >> 8) & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL >> 8)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1595,11 +1650,12 @@ def SBC_9C(cpu): # 9C SBC A,H
 def SBC_9D(cpu): # 9D SBC A,L
     t = cpu.A - (cpu.HL & 0xFF) - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - ((cpu.HL & 0xFF) & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL & 0xFF)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1610,11 +1666,12 @@ def SBC_9D(cpu): # 9D SBC A,L
 def SBC_9E(cpu): # 9E SBC A,(HL)
     t = cpu.A - cpu.mb.getitem(cpu.HL) - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.mb.getitem(cpu.HL) & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.mb.getitem(cpu.HL)
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1625,11 +1682,12 @@ def SBC_9E(cpu): # 9E SBC A,(HL)
 def SBC_9F(cpu): # 9F SBC A,A
     t = cpu.A - cpu.A - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.A & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.A
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1640,9 +1698,10 @@ def SBC_9F(cpu): # 9F SBC A,A
 def AND_A0(cpu): # A0 AND B
     t = cpu.A & cpu.B
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1653,9 +1712,10 @@ def AND_A0(cpu): # A0 AND B
 def AND_A1(cpu): # A1 AND C
     t = cpu.A & cpu.C
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1666,9 +1726,10 @@ def AND_A1(cpu): # A1 AND C
 def AND_A2(cpu): # A2 AND D
     t = cpu.A & cpu.D
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1679,9 +1740,10 @@ def AND_A2(cpu): # A2 AND D
 def AND_A3(cpu): # A3 AND E
     t = cpu.A & cpu.E
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1692,9 +1754,10 @@ def AND_A3(cpu): # A3 AND E
 def AND_A4(cpu): # A4 AND H
     t = cpu.A & (cpu.HL >> 8)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1705,9 +1768,10 @@ def AND_A4(cpu): # A4 AND H
 def AND_A5(cpu): # A5 AND L
     t = cpu.A & (cpu.HL & 0xFF)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1718,9 +1782,10 @@ def AND_A5(cpu): # A5 AND L
 def AND_A6(cpu): # A6 AND (HL)
     t = cpu.A & cpu.mb.getitem(cpu.HL)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1731,9 +1796,10 @@ def AND_A6(cpu): # A6 AND (HL)
 def AND_A7(cpu): # A7 AND A
     t = cpu.A & cpu.A
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1744,9 +1810,10 @@ def AND_A7(cpu): # A7 AND A
 def XOR_A8(cpu): # A8 XOR B
     t = cpu.A ^ cpu.B
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1757,9 +1824,10 @@ def XOR_A8(cpu): # A8 XOR B
 def XOR_A9(cpu): # A9 XOR C
     t = cpu.A ^ cpu.C
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1770,9 +1838,10 @@ def XOR_A9(cpu): # A9 XOR C
 def XOR_AA(cpu): # AA XOR D
     t = cpu.A ^ cpu.D
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1783,9 +1852,10 @@ def XOR_AA(cpu): # AA XOR D
 def XOR_AB(cpu): # AB XOR E
     t = cpu.A ^ cpu.E
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1796,9 +1866,10 @@ def XOR_AB(cpu): # AB XOR E
 def XOR_AC(cpu): # AC XOR H
     t = cpu.A ^ (cpu.HL >> 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1809,9 +1880,10 @@ def XOR_AC(cpu): # AC XOR H
 def XOR_AD(cpu): # AD XOR L
     t = cpu.A ^ (cpu.HL & 0xFF)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1822,9 +1894,10 @@ def XOR_AD(cpu): # AD XOR L
 def XOR_AE(cpu): # AE XOR (HL)
     t = cpu.A ^ cpu.mb.getitem(cpu.HL)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1835,9 +1908,10 @@ def XOR_AE(cpu): # AE XOR (HL)
 def XOR_AF(cpu): # AF XOR A
     t = cpu.A ^ cpu.A
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1848,9 +1922,10 @@ def XOR_AF(cpu): # AF XOR A
 def OR_B0(cpu): # B0 OR B
     t = cpu.A | cpu.B
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1861,9 +1936,10 @@ def OR_B0(cpu): # B0 OR B
 def OR_B1(cpu): # B1 OR C
     t = cpu.A | cpu.C
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1874,9 +1950,10 @@ def OR_B1(cpu): # B1 OR C
 def OR_B2(cpu): # B2 OR D
     t = cpu.A | cpu.D
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1887,9 +1964,10 @@ def OR_B2(cpu): # B2 OR D
 def OR_B3(cpu): # B3 OR E
     t = cpu.A | cpu.E
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1900,9 +1978,10 @@ def OR_B3(cpu): # B3 OR E
 def OR_B4(cpu): # B4 OR H
     t = cpu.A | (cpu.HL >> 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1913,9 +1992,10 @@ def OR_B4(cpu): # B4 OR H
 def OR_B5(cpu): # B5 OR L
     t = cpu.A | (cpu.HL & 0xFF)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1926,9 +2006,10 @@ def OR_B5(cpu): # B5 OR L
 def OR_B6(cpu): # B6 OR (HL)
     t = cpu.A | cpu.mb.getitem(cpu.HL)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1939,9 +2020,10 @@ def OR_B6(cpu): # B6 OR (HL)
 def OR_B7(cpu): # B7 OR A
     t = cpu.A | cpu.A
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 1
@@ -1952,11 +2034,12 @@ def OR_B7(cpu): # B7 OR A
 def CP_B8(cpu): # B8 CP B
     t = cpu.A - cpu.B
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.B & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.B
     t &= 0xFF
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -1966,11 +2049,12 @@ def CP_B8(cpu): # B8 CP B
 def CP_B9(cpu): # B9 CP C
     t = cpu.A - cpu.C
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.C & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.C
     t &= 0xFF
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -1980,11 +2064,12 @@ def CP_B9(cpu): # B9 CP C
 def CP_BA(cpu): # BA CP D
     t = cpu.A - cpu.D
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.D & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.D
     t &= 0xFF
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -1994,11 +2079,12 @@ def CP_BA(cpu): # BA CP D
 def CP_BB(cpu): # BB CP E
     t = cpu.A - cpu.E
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.E & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.E
     t &= 0xFF
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -2008,11 +2094,12 @@ def CP_BB(cpu): # BB CP E
 def CP_BC(cpu): # BC CP H
     t = cpu.A - (cpu.HL >> 8)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - ((cpu.HL >> 8) & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL >> 8)
     t &= 0xFF
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -2022,11 +2109,12 @@ def CP_BC(cpu): # BC CP H
 def CP_BD(cpu): # BD CP L
     t = cpu.A - (cpu.HL & 0xFF)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - ((cpu.HL & 0xFF) & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ (cpu.HL & 0xFF)
     t &= 0xFF
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -2036,11 +2124,12 @@ def CP_BD(cpu): # BD CP L
 def CP_BE(cpu): # BE CP (HL)
     t = cpu.A - cpu.mb.getitem(cpu.HL)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.mb.getitem(cpu.HL) & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.mb.getitem(cpu.HL)
     t &= 0xFF
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -2050,11 +2139,12 @@ def CP_BE(cpu): # BE CP (HL)
 def CP_BF(cpu): # BF CP A
     t = cpu.A - cpu.A
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (cpu.A & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ cpu.A
     t &= 0xFF
     cpu.PC += 1
     cpu.PC &= 0xFFFF
@@ -2062,7 +2152,7 @@ def CP_BF(cpu): # BF CP A
 
 
 def RET_C0(cpu): # C0 RET NZ
-    if ((cpu.F & (1 << FLAGZ)) == 0):
+    if ((cpu.materialize_flags() & (1 << FLAGZ)) == 0):
         cpu.PC = cpu.mb.getitem((cpu.SP + 1) & 0xFFFF) << 8 # High
         cpu.PC |= cpu.mb.getitem(cpu.SP) # Low
         cpu.SP += 2
@@ -2085,7 +2175,7 @@ def POP_C1(cpu): # C1 POP BC
 
 
 def JP_C2(cpu, v): # C2 JP NZ,a16
-    if ((cpu.F & (1 << FLAGZ)) == 0):
+    if ((cpu.materialize_flags() & (1 << FLAGZ)) == 0):
         cpu.PC = v
         cpu.cycles += 16
     else:
@@ -2102,7 +2192,7 @@ def JP_C3(cpu, v): # C3 JP a16
 def CALL_C4(cpu, v): # C4 CALL NZ,a16
     cpu.PC += 3
     cpu.PC &= 0xFFFF
-    if ((cpu.F & (1 << FLAGZ)) == 0):
+    if ((cpu.materialize_flags() & (1 << FLAGZ)) == 0):
         cpu.mb.setitem((cpu.SP-1) & 0xFFFF, cpu.PC >> 8) # High
         cpu.mb.setitem((cpu.SP-2) & 0xFFFF, cpu.PC & 0xFF) # Low
         cpu.SP -= 2
@@ -2126,11 +2216,12 @@ def PUSH_C5(cpu): # C5 PUSH BC
 def ADD_C6(cpu, v): # C6 ADD A,d8
     t = cpu.A + v
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (v & 0xF)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ v
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2150,7 +2241,7 @@ def RST_C7(cpu): # C7 RST 00H
 
 
 def RET_C8(cpu): # C8 RET Z
-    if ((cpu.F & (1 << FLAGZ)) != 0):
+    if ((cpu.materialize_flags() & (1 << FLAGZ)) != 0):
         cpu.PC = cpu.mb.getitem((cpu.SP + 1) & 0xFFFF) << 8 # High
         cpu.PC |= cpu.mb.getitem(cpu.SP) # Low
         cpu.SP += 2
@@ -2171,7 +2262,7 @@ def RET_C9(cpu): # C9 RET
 
 
 def JP_CA(cpu, v): # CA JP Z,a16
-    if ((cpu.F & (1 << FLAGZ)) != 0):
+    if ((cpu.materialize_flags() & (1 << FLAGZ)) != 0):
         cpu.PC = v
         cpu.cycles += 16
     else:
@@ -2190,7 +2281,7 @@ def PREFIX_CB(cpu): # CB PREFIX CB
 def CALL_CC(cpu, v): # CC CALL Z,a16
     cpu.PC += 3
     cpu.PC &= 0xFFFF
-    if ((cpu.F & (1 << FLAGZ)) != 0):
+    if ((cpu.materialize_flags() & (1 << FLAGZ)) != 0):
         cpu.mb.setitem((cpu.SP-1) & 0xFFFF, cpu.PC >> 8) # High
         cpu.mb.setitem((cpu.SP-2) & 0xFFFF, cpu.PC & 0xFF) # Low
         cpu.SP -= 2
@@ -2215,11 +2306,12 @@ def CALL_CD(cpu, v): # CD CALL a16
 def ADC_CE(cpu, v): # CE ADC A,d8
     t = cpu.A + v + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) + (v & 0xF) + ((cpu.F & (1 << FLAGC)) != 0)) > 0xF) << FLAGH
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ v
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2298,11 +2390,12 @@ def PUSH_D5(cpu): # D5 PUSH DE
 def SUB_D6(cpu, v): # D6 SUB d8
     t = cpu.A - v
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (v & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ v
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2371,11 +2464,12 @@ def CALL_DC(cpu, v): # DC CALL C,a16
 def SBC_DE(cpu, v): # DE SBC A,d8
     t = cpu.A - v - ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (v & 0xF) - ((cpu.F & (1 << FLAGC)) != 0)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ v
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2431,9 +2525,10 @@ def PUSH_E5(cpu): # E5 PUSH HL
 def AND_E6(cpu, v): # E6 AND d8
     t = cpu.A & v
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2459,6 +2554,7 @@ def ADD_E8(cpu, v): # E8 ADD SP,r8
     flag += (((cpu.SP & 0xFF) + (v & 0xFF)) > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     t &= 0xFFFF
     cpu.SP = t
     cpu.PC += 2
@@ -2482,9 +2578,10 @@ def LD_EA(cpu, v): # EA LD (a16),A
 def XOR_EE(cpu, v): # EE XOR d8
     t = cpu.A ^ v
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2514,6 +2611,7 @@ def LDH_F0(cpu, v): # F0 LDH A,(a8)
 def POP_F1(cpu): # F1 POP AF
     cpu.A = cpu.mb.getitem((cpu.SP + 1) & 0xFFFF) # High
     cpu.F = cpu.mb.getitem(cpu.SP) & 0xF0 & 0xF0 # Low
+    cpu.lazy_flags = 0
     cpu.SP += 2
     cpu.SP &= 0xFFFF
     cpu.PC += 1
@@ -2537,7 +2635,7 @@ def DI_F3(cpu): # F3 DI
 
 def PUSH_F5(cpu): # F5 PUSH AF
     cpu.mb.setitem((cpu.SP-1) & 0xFFFF, cpu.A) # High
-    cpu.mb.setitem((cpu.SP-2) & 0xFFFF, cpu.F & 0xF0) # Low
+    cpu.mb.setitem((cpu.SP-2) & 0xFFFF, cpu.materialize_flags() & 0xF0) # Low
     cpu.SP -= 2
     cpu.SP &= 0xFFFF
     cpu.PC += 1
@@ -2548,9 +2646,10 @@ def PUSH_F5(cpu): # F5 PUSH AF
 def OR_F6(cpu, v): # F6 OR d8
     t = cpu.A | v
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2577,6 +2676,7 @@ def LD_F8(cpu, v): # F8 LD HL,SP+r8
     flag += (((cpu.SP & 0xFF) + (v & 0xFF)) > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b00000000
     cpu.HL &= 0xFFFF
     cpu.PC += 2
     cpu.PC &= 0xFFFF
@@ -2609,11 +2709,12 @@ def EI_FB(cpu): # FB EI
 def CP_FE(cpu, v): # FE CP d8
     t = cpu.A - v
     flag = 0b01000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
-    flag += (((cpu.A & 0xF) - (v & 0xF)) < 0) << FLAGH
     flag += (t < 0) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10100000
+    cpu.lazy_result = t
+    cpu.lazy_operands = cpu.A ^ v
     t &= 0xFF
     cpu.PC += 2
     cpu.PC &= 0xFFFF
@@ -2634,10 +2735,11 @@ def RST_FF(cpu): # FF RST 38H
 def RLC_100(cpu): # 100 RLC B
     t = (cpu.B << 1) + (cpu.B >> 7)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.B = t
     cpu.PC += 2
@@ -2648,10 +2750,11 @@ def RLC_100(cpu): # 100 RLC B
 def RLC_101(cpu): # 101 RLC C
     t = (cpu.C << 1) + (cpu.C >> 7)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.C = t
     cpu.PC += 2
@@ -2662,10 +2765,11 @@ def RLC_101(cpu): # 101 RLC C
 def RLC_102(cpu): # 102 RLC D
     t = (cpu.D << 1) + (cpu.D >> 7)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.D = t
     cpu.PC += 2
@@ -2676,10 +2780,11 @@ def RLC_102(cpu): # 102 RLC D
 def RLC_103(cpu): # 103 RLC E
     t = (cpu.E << 1) + (cpu.E >> 7)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.E = t
     cpu.PC += 2
@@ -2690,10 +2795,11 @@ def RLC_103(cpu): # 103 RLC E
 def RLC_104(cpu): # 104 RLC H
     t = ((cpu.HL >> 8) << 1) + ((cpu.HL >> 8) >> 7)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 2
@@ -2704,10 +2810,11 @@ def RLC_104(cpu): # 104 RLC H
 def RLC_105(cpu): # 105 RLC L
     t = ((cpu.HL & 0xFF) << 1) + ((cpu.HL & 0xFF) >> 7)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 2
@@ -2719,10 +2826,11 @@ def RLC_106(cpu): # 106 RLC (HL)
     cpu.cycles += 4
     t = (cpu.mb.getitem(cpu.HL) << 1) + (cpu.mb.getitem(cpu.HL) >> 7)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -2734,10 +2842,11 @@ def RLC_106(cpu): # 106 RLC (HL)
 def RLC_107(cpu): # 107 RLC A
     t = (cpu.A << 1) + (cpu.A >> 7)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2748,10 +2857,11 @@ def RLC_107(cpu): # 107 RLC A
 def RRC_108(cpu): # 108 RRC B
     t = (cpu.B >> 1) + ((cpu.B & 1) << 7) + ((cpu.B & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.B = t
     cpu.PC += 2
@@ -2762,10 +2872,11 @@ def RRC_108(cpu): # 108 RRC B
 def RRC_109(cpu): # 109 RRC C
     t = (cpu.C >> 1) + ((cpu.C & 1) << 7) + ((cpu.C & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.C = t
     cpu.PC += 2
@@ -2776,10 +2887,11 @@ def RRC_109(cpu): # 109 RRC C
 def RRC_10A(cpu): # 10A RRC D
     t = (cpu.D >> 1) + ((cpu.D & 1) << 7) + ((cpu.D & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.D = t
     cpu.PC += 2
@@ -2790,10 +2902,11 @@ def RRC_10A(cpu): # 10A RRC D
 def RRC_10B(cpu): # 10B RRC E
     t = (cpu.E >> 1) + ((cpu.E & 1) << 7) + ((cpu.E & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.E = t
     cpu.PC += 2
@@ -2804,10 +2917,11 @@ def RRC_10B(cpu): # 10B RRC E
 def RRC_10C(cpu): # 10C RRC H
     t = ((cpu.HL >> 8) >> 1) + (((cpu.HL >> 8) & 1) << 7) + (((cpu.HL >> 8) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 2
@@ -2818,10 +2932,11 @@ def RRC_10C(cpu): # 10C RRC H
 def RRC_10D(cpu): # 10D RRC L
     t = ((cpu.HL & 0xFF) >> 1) + (((cpu.HL & 0xFF) & 1) << 7) + (((cpu.HL & 0xFF) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 2
@@ -2833,10 +2948,11 @@ def RRC_10E(cpu): # 10E RRC (HL)
     cpu.cycles += 4
     t = (cpu.mb.getitem(cpu.HL) >> 1) + ((cpu.mb.getitem(cpu.HL) & 1) << 7) + ((cpu.mb.getitem(cpu.HL) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -2848,10 +2964,11 @@ def RRC_10E(cpu): # 10E RRC (HL)
 def RRC_10F(cpu): # 10F RRC A
     t = (cpu.A >> 1) + ((cpu.A & 1) << 7) + ((cpu.A & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2862,10 +2979,11 @@ def RRC_10F(cpu): # 10F RRC A
 def RL_110(cpu): # 110 RL B
     t = (cpu.B << 1) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.B = t
     cpu.PC += 2
@@ -2876,10 +2994,11 @@ def RL_110(cpu): # 110 RL B
 def RL_111(cpu): # 111 RL C
     t = (cpu.C << 1) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.C = t
     cpu.PC += 2
@@ -2890,10 +3009,11 @@ def RL_111(cpu): # 111 RL C
 def RL_112(cpu): # 112 RL D
     t = (cpu.D << 1) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.D = t
     cpu.PC += 2
@@ -2904,10 +3024,11 @@ def RL_112(cpu): # 112 RL D
 def RL_113(cpu): # 113 RL E
     t = (cpu.E << 1) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.E = t
     cpu.PC += 2
@@ -2918,10 +3039,11 @@ def RL_113(cpu): # 113 RL E
 def RL_114(cpu): # 114 RL H
     t = ((cpu.HL >> 8) << 1) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 2
@@ -2932,10 +3054,11 @@ def RL_114(cpu): # 114 RL H
 def RL_115(cpu): # 115 RL L
     t = ((cpu.HL & 0xFF) << 1) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 2
@@ -2947,10 +3070,11 @@ def RL_116(cpu): # 116 RL (HL)
     cpu.cycles += 4
     t = (cpu.mb.getitem(cpu.HL) << 1) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -2962,10 +3086,11 @@ def RL_116(cpu): # 116 RL (HL)
 def RL_117(cpu): # 117 RL A
     t = (cpu.A << 1) + ((cpu.F & (1 << FLAGC)) != 0)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -2976,10 +3101,11 @@ def RL_117(cpu): # 117 RL A
 def RR_118(cpu): # 118 RR B
     t = (cpu.B >> 1) + (((cpu.F & (1 << FLAGC)) != 0) << 7) + ((cpu.B & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.B = t
     cpu.PC += 2
@@ -2990,10 +3116,11 @@ def RR_118(cpu): # 118 RR B
 def RR_119(cpu): # 119 RR C
     t = (cpu.C >> 1) + (((cpu.F & (1 << FLAGC)) != 0) << 7) + ((cpu.C & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.C = t
     cpu.PC += 2
@@ -3004,10 +3131,11 @@ def RR_119(cpu): # 119 RR C
 def RR_11A(cpu): # 11A RR D
     t = (cpu.D >> 1) + (((cpu.F & (1 << FLAGC)) != 0) << 7) + ((cpu.D & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.D = t
     cpu.PC += 2
@@ -3018,10 +3146,11 @@ def RR_11A(cpu): # 11A RR D
 def RR_11B(cpu): # 11B RR E
     t = (cpu.E >> 1) + (((cpu.F & (1 << FLAGC)) != 0) << 7) + ((cpu.E & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.E = t
     cpu.PC += 2
@@ -3032,10 +3161,11 @@ def RR_11B(cpu): # 11B RR E
 def RR_11C(cpu): # 11C RR H
     t = ((cpu.HL >> 8) >> 1) + (((cpu.F & (1 << FLAGC)) != 0) << 7) + (((cpu.HL >> 8) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 2
@@ -3046,10 +3176,11 @@ def RR_11C(cpu): # 11C RR H
 def RR_11D(cpu): # 11D RR L
     t = ((cpu.HL & 0xFF) >> 1) + (((cpu.F & (1 << FLAGC)) != 0) << 7) + (((cpu.HL & 0xFF) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 2
@@ -3061,10 +3192,11 @@ def RR_11E(cpu): # 11E RR (HL)
     cpu.cycles += 4
     t = (cpu.mb.getitem(cpu.HL) >> 1) + (((cpu.F & (1 << FLAGC)) != 0) << 7) + ((cpu.mb.getitem(cpu.HL) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -3076,10 +3208,11 @@ def RR_11E(cpu): # 11E RR (HL)
 def RR_11F(cpu): # 11F RR A
     t = (cpu.A >> 1) + (((cpu.F & (1 << FLAGC)) != 0) << 7) + ((cpu.A & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -3090,10 +3223,11 @@ def RR_11F(cpu): # 11F RR A
 def SLA_120(cpu): # 120 SLA B
     t = (cpu.B << 1)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.B = t
     cpu.PC += 2
@@ -3104,10 +3238,11 @@ def SLA_120(cpu): # 120 SLA B
 def SLA_121(cpu): # 121 SLA C
     t = (cpu.C << 1)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.C = t
     cpu.PC += 2
@@ -3118,10 +3253,11 @@ def SLA_121(cpu): # 121 SLA C
 def SLA_122(cpu): # 122 SLA D
     t = (cpu.D << 1)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.D = t
     cpu.PC += 2
@@ -3132,10 +3268,11 @@ def SLA_122(cpu): # 122 SLA D
 def SLA_123(cpu): # 123 SLA E
     t = (cpu.E << 1)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.E = t
     cpu.PC += 2
@@ -3146,10 +3283,11 @@ def SLA_123(cpu): # 123 SLA E
 def SLA_124(cpu): # 124 SLA H
     t = ((cpu.HL >> 8) << 1)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 2
@@ -3160,10 +3298,11 @@ def SLA_124(cpu): # 124 SLA H
 def SLA_125(cpu): # 125 SLA L
     t = ((cpu.HL & 0xFF) << 1)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 2
@@ -3175,10 +3314,11 @@ def SLA_126(cpu): # 126 SLA (HL)
     cpu.cycles += 4
     t = (cpu.mb.getitem(cpu.HL) << 1)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -3190,10 +3330,11 @@ def SLA_126(cpu): # 126 SLA (HL)
 def SLA_127(cpu): # 127 SLA A
     t = (cpu.A << 1)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -3204,10 +3345,11 @@ def SLA_127(cpu): # 127 SLA A
 def SRA_128(cpu): # 128 SRA B
     t = ((cpu.B >> 1) | (cpu.B & 0x80)) + ((cpu.B & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.B = t
     cpu.PC += 2
@@ -3218,10 +3360,11 @@ def SRA_128(cpu): # 128 SRA B
 def SRA_129(cpu): # 129 SRA C
     t = ((cpu.C >> 1) | (cpu.C & 0x80)) + ((cpu.C & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.C = t
     cpu.PC += 2
@@ -3232,10 +3375,11 @@ def SRA_129(cpu): # 129 SRA C
 def SRA_12A(cpu): # 12A SRA D
     t = ((cpu.D >> 1) | (cpu.D & 0x80)) + ((cpu.D & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.D = t
     cpu.PC += 2
@@ -3246,10 +3390,11 @@ def SRA_12A(cpu): # 12A SRA D
 def SRA_12B(cpu): # 12B SRA E
     t = ((cpu.E >> 1) | (cpu.E & 0x80)) + ((cpu.E & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.E = t
     cpu.PC += 2
@@ -3260,10 +3405,11 @@ def SRA_12B(cpu): # 12B SRA E
 def SRA_12C(cpu): # 12C SRA H
     t = (((cpu.HL >> 8) >> 1) | ((cpu.HL >> 8) & 0x80)) + (((cpu.HL >> 8) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 2
@@ -3274,10 +3420,11 @@ def SRA_12C(cpu): # 12C SRA H
 def SRA_12D(cpu): # 12D SRA L
     t = (((cpu.HL & 0xFF) >> 1) | ((cpu.HL & 0xFF) & 0x80)) + (((cpu.HL & 0xFF) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 2
@@ -3289,10 +3436,11 @@ def SRA_12E(cpu): # 12E SRA (HL)
     cpu.cycles += 4
     t = ((cpu.mb.getitem(cpu.HL) >> 1) | (cpu.mb.getitem(cpu.HL) & 0x80)) + ((cpu.mb.getitem(cpu.HL) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -3304,10 +3452,11 @@ def SRA_12E(cpu): # 12E SRA (HL)
 def SRA_12F(cpu): # 12F SRA A
     t = ((cpu.A >> 1) | (cpu.A & 0x80)) + ((cpu.A & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -3318,9 +3467,10 @@ def SRA_12F(cpu): # 12F SRA A
 def SWAP_130(cpu): # 130 SWAP B
     t = ((cpu.B & 0xF0) >> 4) | ((cpu.B & 0x0F) << 4)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.B = t
     cpu.PC += 2
@@ -3331,9 +3481,10 @@ def SWAP_130(cpu): # 130 SWAP B
 def SWAP_131(cpu): # 131 SWAP C
     t = ((cpu.C & 0xF0) >> 4) | ((cpu.C & 0x0F) << 4)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.C = t
     cpu.PC += 2
@@ -3344,9 +3495,10 @@ def SWAP_131(cpu): # 131 SWAP C
 def SWAP_132(cpu): # 132 SWAP D
     t = ((cpu.D & 0xF0) >> 4) | ((cpu.D & 0x0F) << 4)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.D = t
     cpu.PC += 2
@@ -3357,9 +3509,10 @@ def SWAP_132(cpu): # 132 SWAP D
 def SWAP_133(cpu): # 133 SWAP E
     t = ((cpu.E & 0xF0) >> 4) | ((cpu.E & 0x0F) << 4)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.E = t
     cpu.PC += 2
@@ -3370,9 +3523,10 @@ def SWAP_133(cpu): # 133 SWAP E
 def SWAP_134(cpu): # 134 SWAP H
     t = (((cpu.HL >> 8) & 0xF0) >> 4) | (((cpu.HL >> 8) & 0x0F) << 4)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 2
@@ -3383,9 +3537,10 @@ def SWAP_134(cpu): # 134 SWAP H
 def SWAP_135(cpu): # 135 SWAP L
     t = (((cpu.HL & 0xFF) & 0xF0) >> 4) | (((cpu.HL & 0xFF) & 0x0F) << 4)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 2
@@ -3397,9 +3552,10 @@ def SWAP_136(cpu): # 136 SWAP (HL)
     cpu.cycles += 4
     t = ((cpu.mb.getitem(cpu.HL) & 0xF0) >> 4) | ((cpu.mb.getitem(cpu.HL) & 0x0F) << 4)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -3411,9 +3567,10 @@ def SWAP_136(cpu): # 136 SWAP (HL)
 def SWAP_137(cpu): # 137 SWAP A
     t = ((cpu.A & 0xF0) >> 4) | ((cpu.A & 0x0F) << 4)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -3424,10 +3581,11 @@ def SWAP_137(cpu): # 137 SWAP A
 def SRL_138(cpu): # 138 SRL B
     t = (cpu.B >> 1) + ((cpu.B & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.B = t
     cpu.PC += 2
@@ -3438,10 +3596,11 @@ def SRL_138(cpu): # 138 SRL B
 def SRL_139(cpu): # 139 SRL C
     t = (cpu.C >> 1) + ((cpu.C & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.C = t
     cpu.PC += 2
@@ -3452,10 +3611,11 @@ def SRL_139(cpu): # 139 SRL C
 def SRL_13A(cpu): # 13A SRL D
     t = (cpu.D >> 1) + ((cpu.D & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.D = t
     cpu.PC += 2
@@ -3466,10 +3626,11 @@ def SRL_13A(cpu): # 13A SRL D
 def SRL_13B(cpu): # 13B SRL E
     t = (cpu.E >> 1) + ((cpu.E & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.E = t
     cpu.PC += 2
@@ -3480,10 +3641,11 @@ def SRL_13B(cpu): # 13B SRL E
 def SRL_13C(cpu): # 13C SRL H
     t = ((cpu.HL >> 8) >> 1) + (((cpu.HL >> 8) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0x00FF) | (t << 8)
     cpu.PC += 2
@@ -3494,10 +3656,11 @@ def SRL_13C(cpu): # 13C SRL H
 def SRL_13D(cpu): # 13D SRL L
     t = ((cpu.HL & 0xFF) >> 1) + (((cpu.HL & 0xFF) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.HL = (cpu.HL & 0xFF00) | (t & 0xFF)
     cpu.PC += 2
@@ -3509,10 +3672,11 @@ def SRL_13E(cpu): # 13E SRL (HL)
     cpu.cycles += 4
     t = (cpu.mb.getitem(cpu.HL) >> 1) + ((cpu.mb.getitem(cpu.HL) & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.cycles += 4
     cpu.mb.setitem(cpu.HL, t)
@@ -3524,10 +3688,11 @@ def SRL_13E(cpu): # 13E SRL (HL)
 def SRL_13F(cpu): # 13F SRL A
     t = (cpu.A >> 1) + ((cpu.A & 1) << 8)
     flag = 0b00000000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     flag += (t > 0xFF) << FLAGC
     cpu.F &= 0b00000000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     t &= 0xFF
     cpu.A = t
     cpu.PC += 2
@@ -3538,9 +3703,10 @@ def SRL_13F(cpu): # 13F SRL A
 def BIT_140(cpu): # 140 BIT 0,B
     t = cpu.B & (1 << 0)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3549,9 +3715,10 @@ def BIT_140(cpu): # 140 BIT 0,B
 def BIT_141(cpu): # 141 BIT 0,C
     t = cpu.C & (1 << 0)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3560,9 +3727,10 @@ def BIT_141(cpu): # 141 BIT 0,C
 def BIT_142(cpu): # 142 BIT 0,D
     t = cpu.D & (1 << 0)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3571,9 +3739,10 @@ def BIT_142(cpu): # 142 BIT 0,D
 def BIT_143(cpu): # 143 BIT 0,E
     t = cpu.E & (1 << 0)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3582,9 +3751,10 @@ def BIT_143(cpu): # 143 BIT 0,E
 def BIT_144(cpu): # 144 BIT 0,H
     t = (cpu.HL >> 8) & (1 << 0)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3593,9 +3763,10 @@ def BIT_144(cpu): # 144 BIT 0,H
 def BIT_145(cpu): # 145 BIT 0,L
     t = (cpu.HL & 0xFF) & (1 << 0)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3605,9 +3776,10 @@ def BIT_146(cpu): # 146 BIT 0,(HL)
     cpu.cycles += 4
     t = cpu.mb.getitem(cpu.HL) & (1 << 0)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3616,9 +3788,10 @@ def BIT_146(cpu): # 146 BIT 0,(HL)
 def BIT_147(cpu): # 147 BIT 0,A
     t = cpu.A & (1 << 0)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3627,9 +3800,10 @@ def BIT_147(cpu): # 147 BIT 0,A
 def BIT_148(cpu): # 148 BIT 1,B
     t = cpu.B & (1 << 1)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3638,9 +3812,10 @@ def BIT_148(cpu): # 148 BIT 1,B
 def BIT_149(cpu): # 149 BIT 1,C
     t = cpu.C & (1 << 1)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3649,9 +3824,10 @@ def BIT_149(cpu): # 149 BIT 1,C
 def BIT_14A(cpu): # 14A BIT 1,D
     t = cpu.D & (1 << 1)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3660,9 +3836,10 @@ def BIT_14A(cpu): # 14A BIT 1,D
 def BIT_14B(cpu): # 14B BIT 1,E
     t = cpu.E & (1 << 1)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3671,9 +3848,10 @@ def BIT_14B(cpu): # 14B BIT 1,E
 def BIT_14C(cpu): # 14C BIT 1,H
     t = (cpu.HL >> 8) & (1 << 1)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3682,9 +3860,10 @@ def BIT_14C(cpu): # 14C BIT 1,H
 def BIT_14D(cpu): # 14D BIT 1,L
     t = (cpu.HL & 0xFF) & (1 << 1)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3694,9 +3873,10 @@ def BIT_14E(cpu): # 14E BIT 1,(HL)
     cpu.cycles += 4
     t = cpu.mb.getitem(cpu.HL) & (1 << 1)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3705,9 +3885,10 @@ def BIT_14E(cpu): # 14E BIT 1,(HL)
 def BIT_14F(cpu): # 14F BIT 1,A
     t = cpu.A & (1 << 1)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3716,9 +3897,10 @@ def BIT_14F(cpu): # 14F BIT 1,A
 def BIT_150(cpu): # 150 BIT 2,B
     t = cpu.B & (1 << 2)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3727,9 +3909,10 @@ def BIT_150(cpu): # 150 BIT 2,B
 def BIT_151(cpu): # 151 BIT 2,C
     t = cpu.C & (1 << 2)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3738,9 +3921,10 @@ def BIT_151(cpu): # 151 BIT 2,C
 def BIT_152(cpu): # 152 BIT 2,D
     t = cpu.D & (1 << 2)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3749,9 +3933,10 @@ def BIT_152(cpu): # 152 BIT 2,D
 def BIT_153(cpu): # 153 BIT 2,E
     t = cpu.E & (1 << 2)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3760,9 +3945,10 @@ def BIT_153(cpu): # 153 BIT 2,E
 def BIT_154(cpu): # 154 BIT 2,H
     t = (cpu.HL >> 8) & (1 << 2)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3771,9 +3957,10 @@ def BIT_154(cpu): # 154 BIT 2,H
 def BIT_155(cpu): # 155 BIT 2,L
     t = (cpu.HL & 0xFF) & (1 << 2)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3783,9 +3970,10 @@ def BIT_156(cpu): # 156 BIT 2,(HL)
     cpu.cycles += 4
     t = cpu.mb.getitem(cpu.HL) & (1 << 2)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3794,9 +3982,10 @@ def BIT_156(cpu): # 156 BIT 2,(HL)
 def BIT_157(cpu): # 157 BIT 2,A
     t = cpu.A & (1 << 2)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3805,9 +3994,10 @@ def BIT_157(cpu): # 157 BIT 2,A
 def BIT_158(cpu): # 158 BIT 3,B
     t = cpu.B & (1 << 3)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3816,9 +4006,10 @@ def BIT_158(cpu): # 158 BIT 3,B
 def BIT_159(cpu): # 159 BIT 3,C
     t = cpu.C & (1 << 3)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3827,9 +4018,10 @@ def BIT_159(cpu): # 159 BIT 3,C
 def BIT_15A(cpu): # 15A BIT 3,D
     t = cpu.D & (1 << 3)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3838,9 +4030,10 @@ def BIT_15A(cpu): # 15A BIT 3,D
 def BIT_15B(cpu): # 15B BIT 3,E
     t = cpu.E & (1 << 3)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3849,9 +4042,10 @@ def BIT_15B(cpu): # 15B BIT 3,E
 def BIT_15C(cpu): # 15C BIT 3,H
     t = (cpu.HL >> 8) & (1 << 3)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3860,9 +4054,10 @@ def BIT_15C(cpu): # 15C BIT 3,H
 def BIT_15D(cpu): # 15D BIT 3,L
     t = (cpu.HL & 0xFF) & (1 << 3)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3872,9 +4067,10 @@ def BIT_15E(cpu): # 15E BIT 3,(HL)
     cpu.cycles += 4
     t = cpu.mb.getitem(cpu.HL) & (1 << 3)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3883,9 +4079,10 @@ def BIT_15E(cpu): # 15E BIT 3,(HL)
 def BIT_15F(cpu): # 15F BIT 3,A
     t = cpu.A & (1 << 3)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3894,9 +4091,10 @@ def BIT_15F(cpu): # 15F BIT 3,A
 def BIT_160(cpu): # 160 BIT 4,B
     t = cpu.B & (1 << 4)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3905,9 +4103,10 @@ def BIT_160(cpu): # 160 BIT 4,B
 def BIT_161(cpu): # 161 BIT 4,C
     t = cpu.C & (1 << 4)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3916,9 +4115,10 @@ def BIT_161(cpu): # 161 BIT 4,C
 def BIT_162(cpu): # 162 BIT 4,D
     t = cpu.D & (1 << 4)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3927,9 +4127,10 @@ def BIT_162(cpu): # 162 BIT 4,D
 def BIT_163(cpu): # 163 BIT 4,E
     t = cpu.E & (1 << 4)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3938,9 +4139,10 @@ def BIT_163(cpu): # 163 BIT 4,E
 def BIT_164(cpu): # 164 BIT 4,H
     t = (cpu.HL >> 8) & (1 << 4)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3949,9 +4151,10 @@ def BIT_164(cpu): # 164 BIT 4,H
 def BIT_165(cpu): # 165 BIT 4,L
     t = (cpu.HL & 0xFF) & (1 << 4)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3961,9 +4164,10 @@ def BIT_166(cpu): # 166 BIT 4,(HL)
     cpu.cycles += 4
     t = cpu.mb.getitem(cpu.HL) & (1 << 4)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3972,9 +4176,10 @@ def BIT_166(cpu): # 166 BIT 4,(HL)
 def BIT_167(cpu): # 167 BIT 4,A
     t = cpu.A & (1 << 4)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3983,9 +4188,10 @@ def BIT_167(cpu): # 167 BIT 4,A
 def BIT_168(cpu): # 168 BIT 5,B
     t = cpu.B & (1 << 5)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -3994,9 +4200,10 @@ def BIT_168(cpu): # 168 BIT 5,B
 def BIT_169(cpu): # 169 BIT 5,C
     t = cpu.C & (1 << 5)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4005,9 +4212,10 @@ def BIT_169(cpu): # 169 BIT 5,C
 def BIT_16A(cpu): # 16A BIT 5,D
     t = cpu.D & (1 << 5)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4016,9 +4224,10 @@ def BIT_16A(cpu): # 16A BIT 5,D
 def BIT_16B(cpu): # 16B BIT 5,E
     t = cpu.E & (1 << 5)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4027,9 +4236,10 @@ def BIT_16B(cpu): # 16B BIT 5,E
 def BIT_16C(cpu): # 16C BIT 5,H
     t = (cpu.HL >> 8) & (1 << 5)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4038,9 +4248,10 @@ def BIT_16C(cpu): # 16C BIT 5,H
 def BIT_16D(cpu): # 16D BIT 5,L
     t = (cpu.HL & 0xFF) & (1 << 5)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4050,9 +4261,10 @@ def BIT_16E(cpu): # 16E BIT 5,(HL)
     cpu.cycles += 4
     t = cpu.mb.getitem(cpu.HL) & (1 << 5)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4061,9 +4273,10 @@ def BIT_16E(cpu): # 16E BIT 5,(HL)
 def BIT_16F(cpu): # 16F BIT 5,A
     t = cpu.A & (1 << 5)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4072,9 +4285,10 @@ def BIT_16F(cpu): # 16F BIT 5,A
 def BIT_170(cpu): # 170 BIT 6,B
     t = cpu.B & (1 << 6)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4083,9 +4297,10 @@ def BIT_170(cpu): # 170 BIT 6,B
 def BIT_171(cpu): # 171 BIT 6,C
     t = cpu.C & (1 << 6)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4094,9 +4309,10 @@ def BIT_171(cpu): # 171 BIT 6,C
 def BIT_172(cpu): # 172 BIT 6,D
     t = cpu.D & (1 << 6)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4105,9 +4321,10 @@ def BIT_172(cpu): # 172 BIT 6,D
 def BIT_173(cpu): # 173 BIT 6,E
     t = cpu.E & (1 << 6)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4116,9 +4333,10 @@ def BIT_173(cpu): # 173 BIT 6,E
 def BIT_174(cpu): # 174 BIT 6,H
     t = (cpu.HL >> 8) & (1 << 6)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4127,9 +4345,10 @@ def BIT_174(cpu): # 174 BIT 6,H
 def BIT_175(cpu): # 175 BIT 6,L
     t = (cpu.HL & 0xFF) & (1 << 6)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4139,9 +4358,10 @@ def BIT_176(cpu): # 176 BIT 6,(HL)
     cpu.cycles += 4
     t = cpu.mb.getitem(cpu.HL) & (1 << 6)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4150,9 +4370,10 @@ def BIT_176(cpu): # 176 BIT 6,(HL)
 def BIT_177(cpu): # 177 BIT 6,A
     t = cpu.A & (1 << 6)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4161,9 +4382,10 @@ def BIT_177(cpu): # 177 BIT 6,A
 def BIT_178(cpu): # 178 BIT 7,B
     t = cpu.B & (1 << 7)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4172,9 +4394,10 @@ def BIT_178(cpu): # 178 BIT 7,B
 def BIT_179(cpu): # 179 BIT 7,C
     t = cpu.C & (1 << 7)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4183,9 +4406,10 @@ def BIT_179(cpu): # 179 BIT 7,C
 def BIT_17A(cpu): # 17A BIT 7,D
     t = cpu.D & (1 << 7)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4194,9 +4418,10 @@ def BIT_17A(cpu): # 17A BIT 7,D
 def BIT_17B(cpu): # 17B BIT 7,E
     t = cpu.E & (1 << 7)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4205,9 +4430,10 @@ def BIT_17B(cpu): # 17B BIT 7,E
 def BIT_17C(cpu): # 17C BIT 7,H
     t = (cpu.HL >> 8) & (1 << 7)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4216,9 +4442,10 @@ def BIT_17C(cpu): # 17C BIT 7,H
 def BIT_17D(cpu): # 17D BIT 7,L
     t = (cpu.HL & 0xFF) & (1 << 7)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4228,9 +4455,10 @@ def BIT_17E(cpu): # 17E BIT 7,(HL)
     cpu.cycles += 4
     t = cpu.mb.getitem(cpu.HL) & (1 << 7)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -4239,9 +4467,10 @@ def BIT_17E(cpu): # 17E BIT 7,(HL)
 def BIT_17F(cpu): # 17F BIT 7,A
     t = cpu.A & (1 << 7)
     flag = 0b00100000
-    flag += ((t & 0xFF) == 0) << FLAGZ
     cpu.F &= 0b00010000
     cpu.F |= flag
+    cpu.lazy_flags = 0b10000000
+    cpu.lazy_result = t
     cpu.PC += 2
     cpu.PC &= 0xFFFF
     cpu.cycles += 8
@@ -5322,6 +5551,10 @@ def execute_opcode(cpu, opcode):
         b = cpu.mb.getitem(pc+1)
         v = (a << 8) + b
 
+    return dispatch_opcode(cpu, opcode, v)
+
+
+def dispatch_opcode(cpu, opcode, v):
     if opcode == 0x00:
         return NOP_00(cpu)
     elif opcode == 0x01:
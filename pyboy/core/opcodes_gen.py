@@ -17,7 +17,6 @@ warning = """
 """
 
 imports = """
-from pyboy import utils
 import array
 
 import pyboy
@@ -49,6 +48,7 @@ cdef uint16_t FLAGC, FLAGH, FLAGN, FLAGZ
 cdef uint8_t[512] OPCODE_LENGTHS
 @cython.locals(v=cython.int, a=cython.int, b=cython.int, pc=cython.ushort)
 cdef int execute_opcode(cpu.CPU, uint16_t) noexcept nogil
+cdef int dispatch_opcode(cpu.CPU, uint16_t, int) noexcept nogil
 
 cdef uint8_t no_opcode(cpu.CPU) noexcept nogil
 cdef uint8_t BRK(cpu.CPU) noexcept nogil
@@ -204,10 +204,12 @@ class Operand:
             assert not assign
             self.flag = True
 
+            # The zero flag might not have been computed yet, see CPU.materialize_flags
+            f = "cpu.materialize_flags()" if operand.endswith("Z") else "cpu.F"
             if "N" in operand:
-                return f"((cpu.F & (1 << FLAG{operand[1]})) == 0)"
+                return f"(({f} & (1 << FLAG{operand[1]})) == 0)"
             else:
-                return f"((cpu.F & (1 << FLAG{operand})) != 0)"
+                return f"(({f} & (1 << FLAG{operand})) != 0)"
             # return "f_" + operand.lower() + "(cpu)"
 
         elif operand in ["d8", "d16", "a8", "a16", "r8"]:
@@ -388,9 +390,7 @@ class OpcodeData:
         if self.flag_c == "C":
             lines.append("flag += (((%s & 0xFF) %s (%s & 0xFF)%s) > 0xFF) << FLAGC" % (r0, op, r1, c))
 
-        # Clears all flags affected by the operation
-        lines.append("cpu.F &= " + format(flagmask, "#010b"))
-        lines.append("cpu.F |= flag")
+        lines.extend(self.storeflags(flagmask))
         return lines
 
     def handleflags16bit(self, r0, r1, op, carry=False):
@@ -412,9 +412,7 @@ class OpcodeData:
         if self.flag_c == "C":
             lines.append("flag += (t > 0xFFFF) << FLAGC")
 
-        # Clears all flags affected by the operation
-        lines.append("cpu.F &= " + format(flagmask, "#010b"))
-        lines.append("cpu.F |= flag")
+        lines.extend(self.storeflags(flagmask))
         return lines
 
     def handleflags8bit(self, r0, r1, op, carry=False):
@@ -429,24 +427,36 @@ class OpcodeData:
         # Sets the ones that always get set by operation
         lines.append("flag = " + format(sum(map(lambda nf: (nf[1] == "1") << (nf[0] + 4), self.flags)), "#010b"))
 
-        if self.flag_z == "Z":
-            lines.append("flag += ((t & 0xFF) == 0) << FLAGZ")
-
-        if self.flag_h == "H" and op == "-":
-            c = " %s ((cpu.F & (1 << FLAGC)) != 0)" % op if carry else ""
-            lines.append("flag += (((%s & 0xF) %s (%s & 0xF)%s) < 0) << FLAGH" % (r0, op, r1, c))
-        elif self.flag_h == "H":
-            c = " %s ((cpu.F & (1 << FLAGC)) != 0)" % op if carry else ""
-            lines.append("flag += (((%s & 0xF) %s (%s & 0xF)%s) > 0xF) << FLAGH" % (r0, op, r1, c))
-
         if self.flag_c == "C" and op == "-":
             lines.append("flag += (t < 0) << FLAGC")
         elif self.flag_c == "C":
             lines.append("flag += (t > 0xFF) << FLAGC")
 
-        # Clears all flags affected by the operation
-        lines.append("cpu.F &= " + format(flagmask, "#010b"))
+        # Z and H are only computed when read, see CPU.materialize_flags
+        lazyflags = 0
+        if self.flag_z == "Z":
+            lazyflags |= 1 << 7
+        if self.flag_h == "H":
+            assert op in ("+", "-"), "Unexpected half-carry operation"
+            lazyflags |= 1 << 5
+
+        lines.extend(self.storeflags(flagmask, lazyflags))
+        if self.flag_z == "Z":
+            lines.append("cpu.lazy_result = t")
+        if self.flag_h == "H":
+            lines.append("cpu.lazy_operands = %s ^ %s" % (r0, r1))
+        return lines
+
+    def storeflags(self, flagmask, lazyflags=0):
+        lines = []
+        if flagmask & 0b10100000:
+            # Keeps Z or H, so they have to be computed before clearing the others
+            lines.append("cpu.F = cpu.materialize_flags() & " + format(flagmask, "#010b"))
+        else:
+            # Clears all flags affected by the operation
+            lines.append("cpu.F &= " + format(flagmask, "#010b"))
         lines.append("cpu.F |= flag")
+        lines.append("cpu.lazy_flags = " + format(lazyflags, "#010b"))
         return lines
 
     ###################################################################
@@ -512,7 +522,7 @@ class OpcodeData:
             [
                 "t = %s" % left.get,
                 "corr = 0",
-                "corr |= 0x06 if ((cpu.F & (1 << FLAGH)) != 0) else 0x00",
+                "corr |= 0x06 if ((cpu.materialize_flags() & (1 << FLAGH)) != 0) else 0x00",
                 "corr |= 0x60 if ((cpu.F & (1 << FLAGC)) != 0) else 0x00",
                 "if (cpu.F & (1 << FLAGN)) != 0:",
                 "\tt -= corr",
@@ -541,7 +551,7 @@ class OpcodeData:
         code.addlines(
             [
                 "flag = (cpu.F & 0b00010000) ^ 0b00010000",
-                "cpu.F &= 0b10000000",
+                "cpu.F = cpu.materialize_flags() & 0b10000000",
                 "cpu.F |= flag",
             ]
         )
@@ -836,7 +846,7 @@ class OpcodeData:
             code.addline("cpu.mb.setitem((cpu.SP-1) & 0xFFFF, cpu.%s) # High" % left.operand[-2])
             if left.operand == "AF":
                 # by taking fx 'A' and 'F' directly, we save calculations
-                code.addline("cpu.mb.setitem((cpu.SP-2) & 0xFFFF, cpu.%s & 0xF0) # Low" % left.operand[-1])
+                code.addline("cpu.mb.setitem((cpu.SP-2) & 0xFFFF, cpu.materialize_flags() & 0xF0) # Low")
             else:
                 # by taking fx 'A' and 'F' directly, we save calculations
                 code.addline("cpu.mb.setitem((cpu.SP-2) & 0xFFFF, cpu.%s) # Low" % left.operand[-1])
@@ -867,6 +877,7 @@ class OpcodeData:
             code.addline("cpu.%s = cpu.mb.getitem((cpu.SP + 1) & 0xFFFF) # High" % left.operand[-2])
             if left.operand == "AF":
                 code.addline("cpu.%s = cpu.mb.getitem(cpu.SP)%s & 0xF0 # Low" % (left.operand[-1], fmask))
+                code.addline("cpu.lazy_flags = 0")
             else:
                 code.addline("cpu.%s = cpu.mb.getitem(cpu.SP)%s # Low" % (left.operand[-1], fmask))
             code.addline("cpu.SP += 2")
@@ -1389,6 +1400,10 @@ def execute_opcode(cpu, opcode):
         b = cpu.mb.getitem(pc+1)
         v = (a << 8) + b
 
+    return dispatch_opcode(cpu, opcode, v)
+
+
+def dispatch_opcode(cpu, opcode, v):
 """
         )
 
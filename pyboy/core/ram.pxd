@@ -13,12 +13,13 @@ from pyboy.utils cimport IntIOInterface
 cdef Logger logger
 
 cdef class RAM:
-    @cython.locals(n=int)
     cdef int save_state(self, IntIOInterface) except -1
-    @cython.locals(n=int)
     cdef int load_state(self, IntIOInterface, int) except -1
+    @cython.locals(n=int)
+    cdef void set_dirty(self, uint8_t) noexcept
 
     cdef uint8_t[:] internal_ram0 # Dynamic size for DMG/CGB
+    cdef uint8_t[:] internal_ram0_dirty
     cdef uint8_t[0x60] non_io_internal_ram0
     cdef uint8_t[0x4C] io_ports
     cdef uint8_t[0x7F] internal_ram1
@@ -23,6 +23,8 @@ class RAM:
         self.io_ports = array("B", [0] * (IO_PORTS))
         self.internal_ram1 = array("B", [0] * (INTERNAL_RAM1))
         self.non_io_internal_ram1 = array("B", [0] * (NON_IO_INTERNAL_RAM1))
+        # Pages of internal_ram0 written since the last snapshot. See PyBoy.snapshot_incremental
+        self.internal_ram0_dirty = array("B", [0] * (len(self.internal_ram0) >> 8))
 
         if randomize:
             for n in range(INTERNAL_RAM0_CGB if cgb else INTERNAL_RAM0):
@@ -34,28 +36,22 @@ class RAM:
             for n in range(NON_IO_INTERNAL_RAM1):
                 self.non_io_internal_ram1[n] = getrandbits(8)
 
+    def set_dirty(self, value):
+        for n in range(len(self.internal_ram0_dirty)):
+            self.internal_ram0_dirty[n] = value
+
     def save_state(self, f):
-        for n in range(INTERNAL_RAM0_CGB if self.cgb else INTERNAL_RAM0):
-            f.write(self.internal_ram0[n])
-        for n in range(NON_IO_INTERNAL_RAM0):
-            f.write(self.non_io_internal_ram0[n])
-        for n in range(IO_PORTS):
-            f.write(self.io_ports[n])
+        f.write_buffer_dirty(self.internal_ram0, self.internal_ram0_dirty)
+        f.write_buffer(self.non_io_internal_ram0)
+        f.write_buffer(self.io_ports)
         # TODO: Order of INTERNAL_RAM1 and NON_IO_INTERNAL_RAM1 is flipped
-        for n in range(INTERNAL_RAM1):
-            f.write(self.internal_ram1[n])
-        for n in range(NON_IO_INTERNAL_RAM1):
-            f.write(self.non_io_internal_ram1[n])
+        f.write_buffer(self.internal_ram1)
+        f.write_buffer(self.non_io_internal_ram1)
 
     def load_state(self, f, state_version):
-        for n in range(INTERNAL_RAM0_CGB if self.cgb else INTERNAL_RAM0):
-            self.internal_ram0[n] = f.read()
-        for n in range(NON_IO_INTERNAL_RAM0):
-            self.non_io_internal_ram0[n] = f.read()
-        for n in range(IO_PORTS):
-            self.io_ports[n] = f.read()
+        f.read_buffer(self.internal_ram0)
+        f.read_buffer(self.non_io_internal_ram0)
+        f.read_buffer(self.io_ports)
         # TODO: Order of INTERNAL_RAM1 and NON_IO_INTERNAL_RAM1 is flipped
-        for n in range(INTERNAL_RAM1):
-            self.internal_ram1[n] = f.read()
-        for n in range(NON_IO_INTERNAL_RAM1):
-            self.non_io_internal_ram1[n] = f.read()
+        f.read_buffer(self.internal_ram1)
+        f.read_buffer(self.non_io_internal_ram1)
@@ -65,6 +65,8 @@ cdef class Sound:
     cdef uint8_t pcm34(self) noexcept nogil
     cdef void clear_buffer(self) noexcept nogil
     cdef void reset_apu_div(self) noexcept nogil
+    @cython.locals(target=uint64_t)
+    cdef uint64_t cycles_to_div_apu(self) noexcept nogil
     cdef void stop(self) noexcept
 
     cdef int save_state(self, IntIOInterface) except -1
@@ -97,6 +97,13 @@ class Sound:
         else:
             self.cycles_target_512Hz = 1 << 31
 
+    def cycles_to_div_apu(self):
+        # Cycles after last_cycles until the next DIV-APU step is processed
+        target = double_to_uint64_ceil(self.cycles_target_512Hz)
+        if target <= self.cycles:
+            return 0
+        return target - self.cycles
+
     def get(self, offset):
         if not self.emulate:
             return 0
@@ -213,13 +213,13 @@ class PyBoyGameWrapper(PyBoyPlugin):
     def _game_area_tiles(self):
         if self._tile_cache_invalid:
             xx, yy, width, height = self.game_area_section
-            scanline_parameters = self.pyboy.screen.tilemap_position_list
+            scanline_parameters = self.pyboy.screen.tilemap_position_ndarray
 
             if self.game_area_follow_scxy:
                 self._cached_game_area_tiles = np.ndarray(shape=(height, width), dtype=np.uint32)
                 for y in range(height):
-                    SCX = scanline_parameters[(yy + y) * 8][0] // 8
-                    SCY = scanline_parameters[(yy + y) * 8][1] // 8
+                    SCX = scanline_parameters[(yy + y) * 8, 0] // 8
+                    SCY = scanline_parameters[(yy + y) * 8, 1] // 8
                     for x in range(width):
                         _x = (xx + x + SCX) % 32
                         _y = (yy + y + SCY) % 32
@@ -727,12 +727,14 @@ class GameWrapperPokemonPinball(PyBoyGameWrapper):
             BANK_OFFSET_COMPLETE_EVOLUTION_MODE_RED_FIELD[1],
             completed_evolution,
             self,
+            deferred=True,
         )
         self.pyboy.hook_register(
             BANK_OFFSET_COMPLETE_EVOLUTION_MODE_BLUE_FIELD[0],
             BANK_OFFSET_COMPLETE_EVOLUTION_MODE_BLUE_FIELD[1],
             completed_evolution,
             self,
+            deferred=True,
         )
 
         def failed_evolution(context):
@@ -743,110 +745,164 @@ class GameWrapperPokemonPinball(PyBoyGameWrapper):
             BANK_OFFSET_FAIL_EVOLUTION_MODE_RED_FIELD[1],
             failed_evolution,
             self,
+            deferred=True,
         )
         self.pyboy.hook_register(
             BANK_OFFSET_FAIL_EVOLUTION_MODE_BLUE_FIELD[0],
             BANK_OFFSET_FAIL_EVOLUTION_MODE_BLUE_FIELD[1],
             failed_evolution,
             self,
+            deferred=True,
         )
 
         def pokemon_caught(context):
             context.pokemon_caught_in_session += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_ADD_CAUGHT_POKEMON_TO_PARTY[0], BANK_OFFSET_ADD_CAUGHT_POKEMON_TO_PARTY[1], pokemon_caught, self
+            BANK_OFFSET_ADD_CAUGHT_POKEMON_TO_PARTY[0],
+            BANK_OFFSET_ADD_CAUGHT_POKEMON_TO_PARTY[1],
+            pokemon_caught,
+            self,
+            deferred=True,
         )
 
         def pokemon_seen(context):
             context.pokemon_seen_in_session += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_SET_POKEMON_SEEN_FLAG[0], BANK_OFFSET_SET_POKEMON_SEEN_FLAG[1], pokemon_seen, self
+            BANK_OFFSET_SET_POKEMON_SEEN_FLAG[0],
+            BANK_OFFSET_SET_POKEMON_SEEN_FLAG[1],
+            pokemon_seen,
+            self,
+            deferred=True,
         )
 
         def meowth_visited(context):
             context.meowth_stages_visited += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_INIT_MEOWTH_BONUS_STAGE[0], BANK_OFFSET_INIT_MEOWTH_BONUS_STAGE[1], meowth_visited, self
+            BANK_OFFSET_INIT_MEOWTH_BONUS_STAGE[0],
+            BANK_OFFSET_INIT_MEOWTH_BONUS_STAGE[1],
+            meowth_visited,
+            self,
+            deferred=True,
         )
 
         def diglett_visited(context):
             context.diglett_stages_visited += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_INIT_DIGLETT_BONUS_STAGE[0], BANK_OFFSET_INIT_DIGLETT_BONUS_STAGE[1], diglett_visited, self
+            BANK_OFFSET_INIT_DIGLETT_BONUS_STAGE[0],
+            BANK_OFFSET_INIT_DIGLETT_BONUS_STAGE[1],
+            diglett_visited,
+            self,
+            deferred=True,
         )
 
         def gengar_visited(context):
             context.gengar_stages_visited += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_INIT_GENGAR_BONUS_STAGE[0], BANK_OFFSET_INIT_GENGAR_BONUS_STAGE[1], gengar_visited, self
+            BANK_OFFSET_INIT_GENGAR_BONUS_STAGE[0],
+            BANK_OFFSET_INIT_GENGAR_BONUS_STAGE[1],
+            gengar_visited,
+            self,
+            deferred=True,
         )
 
         def seel_visited(context):
             context.seel_stages_visited += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_INIT_SEEL_BONUS_STAGE[0], BANK_OFFSET_INIT_SEEL_BONUS_STAGE[1], seel_visited, self
+            BANK_OFFSET_INIT_SEEL_BONUS_STAGE[0],
+            BANK_OFFSET_INIT_SEEL_BONUS_STAGE[1],
+            seel_visited,
+            self,
+            deferred=True,
         )
 
         def mewtwo_visited(context):
             context.mewtwo_stages_visited += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_INIT_MEWTWO_BONUS_STAGE[0], BANK_OFFSET_INIT_MEWTWO_BONUS_STAGE[1], mewtwo_visited, self
+            BANK_OFFSET_INIT_MEWTWO_BONUS_STAGE[0],
+            BANK_OFFSET_INIT_MEWTWO_BONUS_STAGE[1],
+            mewtwo_visited,
+            self,
+            deferred=True,
         )
 
         def meowth_completed(context):
             context.meowth_stages_completed += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_MEOWTH_STAGE_COMPLETE[0], BANK_OFFSET_MEOWTH_STAGE_COMPLETE[1], meowth_completed, self
+            BANK_OFFSET_MEOWTH_STAGE_COMPLETE[0],
+            BANK_OFFSET_MEOWTH_STAGE_COMPLETE[1],
+            meowth_completed,
+            self,
+            deferred=True,
         )
 
         def diglett_completed(context):
             context.diglett_stages_completed += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_DIGLETT_STAGE_COMPLETE[0], BANK_OFFSET_DIGLETT_STAGE_COMPLETE[1], diglett_completed, self
+            BANK_OFFSET_DIGLETT_STAGE_COMPLETE[0],
+            BANK_OFFSET_DIGLETT_STAGE_COMPLETE[1],
+            diglett_completed,
+            self,
+            deferred=True,
         )
 
         def gengar_completed(context):
             context.gengar_stages_completed += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_GENGAR_STAGE_COMPLETE[0], BANK_OFFSET_GENGAR_STAGE_COMPLETE[1], gengar_completed, self
+            BANK_OFFSET_GENGAR_STAGE_COMPLETE[0],
+            BANK_OFFSET_GENGAR_STAGE_COMPLETE[1],
+            gengar_completed,
+            self,
+            deferred=True,
         )
 
         def seel_completed(context):
             context.seel_stages_completed += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_SEEL_STAGE_COMPLETE[0], BANK_OFFSET_SEEL_STAGE_COMPLETE[1], seel_completed, self
+            BANK_OFFSET_SEEL_STAGE_COMPLETE[0], BANK_OFFSET_SEEL_STAGE_COMPLETE[1], seel_completed, self, deferred=True
         )
 
         def mewtwo_completed(context):
             context.mewtwo_stages_completed += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_MEWTWO_STAGE_COMPLETE[0], BANK_OFFSET_MEWTWO_STAGE_COMPLETE[1], mewtwo_completed, self
+            BANK_OFFSET_MEWTWO_STAGE_COMPLETE[0],
+            BANK_OFFSET_MEWTWO_STAGE_COMPLETE[1],
+            mewtwo_completed,
+            self,
+            deferred=True,
         )
 
         def map_change_attempt(context):
             context.map_change_attempts += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_MAP_CHANGE_ATTEMPT[0], BANK_OFFSET_MAP_CHANGE_ATTEMPT[1], map_change_attempt, self
+            BANK_OFFSET_MAP_CHANGE_ATTEMPT[0],
+            BANK_OFFSET_MAP_CHANGE_ATTEMPT[1],
+            map_change_attempt,
+            self,
+            deferred=True,
         )
 
         def map_change_success(context):
             context.map_change_successes += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_MAP_CHANGE_SUCCESS[0], BANK_OFFSET_MAP_CHANGE_SUCCESS[1], map_change_success, self
+            BANK_OFFSET_MAP_CHANGE_SUCCESS[0],
+            BANK_OFFSET_MAP_CHANGE_SUCCESS[1],
+            map_change_success,
+            self,
+            deferred=True,
         )
 
         def pika_saver_increment(context):
@@ -857,22 +913,32 @@ class GameWrapperPokemonPinball(PyBoyGameWrapper):
             BANK_OFFSET_PIKA_SAVER_INCREMENT_BLUE_FIELD[1],
             pika_saver_increment,
             self,
+            deferred=True,
         )
         self.pyboy.hook_register(
             BANK_OFFSET_PIKA_SAVER_INCREMENT_RED_FIELD[0],
             BANK_OFFSET_PIKA_SAVER_INCREMENT_RED_FIELD[1],
             pika_saver_increment,
             self,
+            deferred=True,
         )
 
         def pika_saver_used(context):
             context.pikachu_saver_used += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_PIKA_SAVER_USED_BLUE_FIELD[0], BANK_OFFSET_PIKA_SAVER_USED_BLUE_FIELD[1], pika_saver_used, self
+            BANK_OFFSET_PIKA_SAVER_USED_BLUE_FIELD[0],
+            BANK_OFFSET_PIKA_SAVER_USED_BLUE_FIELD[1],
+            pika_saver_used,
+            self,
+            deferred=True,
         )
         self.pyboy.hook_register(
-            BANK_OFFSET_PIKA_SAVER_USED_RED_FIELD[0], BANK_OFFSET_PIKA_SAVER_USED_RED_FIELD[1], pika_saver_used, self
+            BANK_OFFSET_PIKA_SAVER_USED_RED_FIELD[0],
+            BANK_OFFSET_PIKA_SAVER_USED_RED_FIELD[1],
+            pika_saver_used,
+            self,
+            deferred=True,
         )
 
         def ball_upgrade_trigger(context):
@@ -888,25 +954,33 @@ class GameWrapperPokemonPinball(PyBoyGameWrapper):
             BANK_OFFSET_BALL_UPGRADE_TRIGGER_BLUE_FIELD[1],
             ball_upgrade_trigger,
             self,
+            deferred=True,
         )
         self.pyboy.hook_register(
             BANK_OFFSET_BALL_UPGRADE_TRIGGER_RED_FIELD[0],
             BANK_OFFSET_BALL_UPGRADE_TRIGGER_RED_FIELD[1],
             ball_upgrade_trigger,
             self,
+            deferred=True,
         )
 
         def extra_ball_added(context):
             context.extra_balls_added += 1
 
-        self.pyboy.hook_register(BANK_OFFSET_ADD_EXTRA_BALL[0], BANK_OFFSET_ADD_EXTRA_BALL[1], extra_ball_added, self)
+        self.pyboy.hook_register(
+            BANK_OFFSET_ADD_EXTRA_BALL[0], BANK_OFFSET_ADD_EXTRA_BALL[1], extra_ball_added, self, deferred=True
+        )
 
         # This prevents slot reward extra ball from being counted as it is mostly RNG based and not a good fitness metric
         def slot_reward_extra_ball(context):
             context.extra_balls_added -= 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_SLOT_REWARD_EXTRA_BALL[0], BANK_OFFSET_SLOT_REWARD_EXTRA_BALL[1], slot_reward_extra_ball, self
+            BANK_OFFSET_SLOT_REWARD_EXTRA_BALL[0],
+            BANK_OFFSET_SLOT_REWARD_EXTRA_BALL[1],
+            slot_reward_extra_ball,
+            self,
+            deferred=True,
         )
 
         def opened_slot_by_getting_4_cave_lights(context):
@@ -917,29 +991,35 @@ class GameWrapperPokemonPinball(PyBoyGameWrapper):
             BANK_OFFSET_OPENED_SLOT_BY_GETTING_4_CAVE_LIGHTS_BLUE[1],
             opened_slot_by_getting_4_cave_lights,
             self,
+            deferred=True,
         )
         self.pyboy.hook_register(
             BANK_OFFSET_OPENED_SLOT_BY_GETTING_4_CAVE_LIGHTS_RED[0],
             BANK_OFFSET_OPENED_SLOT_BY_GETTING_4_CAVE_LIGHTS_RED[1],
             opened_slot_by_getting_4_cave_lights,
             self,
+            deferred=True,
         )
 
         def slot_reward_roulette(context):
             context.roulette_slots_entered += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_SLOT_REWARD_ROULETTE[0], BANK_OFFSET_SLOT_REWARD_ROULETTE[1], slot_reward_roulette, self
+            BANK_OFFSET_SLOT_REWARD_ROULETTE[0],
+            BANK_OFFSET_SLOT_REWARD_ROULETTE[1],
+            slot_reward_roulette,
+            self,
+            deferred=True,
         )
 
         def lost_ball_during_saver(context):
             context.lost_ball_during_saver += 1
 
         self.pyboy.hook_register(
-            BANK_OFFSET_BALL_SAVED_RED[0], BANK_OFFSET_BALL_SAVED_RED[1], lost_ball_during_saver, self
+            BANK_OFFSET_BALL_SAVED_RED[0], BANK_OFFSET_BALL_SAVED_RED[1], lost_ball_during_saver, self, deferred=True
         )
         self.pyboy.hook_register(
-            BANK_OFFSET_BALL_SAVED_BLUE[0], BANK_OFFSET_BALL_SAVED_BLUE[1], lost_ball_during_saver, self
+            BANK_OFFSET_BALL_SAVED_BLUE[0], BANK_OFFSET_BALL_SAVED_BLUE[1], lost_ball_during_saver, self, deferred=True
         )
 
 
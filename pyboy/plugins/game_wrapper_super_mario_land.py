@@ -364,7 +364,7 @@ class GameWrapperSuperMarioLand(PyBoyGameWrapper):
 
         level_block = self.pyboy.memory[0xC0AB]
         mario_x = self.pyboy.memory[0xC202]
-        scx = self.pyboy.screen.tilemap_position_list[16][0]
+        scx = int(self.pyboy.screen.tilemap_position_ndarray[16, 0])
         self.level_progress = level_block * 16 + (scx - 7) % 16 + mario_x
 
     def set_time_left(self, time):
@@ -6,11 +6,12 @@
 
 cimport cython
 from libc cimport time
-from libc.stdint cimport int64_t, uint64_t
+from libc.stdint cimport int64_t, uint8_t, uint32_t, uint64_t
 
 from pyboy.api.gameshark cimport GameShark
 from pyboy.api.memory_scanner cimport MemoryScanner
 from pyboy.api.screen cimport Screen
+from pyboy.api.snapshot cimport Snapshot
 from pyboy.api.sound cimport Sound
 from pyboy.api.tilemap cimport TileMap
 from pyboy.core.cpu cimport CPU
@@ -29,6 +30,12 @@ cdef class PyBoyRegisterFile:
 
 cdef class PyBoyMemoryView:
     cdef Motherboard mb
+    cdef bint untracked_writes
+    cdef bint oam_writes
+
+    cdef object _region(self, uint8_t[:], bint)
+    @cython.locals(page=int)
+    cdef void _set_dirty(self, uint8_t[:], int, int, bint) noexcept
 
     @cython.locals(start=int,stop=int,step=int)
     cpdef (int,int,int) _fix_slice(self, slice) noexcept
@@ -78,8 +85,16 @@ cdef class PyBoy:
     @cython.locals(running=bint, _render=bint, _sound=bint)
     cpdef int64_t tick(self, int count=*, bint render=*, bint sound=*) except -1
     cpdef void stop(self, save=*) noexcept
-    cpdef int save_state(self, object) except -1
+    @cython.locals(snapshot=Snapshot, sections=list, options=dict, metadata=dict)
+    cpdef int save_state(self, object, str compression=*) except -1
     cpdef int load_state(self, object) except -1
+    cdef str _rom_hash
+    cdef str _rom_sha256(self)
+    cdef dict _clone_kwargs
+    cdef bint _is_clone
+    cdef object _dirty_since
+    @cython.locals(clone=PyBoy)
+    cpdef PyBoy clone(self)
 
     @cython.locals(state_path=str)
     cdef void _handle_events(self, list) noexcept with gil
@@ -90,11 +105,14 @@ cdef class PyBoy:
     cdef void _post_handle_events(self) noexcept with gil
 
     cdef dict _hooks
+    cdef dict _deferred_hooks
     cdef object symbols_file
     cdef public dict rom_symbols
     cdef public dict rom_symbols_inverse
     cpdef bint _handle_hooks(self) noexcept
-    cpdef int hook_register(self, uint16_t, uint16_t, object, object) except -1
+    @cython.locals(n=int64_t, entry=uint32_t, bank=int64_t)
+    cdef int _handle_deferred_hooks(self) except -1
+    cpdef int hook_register(self, uint16_t, uint16_t, object, object, bint deferred=*) except -1
     cpdef int hook_deregister(self, uint16_t, uint16_t) except -1
 
     cpdef bint _is_cpu_stuck(self) noexcept
@@ -6,7 +6,9 @@
 The core module of the emulator
 """
 
+import hashlib
 import heapq
+import io
 import os
 import re
 import time
@@ -16,7 +18,9 @@ import numpy as np
 from pyboy.api.gameshark import GameShark
 from pyboy.api.memory_scanner import MemoryScanner
 from pyboy.api.screen import Screen
+from pyboy.api.snapshot import IncrementalSnapshot, Snapshot
 from pyboy.api.sound import Sound
+from pyboy.api.state_file import StateFile, is_state_file, write_state_file
 from pyboy.api.tilemap import TileMap
 from pyboy.logging import get_logger
 from pyboy.logging import log_level as _log_level
@@ -94,6 +98,9 @@ class PyBoy:
             log_level=defaults["log_level"],
             color_palette=defaults["color_palette"],
             cgb_color_palette=defaults["cgb_color_palette"],
+            profiling=False,
+            screen_indexed=False,
+            screen_deferred=False,
             **kwargs,
     ):
         """
@@ -135,6 +142,9 @@ class PyBoy:
             * log_level (str): "CRITICAL", "ERROR", "WARNING", "INFO" or "DEBUG"
             * color_palette (tuple): Specify the color palette to use for rendering.
             * cgb_color_palette (list of tuple): Specify the color palette to use for rendering in CGB-mode for non-color games.
+            * profiling (bool): Count the executed instructions and their cycles. See `PyBoy.opcode_histogram`.
+            * screen_indexed (bool): Render the screen as 1-byte palette indices instead of RGBA. See `pyboy.api.screen.Screen.raw_buffer_format`.
+            * screen_deferred (bool): Record frames ticked with `render=False`, and only render them if the screen is accessed afterwards. See `PyBoy.tick`.
 
         ## Plugin kwargs:
         * autopause (bool): Enable auto-pausing when window looses focus [plugin: AutoPause]
@@ -173,9 +183,14 @@ class PyBoy:
         if window not in ["SDL2", "OpenGL", "null", "headless", "dummy"]:
             raise KeyError(f'Unknown window type: {window}. Use "SDL2", "OpenGL", or "null"')
 
+        if screen_indexed and window in ["SDL2", "OpenGL"]:
+            raise PyBoyInvalidInputException(f'The {window} window cannot display an indexed screen. Use "null".')
+
         kwargs["window"] = window
         kwargs["scale"] = scale
         randomize = kwargs.pop("randomize", False)  # Undocumented feature
+        rombanks = kwargs.pop("_rombanks", None)  # Shared ROM banks. See PyBoy.clone
+        decode_cache = kwargs.pop("_decode_cache", None)
 
         for k, v in defaults.items():
             if k not in kwargs:
@@ -217,9 +232,14 @@ class PyBoy:
             sound_sample_rate,
             cgb,
             randomize=randomize,
+            screen_indexed=screen_indexed,
+            screen_deferred=screen_deferred,
+            rombanks=rombanks,
+            decode_cache=decode_cache,
         )
 
         self.botsupport = BotSupport(self.mb) # added by Justice Russell
+        self.mb.cpu.profiling = profiling
 
         # Validate all kwargs
         plugin_manager_keywords = []
@@ -233,6 +253,31 @@ class PyBoy:
                 logger.error("Unknown keyword argument: %s", k)
                 raise KeyError(f"Unknown keyword argument: {k}")
 
+        # Arguments to construct a clone of the emulator. See PyBoy.clone
+        self._clone_kwargs = dict(
+            kwargs,
+            symbols=symbols,
+            bootrom=bootrom,
+            sound_volume=sound_volume,
+            sound_emulated=sound_emulated,
+            sound_sample_rate=sound_sample_rate,
+            cgb=cgb,
+            gameshark=gameshark,
+            no_input=no_input,
+            log_level=log_level,
+            color_palette=color_palette,
+            cgb_color_palette=cgb_color_palette,
+            profiling=profiling,
+            screen_indexed=screen_indexed,
+            screen_deferred=screen_deferred,
+        )
+        # Clones never save the cartridge RAM, as they share the file with the original. See PyBoy.clone
+        self._is_clone = False
+
+        # Snapshot which the dirty pages of the memory are relative to. See PyBoy.snapshot_incremental
+        self._dirty_since = None
+        self._rom_hash = None
+
         # Performance measures
         self.avg_tick = 0
         self.avg_emu = 0
@@ -424,6 +469,7 @@ class PyBoy:
         """
 
         self._hooks = {}
+        self._deferred_hooks = {}
 
         self._plugin_manager = PluginManager(self, self.mb, kwargs)
         """
@@ -488,6 +534,8 @@ class PyBoy:
             self.gameshark.tick()
             self.mb.lcd.frame_done = False
             self.mb.lcd.disable_renderer = not render
+            if self.mb.lcd.deferred:
+                self.mb.lcd.begin_deferred(not render)
             self.mb.sound.disable_sampling = not sound
             self.mb.sound.clear_buffer()
             # Reenter mb.tick until we eventually get a clean exit without breakpoints
@@ -513,6 +561,12 @@ class PyBoy:
                         # Keep singlestepping on, if that's what we're doing
                         self.mb.breakpoint_singlestep = self.mb.breakpoint_singlestep_latch
 
+            self.mb.lcd.deferred_recording = False
+
+            if self.mb.hook_queue_count:
+                with cython.gil:
+                    self._handle_deferred_hooks()
+
             self.frame_count += 1
         self._post_handle_events()
 
@@ -538,6 +592,10 @@ class PyBoy:
 
         If `render` was enabled, use `pyboy.api.screen.Screen` to get a NumPy buffer or raw memory buffer.
 
+        If PyBoy was started with `screen_deferred=True`, the frames ticked with `render=False` are recorded instead. The
+        last one is only rendered, if `pyboy.api.screen.Screen` is accessed before the next tick. This is useful, when
+        the decision to look at the screen is made after the tick.
+
         Example:
         ```python
         >>> pyboy.tick() # Progress 1 frame with rendering
@@ -566,6 +624,10 @@ class PyBoy:
         _count = count
         running = False
         t_start = time.perf_counter_ns()
+        self.mb.watch_clear_changes()
+        if self.memory.oam_writes:
+            # OAM might have been written through `PyBoyMemoryView.oam`
+            self.mb.lcd.renderer.sprites_dirty = True
         with cython.nogil:
             while count != 0:
                 # Only render screen and sample sound on last tick to improve performance
@@ -695,7 +757,7 @@ class PyBoy:
             logger.info("# Emulator is turning off #")
             logger.info("###########################")
             self._plugin_manager.stop()
-            self.mb.stop(save)
+            self.mb.stop(save and not self._is_clone)
             self.stopped = True
 
     ###################################################################
@@ -888,7 +950,7 @@ class PyBoy:
         else:
             self.events.append(WindowEvent(event))
 
-    def save_state(self, file_like_object):
+    def save_state(self, file_like_object, compression=None):
         """
         Saves the complete state of the emulator. It can be called at any time, and enable you to revert any progress in
         a game.
@@ -910,8 +972,21 @@ class PyBoy:
 
         ```
 
+        With `compression`, the state is compressed with "zlib" or "lzma", and saved with a header. The header has the
+        SHA-256 of the ROM, the title of the cartridge, `PyBoy.frame_count` and the arguments given to `PyBoy`. Each part
+        of the emulator is compressed as a separate section, which can be read on its own with
+        `pyboy.api.state_file.StateFile`. `PyBoy.load_state` checks that the ROM matches when loading it.
+
+        ```python
+        >>> with open("state_file.state", "wb") as f:
+        ...     pyboy.save_state(f, compression="zlib")
+        >>>
+
+        ```
+
         Args:
             file_like_object (io.BufferedIOBase): A file-like object for which to write the emulator state.
+            compression (str): "zlib" or "lzma" to save a compressed state with a header. None for the plain state.
         """
 
         if isinstance(file_like_object, str):
@@ -922,7 +997,27 @@ class PyBoy:
         if file_like_object.__class__.__name__ == "TextIOWrapper":
             raise PyBoyInvalidInputException("Text file not allowed. Did you specify open(..., 'wb')?")
 
-        self.mb.save_state(IntIOWrapper(file_like_object))
+        if compression is None:
+            self.mb.save_state(IntIOWrapper(file_like_object))
+        else:
+            snapshot = Snapshot()
+            sections = []
+            self.mb.save_state(snapshot, sections)
+            state = io.BytesIO()
+            snapshot.save_state(state)
+
+            # Paths to local files, like the symbols and boot ROM, are left out
+            options = {"cgb": self.mb.cgb}
+            for k, v in self._clone_kwargs.items():
+                if k not in ("cgb", "symbols", "bootrom") and (v is None or isinstance(v, (bool, int, float, str))):
+                    options[k] = v
+            metadata = {
+                "rom_sha256": self._rom_sha256(),
+                "title": self.cartridge_title,
+                "frame_count": self.frame_count,
+                "options": options,
+            }
+            write_state_file(file_like_object, state.getvalue(), sections, metadata, compression)
 
     def load_state(self, file_like_object):
         """
@@ -940,6 +1035,8 @@ class PyBoy:
         >>>
         ```
 
+        Both plain and compressed states are supported. A compressed state has to be saved with the same ROM.
+
         Args:
             file_like_object (io.BufferedIOBase): A file-like object for which to read the emulator state.
         """
@@ -952,7 +1049,159 @@ class PyBoy:
         if file_like_object.__class__.__name__ == "TextIOWrapper":
             raise PyBoyInvalidInputException("Text file not allowed. Did you specify open(..., 'rb')?")
 
-        self.mb.load_state(IntIOWrapper(file_like_object))
+        if is_state_file(file_like_object):
+            state_file = StateFile(file_like_object)
+            if state_file.rom_sha256 != self._rom_sha256():
+                raise PyBoyException(f"State was saved with another ROM: {state_file.title}")
+            self.mb.load_state(state_file.snapshot())
+        else:
+            self.mb.load_state(IntIOWrapper(file_like_object))
+
+    def _rom_sha256(self):
+        # Hash of the ROM file for the header of compressed states. Only calculated once
+        if self._rom_hash is None:
+            with open(self.gamerom, "rb") as f:
+                self._rom_hash = hashlib.sha256(f.read()).hexdigest()
+        return self._rom_hash
+
+    def snapshot(self, snapshot=None):
+        """
+        Copies the complete state of the emulator into memory. This is the same as `PyBoy.save_state`, but without the
+        overhead of a file-like object, and meant for frequently saving and restoring states. For example, when
+        searching through possible moves in a game.
+
+        An existing snapshot can be given to reuse its memory.
+
+        ```python
+        >>> snapshot = pyboy.snapshot()
+        >>> pyboy.tick(60)
+        True
+        >>> pyboy.restore(snapshot)
+        >>> pyboy.snapshot(snapshot) # Overwrite the snapshot with the current state
+        <pyboy.api.snapshot.Snapshot object at ...>
+
+        ```
+
+        Args:
+            snapshot (pyboy.api.snapshot.Snapshot): Optional snapshot to overwrite.
+
+        Returns
+        -------
+        `pyboy.api.snapshot.Snapshot`:
+            The snapshot, which can be restored with `PyBoy.restore`.
+        """
+
+        if snapshot is None:
+            snapshot = Snapshot()
+        elif not isinstance(snapshot, Snapshot):
+            raise PyBoyInvalidInputException("Expected a Snapshot object")
+
+        snapshot.seek(0)
+        self.mb.save_state(snapshot)
+        snapshot.truncate()
+        self.mb.set_dirty(False)
+        self._dirty_since = snapshot
+        return snapshot
+
+    def snapshot_incremental(self, parent):
+        """
+        Copies the state of the emulator into memory like `PyBoy.snapshot`, but only stores the 256-byte pages of the
+        state that changed since `parent`. The rest is shared with the parent. This is meant for keeping a snapshot of
+        every frame of a long episode.
+
+        The emulator keeps track of the pages of WRAM, VRAM and OAM that the game writes to. It is cheapest when
+        `parent` is the last snapshot made or restored, as only those pages have to be compared. For any other parent,
+        all of the state is compared.
+
+        ```python
+        >>> parent = pyboy.snapshot()
+        >>> pyboy.tick()
+        True
+        >>> child = pyboy.snapshot_incremental(parent)
+        >>> pyboy.restore(child)
+        >>> child.materialize() # A full copy of the state
+        <pyboy.api.snapshot.Snapshot object at ...>
+
+        ```
+
+        Args:
+            parent (pyboy.api.snapshot.Snapshot or pyboy.api.snapshot.IncrementalSnapshot): Snapshot of this emulator
+                to store the changes relative to.
+
+        Returns
+        -------
+        `pyboy.api.snapshot.IncrementalSnapshot`:
+            The snapshot, which can be restored with `PyBoy.restore`.
+        """
+
+        if not isinstance(parent, (Snapshot, IncrementalSnapshot)):
+            raise PyBoyInvalidInputException("Expected a Snapshot or IncrementalSnapshot object")
+
+        if parent is not self._dirty_since or self.memory.untracked_writes:
+            # The pages are only tracked relative to the last snapshot
+            self.mb.set_dirty(True)
+
+        snapshot = IncrementalSnapshot(parent)
+        self.mb.save_state(snapshot)
+        self.mb.set_dirty(False)
+        self._dirty_since = snapshot
+        return snapshot
+
+    def restore(self, snapshot):
+        """
+        Restores a snapshot made with `PyBoy.snapshot` or `PyBoy.snapshot_incremental`. The same snapshot can be
+        restored any number of times.
+
+        Args:
+            snapshot (pyboy.api.snapshot.Snapshot or pyboy.api.snapshot.IncrementalSnapshot): The snapshot to restore.
+        """
+
+        if not isinstance(snapshot, (Snapshot, IncrementalSnapshot)):
+            raise PyBoyInvalidInputException("Expected a Snapshot or IncrementalSnapshot object")
+
+        snapshot.seek(0)
+        self.mb.load_state(snapshot)
+        self.mb.set_dirty(False)
+        self._dirty_since = snapshot
+
+    def clone(self):
+        """
+        Creates an independent emulator at the same state as this one. It's faster than creating a new `PyBoy` and
+        loading a state, and meant for branching out from a state. For example, to try out different moves in a game.
+
+        The clone shares the cartridge ROM, and the instructions decoded from it, with this emulator. If either of them
+        overrides the ROM through `PyBoy.memory`, or sets a hook, it first gets its own copy of the ROM. The clone always uses the "null" window,
+        and hooks, watchpoints and the state of the plugins are not copied. The clone doesn't save the cartridge RAM
+        when it's stopped, as it would overwrite the battery save of this emulator.
+
+        The state is copied without resetting the changes tracked for `PyBoy.snapshot_incremental`.
+
+        ```python
+        >>> clone = pyboy.clone()
+        >>> clone.button("a")
+        >>> clone.tick(60)
+        True
+        >>> clone.stop(save=False)
+
+        ```
+
+        Returns
+        -------
+        `PyBoy`:
+            The new emulator.
+        """
+
+        kwargs = dict(self._clone_kwargs)
+        kwargs["window"] = "null"
+        rombanks, decode_cache = self.mb.clone_rombanks()
+        clone = PyBoy(self.gamerom, _rombanks=rombanks, _decode_cache=decode_cache, **kwargs)
+        clone._is_clone = True
+        snapshot = Snapshot()
+        self.mb.save_state(snapshot)
+        clone.restore(snapshot)
+        clone.mb.clone_remove_breakpoints(self.mb.breakpoints)
+        clone.frame_count = self.frame_count
+        return clone
 
     def game_area_dimensions(self, x, y, width, height, follow_scrolling=True):
         """
@@ -1196,7 +1445,7 @@ class PyBoy:
         """
         return self._lookup_symbol(symbol)
 
-    def hook_register(self, bank, addr, callback, context):
+    def hook_register(self, bank, addr, callback, context, deferred=False):
         """
         Adds a hook into a specific bank and memory address.
         When the Game Boy executes this address, the provided callback function will be called.
@@ -1237,22 +1486,42 @@ class PyBoy:
         weird behavior or crash. Hooks are installed by replacing the instruction at the bank and address with a special
         opcode (`0xDB`). If the address is read by the game instead of executed as code, this value will be read instead.
 
+        Each time a hook is hit, the emulation has to stop to call the callback. For hooks which are hit often, and where
+        the callback doesn't need to inspect the registers or memory at that exact point, you can use `deferred=True`.
+        The code is then left untouched, and the callbacks are called in order once the frame is done.
+
+        Example:
+        ```python
+        >>> context = []
+        >>> pyboy.hook_register(0, 0x1AB, lambda x: x.append(1), context, deferred=True)
+        >>> pyboy.tick()
+        True
+        >>> len(context) > 0
+        True
+
+        ```
+
         Args:
             bank (int or None): ROM or RAM bank (None for symbol lookup)
             addr (int or str): Address in the Game Boy's address space (str for symbol lookup)
             callback (func): A function which takes `context` as argument
             context (object): Argument to pass to callback when hook is called
+            deferred (bool): Call the callback at the end of the frame instead of stopping the emulation
         """
         if bank is None and isinstance(addr, str):
             bank, addr = self._lookup_symbol(addr)
 
         opcode = self.memory[bank, addr]
-        if opcode == 0xDB:
+        if opcode == 0xDB or (bank, addr) in self._deferred_hooks:
             raise ValueError("Hook already registered for this bank and address.")
-        self.mb.breakpoint_add(bank, addr)
-        bank_addr_opcode = (bank & 0xFF) << 24 | (addr & 0xFFFF) << 8 | (opcode & 0xFF)
-        logger.debug("Adding hook for opcode %08x", bank_addr_opcode)
-        self._hooks[bank_addr_opcode] = (callback, context)
+        if deferred:
+            self.mb.hook_add(addr)
+            self._deferred_hooks[(bank, addr)] = (callback, context)
+        else:
+            self.mb.breakpoint_add(bank, addr)
+            bank_addr_opcode = (bank & 0xFF) << 24 | (addr & 0xFFFF) << 8 | (opcode & 0xFF)
+            logger.debug("Adding hook for opcode %08x", bank_addr_opcode)
+            self._hooks[bank_addr_opcode] = (callback, context)
 
     def hook_deregister(self, bank, addr):
         """
@@ -1284,6 +1553,10 @@ class PyBoy:
         if bank is None and isinstance(addr, str):
             bank, addr = self._lookup_symbol(addr)
 
+        if self._deferred_hooks.pop((bank, addr), None) is not None:
+            self.mb.hook_remove(addr)
+            return 0
+
         breakpoint_meta = self.mb.breakpoint_find(bank, addr)
         if not breakpoint_meta:
             raise ValueError("Breakpoint not found for bank and addr")
@@ -1300,6 +1573,73 @@ class PyBoy:
             return True
         return False
 
+    def _handle_deferred_hooks(self):
+        for n in range(self.mb.hook_queue_count):
+            entry = self.mb.hook_queue[n]
+            bank = entry >> 16
+            # Other banks with a hook on the same address are queued too
+            if _handler := self._deferred_hooks.get((bank - 1, entry & 0xFFFF)):
+                (callback, context) = _handler
+                callback(context)
+        self.mb.hook_queue_count = 0
+        return 0
+
+    def watch_write(self, addr_range, callback_or_flag):
+        """
+        Watch for writes to an address or a range of addresses in the Game Boy's address space.
+
+        With `True`, the addresses which are written with a new value are collected in `PyBoy.watched_changes`. This is
+        much cheaper than reading the memory after every frame to look for changes. Writes to the I/O registers, and to
+        the memory bank controller in the ROM area, are always collected, as these addresses can't be read back.
+
+        With a callback, it is called with the address and value on every write, before the value is written. Like
+        hooks, the emulation is stopped while the callback runs.
+
+        Use `False` or `None` to stop watching the addresses.
+
+        Example:
+        ```python
+        >>> pyboy.watch_write(range(0xC000, 0xE000), True)
+        >>> pyboy.memory[0xC000] = pyboy.memory[0xC000] ^ 0xFF
+        >>> [hex(addr) for addr in pyboy.watched_changes]
+        ['0xc000']
+        >>> def on_write(addr, value):
+        ...     print(f"{addr:04X}: {value}")
+        >>> pyboy.watch_write(0xC000, on_write)
+        >>> pyboy.memory[0xC000] = 42
+        C000: 42
+        >>> pyboy.watch_write(range(0xC000, 0xE000), False)
+
+        ```
+
+        Args:
+            addr_range (int or range): Address or range of addresses to watch
+            callback_or_flag (func or bool): A function which takes the address and value as arguments, or `True` to
+                collect the changed addresses
+        """
+        if isinstance(addr_range, int):
+            addr_range = range(addr_range, addr_range + 1)
+        if not isinstance(addr_range, range) or addr_range.step < 1:
+            raise PyBoyInvalidInputException("Address has to be an integer or a range")
+        if len(addr_range) and not (0 <= addr_range[0] and addr_range[-1] <= 0xFFFF):
+            raise PyBoyOutOfBoundsException("Address out of range")
+
+        for addr in addr_range:
+            self.mb.watch_set(addr, callback_or_flag)
+
+    @property
+    def watched_changes(self):
+        """
+        Addresses watched with `PyBoy.watch_write`, which were written with a new value during the last call to
+        `PyBoy.tick`.
+
+        Returns
+        -------
+        set:
+            Set of addresses
+        """
+        return {self.mb.watch_changes[n] for n in range(self.mb.watch_changes_count)}
+
     def get_sprite(self, sprite_index):
         """
         Provides a `pyboy.api.sprite.Sprite` object, which makes the OAM data more presentable. The given index
@@ -1418,6 +1758,52 @@ class PyBoy:
         else:
             raise PyBoyException("There's no RTC for this cartridge type")
 
+    def opcode_histogram(self):
+        """
+        Get the number of times each instruction has been executed, and the cycles spent on it. This requires PyBoy to
+        be started with `profiling=True`.
+
+        The arrays are indexed by opcode, where the CB-prefixed instructions start at 0x100. The arrays share memory
+        with the emulator, so they keep counting as the emulator runs. Use `PyBoy.opcode_histogram_reset` to start over,
+        for example between frames.
+
+        Example:
+        ```python
+        >>> pyboy_profiling = PyBoy('game_rom.gb', profiling=True)
+        >>> pyboy_profiling.tick(60)
+        True
+        >>> counts, cycles = pyboy_profiling.opcode_histogram()
+        >>> counts.shape
+        (512,)
+        >>> hex(counts.argmax()) # Most executed instruction
+        '0x...'
+        >>> pyboy_profiling.opcode_histogram_reset()
+        >>> int(counts.sum())
+        0
+        >>> pyboy_profiling.stop(save=False)
+
+        ```
+
+        Returns
+        -------
+        tuple:
+            `np.ndarray` of executions and `np.ndarray` of cycles per opcode, both uint64 of shape (512,)
+        """
+        if not self.mb.cpu.profiling:
+            raise PyBoyException("Profiling is not enabled. Start PyBoy with profiling=True")
+        return (
+            np.frombuffer(self.mb.cpu.opcode_counts, dtype=np.uint64),
+            np.frombuffer(self.mb.cpu.opcode_cycles, dtype=np.uint64),
+        )
+
+    def opcode_histogram_reset(self):
+        """
+        Reset the counters of `PyBoy.opcode_histogram` to zero.
+        """
+        for n in range(512):
+            self.mb.cpu.opcode_counts[n] = 0
+            self.mb.cpu.opcode_cycles[n] = 0
+
     def _cycles(self):
         return self.mb.cpu.cycles
 
@@ -1461,11 +1847,12 @@ class PyBoyRegisterFile:
 
     @property
     def F(self):
-        return self.cpu.F
+        return self.cpu.materialize_flags()
 
     @F.setter
     def F(self, value):
         self.cpu.F = value & 0xF0
+        self.cpu.lazy_flags = 0
 
     @property
     def B(self):
@@ -1624,10 +2011,146 @@ class PyBoyMemoryView:
     0
     ```
 
+    **Regions:**
+
+    For reading larger areas, the memory regions can be accessed directly as NumPy arrays. These are views into the
+    emulator's memory, so they are not copied, and they will follow the changes made by the game. Writes to a writable
+    region change the memory directly, without the side-effects of a regular write.
+
+    ```python
+    >>> wram = pyboy.memory.wram
+    >>> wram[0:4] = [1, 2, 3, 4]
+    >>> pyboy.memory[0xC000:0xC004]
+    [1, 2, 3, 4]
+    >>> pyboy.memory.rom(0)[0x0134:0x0138].tobytes() # Part of the game title
+    b'...'
+    ```
+
+    The views are only valid as long as the PyBoy object exists.
     """
 
     def __init__(self, mb):
         self.mb = mb
+        self.untracked_writes = False
+        # Writes through the OAM view aren't seen by the renderer. See PyBoy.tick
+        self.oam_writes = False
+
+    def _region(self, buffer, writeable):
+        view = np.asarray(buffer)
+        view.flags.writeable = writeable
+        if writeable:
+            # Writes through the view can't be tracked. See PyBoy.snapshot_incremental
+            self.untracked_writes = True
+        return view
+
+    def _copy(self, start, stop):
+        # Copy of the memory from start to stop as a NumPy array, without reading RAM and ROM one address at a time.
+        # See MemoryScanner
+        if not (0 <= start <= stop <= 0x10000):
+            raise PyBoyOutOfBoundsException("Address out of range")
+        buffer = np.zeros(stop - start, dtype=np.uint8)
+        self.mb.copy_memory(start, stop, buffer)
+        return buffer
+
+    def _set_dirty(self, dirty, start, stop, is_single):
+        # Writes to a specific bank skip Motherboard.setitem, so the pages are marked here
+        if is_single:
+            stop = start + 1
+        for page in range(start >> 8, ((stop - 1) >> 8) + 1):
+            dirty[page] = 1
+
+    @property
+    def wram(self):
+        """
+        Writable view of the internal work RAM (0xC000 to 0xE000). On CGB, it has all 8 banks of 4KB in order.
+
+        Returns
+        -------
+        numpy.ndarray:
+            uint8 array of 8KB or 32KB
+        """
+        return self._region(self.mb.ram.internal_ram0, True)
+
+    @property
+    def hram(self):
+        """
+        Writable view of the high RAM (0xFF80 to 0xFFFF).
+
+        Returns
+        -------
+        numpy.ndarray:
+            uint8 array of 127 bytes
+        """
+        return self._region(self.mb.ram.internal_ram1, True)
+
+    @property
+    def oam(self):
+        """
+        Writable view of the sprite attribute table (OAM, 0xFE00 to 0xFEA0). Writes are picked up by the renderer on
+        the next `PyBoy.tick`.
+
+        Returns
+        -------
+        numpy.ndarray:
+            uint8 array of 160 bytes
+        """
+        self.oam_writes = True
+        return self._region(self.mb.lcd.OAM, True)
+
+    def vram(self, bank=0):
+        """
+        Read-only view of a bank of video RAM (0x8000 to 0xA000). Bank 1 is only available in CGB mode. Write through
+        `PyBoy.memory` instead, as the tile cache has to be updated.
+
+        Args:
+            bank (int): VRAM bank
+        Returns
+        -------
+        numpy.ndarray:
+            uint8 array of 8KB
+        """
+        if not (self.mb.cgb or bank == 0):
+            raise PyBoyInvalidInputException("Selecting bank of VRAM is only supported for CGB mode")
+        if bank == 0:
+            return self._region(self.mb.lcd.VRAM0, False)
+        elif bank == 1:
+            return self._region(self.mb.lcd.VRAM1, False)
+        raise PyBoyOutOfBoundsException("VRAM Bank out of range")
+
+    def sram(self, bank=0):
+        """
+        Writable view of a bank of the cartridge RAM (0xA000 to 0xC000).
+
+        Args:
+            bank (int): RAM bank
+        Returns
+        -------
+        numpy.ndarray:
+            uint8 array of 8KB
+        """
+        if not (0 <= bank < self.mb.cartridge.external_ram_count):
+            raise PyBoyOutOfBoundsException("RAM Bank out of range")
+        view = np.asarray(self.mb.cartridge.rambanks)[bank]
+        view.flags.writeable = True
+        return view
+
+    def rom(self, bank):
+        """
+        Read-only view of a bank of the cartridge ROM. Bank 0 is at 0x0000 to 0x4000, and the other banks are switched
+        in at 0x4000 to 0x8000. To override the ROM, write through `PyBoy.memory` with a bank.
+
+        Args:
+            bank (int): ROM bank
+        Returns
+        -------
+        numpy.ndarray:
+            uint8 array of 16KB
+        """
+        if not (0 <= bank < self.mb.cartridge.external_rom_count):
+            raise PyBoyOutOfBoundsException("ROM Bank out of range")
+        view = np.asarray(self.mb.cartridge.rombanks)[bank]
+        view.flags.writeable = False
+        return view
 
     def _fix_slice(self, addr):
         if addr.start is None:
@@ -1836,6 +2359,7 @@ class PyBoyMemoryView:
                     else:
                         self.mb.bootrom.bootrom[start] = v
                 else:
+                    self.mb.unshare_rombanks()
                     if not is_single:
                         # Writing slice of memory space
                         if hasattr(v, "__iter__"):
@@ -1844,11 +2368,14 @@ class PyBoyMemoryView:
                             _v = iter(v)
                             for x in range(start, stop, step):
                                 self.mb.cartridge.overrideitem(bank, x, next(_v))
+                                self.mb.cpu.invalidate_decode_cache((bank << 14) | x)
                         else:
                             for x in range(start, stop, step):
                                 self.mb.cartridge.overrideitem(bank, x, v)
+                                self.mb.cpu.invalidate_decode_cache((bank << 14) | x)
                     else:
                         self.mb.cartridge.overrideitem(bank, start, v)
+                        self.mb.cpu.invalidate_decode_cache((bank << 14) | start)
 
             elif start < 0xA000:
                 start -= 0x8000
@@ -1875,6 +2402,7 @@ class PyBoyMemoryView:
                                 self.mb.lcd.VRAM0[x] = v
                     else:
                         self.mb.lcd.VRAM0[start] = v
+                    self._set_dirty(self.mb.lcd.VRAM0_dirty, start, stop, is_single)
                 else:
                     if not is_single:
                         # Writing slice of memory space
@@ -1889,6 +2417,7 @@ class PyBoyMemoryView:
                                 self.mb.lcd.VRAM1[x] = v
                     else:
                         self.mb.lcd.VRAM1[start] = v
+                    self._set_dirty(self.mb.lcd.VRAM1_dirty, start, stop, is_single)
             elif start < 0xC000:
                 start -= 0xA000
                 stop -= 0xA000
@@ -1936,6 +2465,7 @@ class PyBoyMemoryView:
                             self.mb.ram.internal_ram0[x + bank * 0x1000] = v
                 else:
                     self.mb.ram.internal_ram0[start + bank * 0x1000] = v
+                self._set_dirty(self.mb.ram.internal_ram0_dirty, start + bank * 0x1000, stop + bank * 0x1000, is_single)
             else:
                 raise PyBoyInvalidInputException("Invalid memory address for bank")
         elif not is_single:
@@ -18,6 +18,11 @@ cdef class IntIOInterface:
     cpdef uint8_t read(self) except? -1
     cpdef uint16_t read_16bit(self) except? -1
     cpdef uint32_t read_32bit(self) except? -1
+    @cython.locals(n=int64_t)
+    cpdef int64_t write_buffer(self, const uint8_t[:]) except -1
+    cpdef int64_t write_buffer_dirty(self, const uint8_t[:], const uint8_t[:]) except -1
+    @cython.locals(n=int64_t)
+    cpdef int64_t read_buffer(self, uint8_t[:]) except -1
 
     @cython.locals(a=uint64_t, b=uint64_t, c=uint64_t,d=uint64_t,e=uint64_t,f=uint64_t,g=uint64_t,h=uint64_t,ret=uint64_t, ret2=uint64_t, ret1=uint64_t)
     cpdef uint64_t read_64bit(self) except? -1
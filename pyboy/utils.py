@@ -20,7 +20,7 @@ __all__ = [
     "SoundEnabledError",
 ]
 
-STATE_VERSION = 14
+STATE_VERSION = 15
 
 
 class PyBoyException(Exception):
@@ -201,6 +201,22 @@ class IntIOInterface:
     def read(self):
         raise PyBoyNotImplementedException("Not implemented!")
 
+    def write_buffer(self, buffer):
+        # Byte by byte, unless the subclass can write the whole buffer at once
+        for n in range(len(buffer)):
+            self.write(buffer[n])
+        return len(buffer)
+
+    def write_buffer_dirty(self, buffer, dirty):
+        # The dirty map has a byte per 256-byte page of the buffer, which is set if the page changed since the last
+        # snapshot. Only subclasses writing relative to an earlier state skip the clean pages.
+        return self.write_buffer(buffer)
+
+    def read_buffer(self, buffer):
+        for n in range(len(buffer)):
+            buffer[n] = self.read()
+        return len(buffer)
+
     def seek(self, pos):
         raise PyBoyNotImplementedException("Not implemented!")
 
@@ -242,6 +258,15 @@ class IntIOWrapper(IntIOInterface):
             raise PyBoyAssertException("No data")
         return ord(data)
 
+    def write_buffer(self, buffer):
+        return self.buffer.write(buffer)
+
+    def read_buffer(self, buffer):
+        length = self.buffer.readinto(buffer)
+        if not (length == len(buffer)):
+            raise PyBoyAssertException("No data")
+        return length
+
     def seek(self, pos):
         self.buffer.seek(pos)
 
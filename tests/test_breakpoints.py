@@ -57,6 +57,24 @@ def test_register_hooks(default_rom):
     mock.method2.assert_not_called()
 
 
+def test_register_hooks_executed_code(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy.set_emulation_speed(0)
+    for _ in range(120):
+        pyboy.tick()
+
+    # Main.loop has already been executed, so the hook has to replace the decoded instruction
+    mock = Mock()
+    pyboy.hook_register(0, 0x1AB, mock.method1, None)
+    pyboy.tick()
+    mock.method1.assert_called()
+
+    mock.reset_mock()
+    pyboy.hook_deregister(0, 0x1AB)
+    pyboy.tick()
+    mock.method1.assert_not_called()
+
+
 def test_register_hook_context(default_rom):
     pyboy = PyBoy(default_rom, window="null")
     pyboy.set_emulation_speed(0)
@@ -92,6 +110,28 @@ def test_register_hook_print(default_rom, capfd):
     assert out == "Hello!\n"
 
 
+def test_register_hooks_deferred(default_rom):
+    counts = []
+    for deferred in [False, True]:
+        pyboy = PyBoy(default_rom, window="null")
+        pyboy.set_emulation_speed(0)
+
+        _context = []
+        pyboy.hook_register(-1, 0xFC, lambda x: x.append(-1), _context, deferred=deferred)
+        pyboy.hook_register(0, 0x1AB, lambda x: x.append(0), _context, deferred=deferred)
+        for _ in range(120):
+            pyboy.tick()
+        assert _context.count(-1) == 1
+
+        pyboy.hook_deregister(0, 0x1AB)
+        pyboy.tick()
+        counts.append(len(_context))
+        pyboy.stop(save=False)
+
+    assert counts[0] > 1
+    assert counts[0] == counts[1]
+
+
 def test_symbols_none(default_rom):
     pyboy = PyBoy(default_rom, window="null")
     pyboy.set_emulation_speed(0)
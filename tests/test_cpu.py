@@ -0,0 +1,125 @@
+#
+# License: See LICENSE.md file
+# GitHub: https://github.com/Baekalfen/PyBoy
+#
+import io
+
+import pytest
+
+from pyboy import PyBoy
+
+PROGRAM = 0xC000
+CONDITION = 0xC400
+SUBROUTINE = 0xC800
+RESULT = 0xD000
+
+HALT = [0x76, 0x18, 0xFD]  # HALT; JR -3
+
+# Z and H of the ALU opcodes are computed when F is read. Each case is run from A = 0 and F = 0, and the A and F it
+# leaves are worked out by hand, as the flags would be computed eagerly.
+CASES = [
+    pytest.param([0x3E, 0x0F, 0xC6, 0x01], 0x10, 0x20, id="ADD"),
+    pytest.param([0x3E, 0x3A, 0xC6, 0xC6], 0x00, 0xB0, id="ADD zero"),
+    pytest.param([0x3E, 0x3A, 0xC6, 0xC6, 0x3C], 0x01, 0x10, id="ADD, INC"),
+    pytest.param([0x3E, 0x10, 0xD6, 0x10], 0x00, 0xC0, id="SUB zero"),
+    pytest.param([0x3E, 0x10, 0xD6, 0x01], 0x0F, 0x60, id="SUB half-carry"),
+    pytest.param([0x3E, 0x01, 0x3D], 0x00, 0xC0, id="DEC"),
+    pytest.param([0x3E, 0x01, 0x3D, 0x03], 0x00, 0xC0, id="DEC, INC BC"),
+    pytest.param([0x3E, 0xF0, 0xE6, 0x0F], 0x00, 0xA0, id="AND"),
+    pytest.param([0x3E, 0xF0, 0xE6, 0x0F, 0xF6, 0x00], 0x00, 0x80, id="AND, OR"),
+    pytest.param([0x3E, 0xF0, 0xE6, 0x0F, 0xF6, 0x00, 0xEE, 0x01], 0x01, 0x00, id="AND, OR, XOR"),
+    pytest.param([0x3E, 0x42, 0xFE, 0x42], 0x42, 0xC0, id="CP"),
+    pytest.param([0x37, 0x3E, 0x0F, 0xCE, 0x00], 0x10, 0x20, id="SCF, ADC"),
+    pytest.param([0x37, 0x3E, 0x10, 0xDE, 0x0F], 0x00, 0xE0, id="SCF, SBC"),
+    pytest.param([0x21, 0xFF, 0x0F, 0x01, 0x01, 0x00, 0xAF, 0x09], 0x00, 0xA0, id="XOR, ADD HL"),
+    pytest.param([0x3E, 0x10, 0xD6, 0x10, 0xE8, 0x00], 0x00, 0x00, id="SUB, ADD SP"),
+    pytest.param([0x3E, 0x0F, 0xC6, 0x01, 0x2F], 0xEF, 0x60, id="ADD, CPL"),
+    pytest.param([0xAF, 0x3F], 0x00, 0x90, id="XOR, CCF"),
+    pytest.param([0x3E, 0x01, 0x3D, 0x37], 0x00, 0x90, id="DEC, SCF"),
+    pytest.param([0x21, 0x00, 0xD1, 0x36, 0xFF, 0x34], 0x00, 0xA0, id="INC (HL)"),
+    pytest.param([0x3E, 0x00, 0xCB, 0x7F], 0x00, 0xA0, id="BIT"),
+    pytest.param([0x3E, 0x00, 0xCB, 0x37], 0x00, 0x80, id="SWAP"),
+    pytest.param([0x3E, 0x80, 0xCB, 0x27], 0x00, 0x90, id="SLA"),
+    pytest.param([0x3E, 0x08, 0xC6, 0x08, 0x27], 0x16, 0x00, id="ADD, DAA"),
+    pytest.param([0x3E, 0x10, 0xD6, 0x01, 0x27], 0x09, 0x40, id="SUB, DAA"),
+    pytest.param([0x3E, 0x99, 0xC6, 0x01, 0x27], 0x00, 0x90, id="ADD, DAA zero"),
+]
+
+# Conditional instructions on Z, reached with a jump to CONDITION, and the subroutine they call. The instructions leave
+# 1 in E when they set it with "LD E,1", depending on the zero flag.
+LD_E_1 = [0x1E, 0x01]
+RET = [0xC9]
+CALL_SUBROUTINE = [0xCD, SUBROUTINE & 0xFF, SUBROUTINE >> 8]
+SKIP = [(CONDITION + 5) & 0xFF, (CONDITION + 5) >> 8]
+CONDITIONS = [
+    pytest.param([0x28, 0x02] + LD_E_1, [], lambda z: 0 if z else 1, id="JR Z"),
+    pytest.param([0x20, 0x02] + LD_E_1, [], lambda z: 1 if z else 0, id="JR NZ"),
+    pytest.param([0xCA] + SKIP + LD_E_1, [], lambda z: 0 if z else 1, id="JP Z"),
+    pytest.param([0xC2] + SKIP + LD_E_1, [], lambda z: 1 if z else 0, id="JP NZ"),
+    pytest.param([0xCC] + CALL_SUBROUTINE[1:], LD_E_1 + RET, lambda z: 1 if z else 0, id="CALL Z"),
+    pytest.param([0xC4] + CALL_SUBROUTINE[1:], LD_E_1 + RET, lambda z: 0 if z else 1, id="CALL NZ"),
+    pytest.param(CALL_SUBROUTINE, [0xC8] + LD_E_1 + RET, lambda z: 0 if z else 1, id="RET Z"),
+    pytest.param(CALL_SUBROUTINE, [0xC0] + LD_E_1 + RET, lambda z: 1 if z else 0, id="RET NZ"),
+]
+
+
+@pytest.fixture(scope="module")
+def pyboy_cpu(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    # Each program starts from here, as the CPU is left halted by the one before
+    yield pyboy, pyboy.snapshot()
+    pyboy.stop(save=False)
+
+
+def run(pyboy_cpu, code, condition=None, subroutine=None):
+    # Runs the code from work RAM without interrupts, until it halts. E is stored at RESULT after the condition.
+    pyboy, snapshot = pyboy_cpu
+    pyboy.restore(snapshot)
+    if condition is not None:
+        code = code + [0xC3, CONDITION & 0xFF, CONDITION >> 8]  # JP CONDITION
+        block = condition + [0x7B, 0xEA, RESULT & 0xFF, RESULT >> 8] + HALT  # LD A,E; LD (RESULT),A
+        pyboy.memory[CONDITION : CONDITION + len(block)] = block
+        pyboy.memory[SUBROUTINE : SUBROUTINE + len(subroutine)] = subroutine
+    else:
+        code = code + HALT
+    pyboy.memory[PROGRAM : PROGRAM + len(code)] = code
+    pyboy.memory[0xFFFF] = 0
+    pyboy.register_file.A = 0
+    pyboy.register_file.F = 0
+    pyboy.register_file.E = 0
+    pyboy.register_file.SP = 0xDFF0
+    pyboy.register_file.PC = PROGRAM
+    pyboy.tick(1, False, False)
+    return pyboy
+
+
+@pytest.mark.parametrize("code,a,f", CASES)
+def test_flags_push_af(pyboy_cpu, code, a, f):
+    # PUSH AF; POP BC; LD A,C; LD (RESULT),A; LD A,B; LD (RESULT+1),A
+    pyboy = run(pyboy_cpu, code + [0xF5, 0xC1, 0x79, 0xEA, 0x00, 0xD0, 0x78, 0xEA, 0x01, 0xD0])
+    assert pyboy.memory[RESULT : RESULT + 2] == [f, a]
+
+
+@pytest.mark.parametrize("code,a,f", CASES)
+def test_flags_register_file(pyboy_cpu, code, a, f):
+    pyboy = run(pyboy_cpu, code)
+    assert pyboy.register_file.A == a
+    assert pyboy.register_file.F == f
+
+
+@pytest.mark.parametrize("code,a,f", CASES)
+def test_flags_save_state(pyboy_cpu, code, a, f):
+    pyboy = run(pyboy_cpu, code)
+    state = io.BytesIO()
+    pyboy.save_state(state)
+    pyboy.register_file.F = 0
+    state.seek(0)
+    pyboy.load_state(state)
+    assert pyboy.register_file.F == f
+
+
+@pytest.mark.parametrize("condition,subroutine,expected", CONDITIONS)
+@pytest.mark.parametrize("code,a,f", CASES)
+def test_flags_conditions(pyboy_cpu, code, a, f, condition, subroutine, expected):
+    pyboy = run(pyboy_cpu, code, condition, subroutine)
+    assert pyboy.memory[RESULT] == expected(f & 0x80)
@@ -13,9 +13,17 @@ import pytest
 from PIL import ImageChops
 
 from pyboy import PyBoy
+from pyboy.api import StateFile
 from pyboy.api.tile import Tile
 from pyboy.api.constants import TILES_CGB, TILES
-from pyboy.utils import IntIOWrapper, PyBoyAssertException, PyBoyException, PyBoyOutOfBoundsException, WindowEvent
+from pyboy.utils import (
+    IntIOWrapper,
+    PyBoyAssertException,
+    PyBoyException,
+    PyBoyInvalidInputException,
+    PyBoyOutOfBoundsException,
+    WindowEvent,
+)
 
 from .conftest import BOOTROM_FRAMES_UNTIL_LOGO
 
@@ -36,6 +44,95 @@ def test_rtc_lock_no_rtc(default_rom):
         pyboy.rtc_lock_experimental(True)
 
 
+def test_opcode_histogram(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    with pytest.raises(PyBoyException):
+        pyboy.opcode_histogram()
+    pyboy.stop(save=False)
+
+    pyboy = PyBoy(default_rom, window="null", profiling=True)
+    counts, cycles = pyboy.opcode_histogram()
+    assert counts.shape == (512,)
+    assert cycles.shape == (512,)
+    pyboy.tick(60, False, False)
+
+    # The arrays are views into the emulator
+    assert counts.sum() > 0
+    assert (cycles >= counts * 4).all()
+    assert (counts[cycles > 0] > 0).all()
+
+    pyboy.opcode_histogram_reset()
+    assert counts.sum() == 0
+    assert cycles.sum() == 0
+    pyboy.tick(1, False, False)
+    assert counts.sum() > 0
+    pyboy.stop(save=False)
+
+
+def test_opcode_histogram_idle_loop(default_rom):
+    def cpu_cycles(pyboy):
+        # The CPU cycles are the last field of the CPU section
+        state = io.BytesIO()
+        pyboy.save_state(state, compression="zlib")
+        state.seek(0)
+        return int.from_bytes(StateFile(state).read_section("cpu")[-8:], "little")
+
+    pyboy = PyBoy(default_rom, window="null", profiling=True)
+    pyboy.tick(60, False, False)
+    # LDH A,(44); CP 90; JR NZ -6; JR -8
+    pyboy.memory[0, 0x1000:0x1008] = [0xF0, 0x44, 0xFE, 0x90, 0x20, 0xFA, 0x18, 0xF8]
+    pyboy.memory[0xFFFF] = 0
+    pyboy.register_file.PC = 0x1000
+
+    counts, cycles = pyboy.opcode_histogram()
+    pyboy.opcode_histogram_reset()
+    start = cpu_cycles(pyboy)
+    pyboy.tick(10, False, False)
+    # The busy-waiting isn't fast-forwarded while profiling
+    assert cycles.sum() == cpu_cycles(pyboy) - start
+    assert counts[0xF0] == counts[0xFE]
+    pyboy.stop(save=False)
+
+
+def test_watch_write(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy.watch_write(range(0x8000, 0xA000), True)
+    pyboy.tick(BOOTROM_FRAMES_UNTIL_LOGO, False, False)
+
+    # The boot ROM has drawn the logo into VRAM
+    changes = pyboy.watched_changes
+    assert len(changes) > 0
+    assert all(0x8000 <= addr < 0xA000 for addr in changes)
+    assert all(pyboy.memory[addr] != 0 for addr in changes if addr < 0x9800)
+
+    writes = []
+    pyboy.watch_write(0xC000, lambda addr, value: writes.append((addr, value)))
+    pyboy.memory[0xC000] = 42
+    pyboy.memory[0xC001] = 42
+    assert writes == [(0xC000, 42)]
+
+    # Writing the same value to RAM is not a change, but every write to an I/O register is
+    pyboy.tick(1, False, False)
+    pyboy.watch_write(0xC100, True)
+    pyboy.watch_write(0xFF42, True)
+    pyboy.memory[0xC100] = pyboy.memory[0xC100]
+    pyboy.memory[0xFF42] = pyboy.memory[0xFF42]
+    assert pyboy.watched_changes == {0xFF42}
+
+    pyboy.watch_write(range(0x8000, 0xA000), False)
+    pyboy.watch_write(0xC000, None)
+    pyboy.watch_write(0xC100, False)
+    pyboy.watch_write(0xFF42, False)
+    pyboy.memory[0xC000] = 43
+    pyboy.tick(1, False, False)
+    assert writes == [(0xC000, 42)]
+    assert pyboy.watched_changes == set()
+
+    with pytest.raises(PyBoyOutOfBoundsException):
+        pyboy.watch_write(range(0xFFFF, 0x10001), True)
+    pyboy.stop(save=False)
+
+
 def test_rtc_lock(pokemon_gold_rom):
     pyboy = PyBoy(pokemon_gold_rom, window="null")
     pyboy.rtc_lock_experimental(False)
@@ -295,6 +392,172 @@ def test_screen_buffer_and_image(tetris_rom, boot_rom):
     pyboy.stop(save=False)
 
 
+@pytest.mark.parametrize("cgb", [False, True])
+def test_screen_indexed(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy_indexed = PyBoy(default_rom, window="null", cgb=cgb, screen_indexed=True)
+    pyboy.tick(60, True)
+    pyboy_indexed.tick(60, True)
+
+    assert pyboy_indexed.screen.raw_buffer_format == "P"
+    assert pyboy_indexed.screen.ndarray.shape == (144, 160)
+    assert pyboy_indexed.screen.image.mode == "P"
+
+    # Every index maps to exactly one color of the RGBA screen
+    rgba = pyboy.screen.ndarray.view(np.uint32)[:, :, 0]
+    indices = pyboy_indexed.screen.ndarray
+    assert len(np.unique(indices)) > 1
+    for index in np.unique(indices):
+        assert len(np.unique(rgba[indices == index])) == 1
+
+    # The image has the palette of the indices, and keeps following the screen
+    image = pyboy_indexed.screen.image
+    assert (np.asarray(image.convert("RGBA")) == pyboy.screen.ndarray).all()
+    for p in [pyboy, pyboy_indexed]:
+        p.memory[0xFF47] = 0x1B  # Inverted BGP
+        p.tick(2, True)
+    assert pyboy_indexed.screen.image is image
+    assert (np.asarray(image.convert("RGBA")) == pyboy.screen.ndarray).all()
+
+    with pytest.raises(PyBoyInvalidInputException):
+        PyBoy(default_rom, window="SDL2", screen_indexed=True)
+
+    pyboy.stop(save=False)
+    pyboy_indexed.stop(save=False)
+
+
+@pytest.mark.parametrize("cgb", [False, True])
+def test_screen_layers(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy_layers = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy_indexed = PyBoy(default_rom, window="null", cgb=cgb, screen_indexed=True)
+    assert pyboy_layers.screen.layers is None
+    layers = pyboy_layers.screen.set_layers()
+    assert layers.shape == (3, 144, 160)
+    assert pyboy_layers.screen.set_layers() is layers
+    pyboy.tick(60, True)
+    pyboy_layers.tick(60, True)
+    pyboy_indexed.tick(60, True)
+
+    # The composited screen is unchanged
+    assert (pyboy_layers.screen.ndarray == pyboy.screen.ndarray).all()
+
+    # Where no sprite is drawn, the background and window planes make up the indexed screen
+    background, window, sprites = pyboy_layers.screen.layers
+    assert ((background == 255) != (window == 255)).all()
+    composite = np.where(window == 255, background, window)
+    visible = sprites == 255
+    assert visible.any()
+    assert (composite[visible] == pyboy_indexed.screen.ndarray[visible]).all()
+
+    pyboy.stop(save=False)
+    pyboy_layers.stop(save=False)
+    pyboy_indexed.stop(save=False)
+
+
+def test_screen_observation(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy_nearest = PyBoy(default_rom, window="null")
+    assert pyboy.screen.observation is None
+    observation = pyboy.screen.set_observation((72, 80), "box")
+    observation_nearest = pyboy_nearest.screen.set_observation((84, 84), "nearest")
+    pyboy.tick(60, True)
+    pyboy_nearest.tick(60, True)
+
+    rgb = pyboy.screen.ndarray.astype(np.uint32)
+    luma = (rgb[:, :, 0] * 77 + rgb[:, :, 1] * 150 + rgb[:, :, 2] * 29) >> 8
+    assert len(np.unique(luma)) > 1
+    assert observation is pyboy.screen.observation
+    assert (observation == luma.reshape(72, 2, 80, 2).sum(axis=(1, 3)) // 4).all()
+
+    rows = np.arange(84) * 144 // 84
+    cols = np.arange(84) * 160 // 84
+    assert (observation_nearest == luma[rows][:, cols]).all()
+
+    with pytest.raises(PyBoyInvalidInputException):
+        pyboy.screen.set_observation((84, 84), "box")
+    with pytest.raises(PyBoyInvalidInputException):
+        pyboy.screen.set_observation((145, 80), "nearest")
+    with pytest.raises(PyBoyInvalidInputException):
+        pyboy.screen.set_observation((72, 80), "bilinear")
+
+    pyboy.stop(save=False)
+    pyboy_nearest.stop(save=False)
+
+
+def test_screen_frame_hash(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy.tick(1, True)
+    previous = pyboy.screen.ndarray.copy()
+    changes = 0
+    for _ in range(120):
+        pyboy.tick(1, True)
+        changed = not (pyboy.screen.ndarray == previous).all()
+        assert pyboy.screen.changed_since_last_frame == changed
+        changes += changed
+        previous = pyboy.screen.ndarray.copy()
+    assert 0 < changes < 120
+
+    # Identical frames have the same hash
+    pyboy2 = PyBoy(default_rom, window="null")
+    for _ in range(121):
+        pyboy2.tick(1, True)
+    assert (pyboy.screen.ndarray == pyboy2.screen.ndarray).all()
+    assert pyboy.screen.frame_hash == pyboy2.screen.frame_hash
+
+    # Frames which aren't rendered don't change the hash
+    frame_hash = pyboy.screen.frame_hash
+    state = io.BytesIO()
+    pyboy.save_state(state)
+    pyboy.tick(30, False)
+    assert pyboy.screen.frame_hash == frame_hash
+    pyboy.tick(1, True)
+    assert pyboy.screen.frame_hash != frame_hash
+    state.seek(0)
+    pyboy.load_state(state)
+    assert pyboy.screen.frame_hash == frame_hash
+
+    pyboy.stop(save=False)
+    pyboy2.stop(save=False)
+
+
+@pytest.mark.parametrize("cgb", [False, True])
+def test_screen_deferred(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy_deferred = PyBoy(default_rom, window="null", cgb=cgb, screen_deferred=True)
+    pyboy_deferred.screen.set_observation((72, 80), "box")
+    pyboy.screen.set_observation((72, 80), "box")
+
+    # Decide to look at the screen after the tick
+    for frame in range(1, 181):
+        look = frame % 7 == 0
+        pyboy.tick(1, look)
+        pyboy_deferred.tick(1, False)
+        if look:
+            assert (pyboy_deferred.screen.ndarray == pyboy.screen.ndarray).all()
+            assert (pyboy_deferred.screen.observation == pyboy.screen.observation).all()
+            assert pyboy_deferred.screen.frame_hash == pyboy.screen.frame_hash
+
+    # Rendering the frame leaves the memory as it was
+    pyboy_deferred.tick(1, False)
+    pyboy.tick(1, True)
+    memory = pyboy_deferred.memory[0x8000:0xFF80]
+    assert (pyboy_deferred.screen.ndarray == pyboy.screen.ndarray).all()
+    assert pyboy_deferred.memory[0x8000:0xFF80] == memory
+
+    # Saving the state renders the frame first
+    pyboy_deferred.tick(1, False)
+    pyboy.tick(1, True)
+    state = io.BytesIO()
+    pyboy_deferred.save_state(state)
+    state.seek(0)
+    pyboy_deferred.load_state(state)
+    assert (pyboy_deferred.screen.ndarray == pyboy.screen.ndarray).all()
+
+    pyboy.stop(save=False)
+    pyboy_deferred.stop(save=False)
+
+
 def test_tetris(tetris_rom):
     NEXT_TETROMINO = 0xC213
 
@@ -517,6 +780,36 @@ def test_tilemap_position_list(supermarioland_rom):
     pyboy.stop(save=False)
 
 
+def test_tilemap_position_ndarray(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    positions = pyboy.screen.tilemap_position_ndarray
+    assert positions.shape == (144, 5)
+    with pytest.raises(ValueError):
+        positions[0, 0] = 1
+
+    # The list is all zeros while the LCD is off during boot
+    pyboy.tick(5, False, False)
+
+    # The logo wobbles while it scrolls in
+    for _ in range(30):
+        pyboy.tick(1, False, False)
+        # Same view, updated in place
+        assert pyboy.screen.tilemap_position_ndarray is positions
+        assert positions[:, :4].tolist() == pyboy.screen.tilemap_position_list
+    assert (positions[:, 2] == -7).all()
+
+    state = io.BytesIO()
+    pyboy.save_state(state)
+    expected = positions.copy()
+    pyboy.tick(1, False, False)
+    assert (positions != expected).any()
+    state.seek(0)
+    pyboy.load_state(state)
+    assert (positions == expected).all()
+
+    pyboy.stop(save=False)
+
+
 def test_button(default_rom):
     pyboy = PyBoy(default_rom, window="null")
     pyboy.set_emulation_speed(0)
@@ -9,7 +9,7 @@ import pytest
 
 import numpy as np
 from pyboy import PyBoy
-from pyboy.core.lcd import LCD, Renderer
+from pyboy.core.lcd import LCD, PaletteColorRegister, PaletteIndexRegister, Renderer
 from pyboy.utils import cython_compiled
 
 INTR_VBLANK, INTR_LCDC, INTR_TIMER, INTR_SERIAL, INTR_HIGHTOLOW = [1 << x for x in range(5)]
@@ -384,3 +384,136 @@ class TestRenderer:
                 for offset in range(4):
                     assert (colorcode_low >> (3 - offset) * 8) & 0xFF == legacy_color_code(byte1, byte2, offset)
                     assert (colorcode_high >> (3 - offset) * 8) & 0xFF == legacy_color_code(byte1, byte2, offset + 4)
+
+    def test_sprite_buckets(self):
+        lcd = LCD(False, False, color_palette, cgb_color_palette)
+        lcd.set_lcdc(0b1000_0010)  # Enable LCD and sprites
+        renderer = lcd.renderer
+        for n in range(len(lcd.OAM)):
+            lcd.OAM[n] = 0
+
+        # 12 sprites on scanline 0 to 7, from right to left
+        for i in range(12):
+            lcd.OAM[i * 4] = 16
+            lcd.OAM[i * 4 + 1] = 8 + 100 - i * 8
+        renderer.update_sprite_buckets(lcd, 8)
+        assert renderer._sprite_bucket_count[0] == 10
+        assert renderer._sprite_bucket_count[7] == 10
+        assert renderer._sprite_bucket_count[8] == 0
+        # Only the first 10 in OAM are selected, sorted descending by x
+        assert [b & 0xFF for b in renderer._sprite_buckets[:10]] == [i * 4 for i in range(10)]
+
+        lcd.OAM[0] = 16 + 4
+        renderer.update_sprite_buckets(lcd, 16)
+        assert renderer._sprite_bucket_count[0] == 10
+        assert renderer._sprite_bucket_count[3] == 10
+        assert renderer._sprite_bucket_count[4] == 10
+        assert renderer._sprite_bucket_count[15] == 10
+        assert renderer._sprite_bucket_count[16] == 1
+        assert renderer._sprite_bucket_count[19] == 1
+        assert renderer._sprite_bucket_count[20] == 0
+        assert renderer._sprite_buckets[0] & 0xFF == 4
+
+    def test_layers(self):
+        lcd = LCD(False, False, color_palette, cgb_color_palette)
+        lcd.set_lcdc(0b1111_0011)  # Enable LCD, window on 0x9C00, tile data on 0x8000, sprites and background
+        renderer = lcd.renderer
+        for n in range(len(lcd.OAM)):
+            lcd.OAM[n] = 0
+        for n in range(16, 32):
+            lcd.VRAM0[n] = 0xFF  # Tile 1 has color 3
+        for n in range(0x1C00, 0x2000):
+            lcd.VRAM0[n] = 1  # Window map
+        lcd.WX = 80 + 7
+        lcd.WY = 0
+        lcd.OAM[0] = 16
+        lcd.OAM[1] = 4 + 8
+        lcd.OAM[2] = 1
+        lcd.OAM[3] = 0x80  # Behind the background
+
+        renderer.set_layers()
+        renderer.scanline(lcd, 0)
+        renderer.scanline_sprites(lcd, 0, renderer._screenbuffer, renderer._screenbuffer_attributes, False)
+        background, window, sprites = [[renderer._layers[layer, 0, x] for x in range(160)] for layer in range(3)]
+        assert background == [0] * 80 + [255] * 80
+        assert window == [255] * 80 + [3] * 80
+        assert sprites == [255] * 4 + [3] * 8 + [255] * 148
+
+        # The planes are cleared for each scanline
+        lcd.set_lcdc(0b1001_0001)  # Only the background
+        renderer.scanline(lcd, 0)
+        renderer.scanline_sprites(lcd, 0, renderer._screenbuffer, renderer._screenbuffer_attributes, False)
+        assert [renderer._layers[0, 0, x] for x in range(160)] == [0] * 160
+        assert [renderer._layers[1, 0, x] for x in range(160)] == [255] * 160
+        assert [renderer._layers[2, 0, x] for x in range(160)] == [255] * 160
+
+    def test_cgb_palette_lut(self):
+        palette = PaletteColorRegister(PaletteIndexRegister())
+        for cgb_color in range(0x10000):
+            red = (cgb_color & 0x1F) << 3
+            green = ((cgb_color >> 5) & 0x1F) << 3
+            blue = ((cgb_color >> 10) & 0x1F) << 3
+            assert palette.cgb_to_rgb(cgb_color, 0) == 0xFF000000 | (blue << 16) | (green << 8) | red
+
+
+def render_reference(vram, scx, scy, wx, wy, bgp):
+    # Shades of the background and window, computed pixel by pixel from the tile data at 0x8000
+    tiles = vram[:0x1000].reshape(256, 8, 2)
+    bits = 7 - np.arange(8)
+    color_codes = ((tiles[:, :, 1, None] >> bits) & 1) << 1 | ((tiles[:, :, 0, None] >> bits) & 1)
+
+    y, x = np.mgrid[:144, :160]
+    window = (y >= wy) & (x >= wx - 7)
+    px = np.where(window, x - (wx - 7), (x + scx) % 256)
+    py = np.where(window, y - wy, (y + scy) % 256)
+    tilemap = np.where(window, 0x1C00, 0x1800)
+    tile = vram[tilemap + py // 8 * 32 + px // 8]
+    return (bgp >> (2 * color_codes[tile, py % 8, px % 8])) & 0b11
+
+
+@pytest.mark.parametrize("scx,scy,wx", [(0, 0, 167), (3, 5, 90), (253, 250, 7 + 5)])
+def test_scanline_scrolled(default_rom, scx, scy, wx):
+    wy = 50
+    bgp = 0b00011011
+    rng = np.random.default_rng(0)
+    vram = rng.integers(0, 0x100, 0x2000, dtype=np.uint8)
+    # The background uses tile 0-127. The window uses tile 128-255, which are the same on all of their lines, and each
+    # row of the window map is the same. This checks the window horizontally, regardless of its line counter.
+    vram[0x1800:0x1C00] %= 128
+    vram[0x1C00:0x2000] = np.tile(128 + vram[0x1C00:0x1C20] % 128, 32)
+    tiles = vram[0x800:0x1000].reshape(128, 8, 2)
+    tiles[:] = tiles[:, :1]
+
+    pyboys = [
+        PyBoy(default_rom, window="null", color_palette=color_palette),
+        PyBoy(default_rom, window="null", screen_indexed=True),
+        PyBoy(default_rom, window="null"),
+    ]
+    layers = pyboys[2].screen.set_layers()
+    for pyboy in pyboys:
+        pyboy.tick(60, False, False)
+        # The CPU waits in HALT, so the registers are left as set here
+        pyboy.memory[0xC000:0xC003] = [0x76, 0x18, 0xFD]  # HALT; JR -3
+        pyboy.memory[0xFFFF] = 0
+        pyboy.register_file.PC = 0xC000
+        pyboy.memory[0x8000:0xA000] = vram.tolist()
+        pyboy.memory[0xFF40] = 0b1111_0001  # Window on 0x9C00, tile data on 0x8000, background on 0x9800
+        pyboy.memory[0xFF42] = scy
+        pyboy.memory[0xFF43] = scx
+        pyboy.memory[0xFF47] = bgp
+        pyboy.memory[0xFF4A] = wy
+        pyboy.memory[0xFF4B] = wx
+        pyboy.tick(2, True, False)
+
+    expected = render_reference(vram, scx, scy, wx, wy, bgp)
+    colors = np.array([[(c >> 16) & 0xFF, (c >> 8) & 0xFF, c & 0xFF, 0xFF] for c in color_palette], dtype=np.uint8)
+    assert (pyboys[0].screen.ndarray == colors[expected]).all()
+    assert (pyboys[1].screen.ndarray == expected).all()
+
+    window = np.zeros((144, 160), dtype=bool)
+    window[wy:, max(wx - 7, 0) :] = wx < 167
+    assert (layers[0] == np.where(window, 0xFF, expected)).all()
+    assert (layers[1] == np.where(window, expected, 0xFF)).all()
+
+    for pyboy in pyboys:
+        pyboy.stop(save=False)
@@ -1,5 +1,5 @@
 from pyboy import PyBoy
-from pyboy.api.memory_scanner import DynamicComparisonType
+from pyboy.api.memory_scanner import DynamicComparisonType, ScanMode
 from pyboy.utils import bcd_to_dec, dec_to_bcd
 
 
@@ -70,6 +70,40 @@ def test_memoryscanner_boundary(default_rom):
     assert len(addresses) == 0x100 - 1 - 1  # Where one value is now not 0, and we cannot get n+1
 
 
+def test_memoryscanner_multi_byte(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy.set_emulation_speed(0)
+
+    pyboy.memory[0xC000:0xD000] = 0
+    pyboy.memory[0xC100:0xC103] = [0x34, 0x12, 0x00]
+    addresses = pyboy.memory_scanner.scan_memory(0x1234, start_addr=0xC000, end_addr=0xCFFF, byte_width=2)
+    assert addresses == [0xC100]
+    addresses = pyboy.memory_scanner.scan_memory(
+        0x3412, start_addr=0xC000, end_addr=0xCFFF, byte_width=2, byteorder="big"
+    )
+    assert addresses == [0xC100]
+    addresses = pyboy.memory_scanner.scan_memory(
+        1234, start_addr=0xC000, end_addr=0xCFFF, value_type=ScanMode.BCD, byte_width=3
+    )
+    assert addresses == [0xC100]
+
+    # Values wider than 64-bit
+    pyboy.memory[0xC200:0xC209] = [0xFF] * 9
+    addresses = pyboy.memory_scanner.scan_memory(2**72 - 1, start_addr=0xC000, end_addr=0xCFFF, byte_width=9)
+    assert addresses == [0xC200]
+
+    # The rescan decodes values the same way as the scan
+    pyboy.memory_scanner.scan_memory(1234, start_addr=0xC000, end_addr=0xCFFF, value_type=ScanMode.BCD, byte_width=3)
+    pyboy.memory[0xC100] = 0x35
+    addresses = pyboy.memory_scanner.rescan_memory(1235, DynamicComparisonType.MATCH)
+    assert addresses == [0xC100]
+    addresses = pyboy.memory_scanner.rescan_memory(None, DynamicComparisonType.UNCHANGED)
+    assert addresses == [0xC100]
+    pyboy.memory[0xC101] = 0x13
+    addresses = pyboy.memory_scanner.rescan_memory(None, DynamicComparisonType.INCREASED)
+    assert addresses == [0xC100]
+
+
 SCORE_100 = 0xD072
 
 
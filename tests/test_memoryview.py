@@ -164,6 +164,42 @@ def test_get_set_override(default_rom):
     pyboy.stop(save=False)
 
 
+def test_regions(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy.set_emulation_speed(0)
+    pyboy.tick(60, False, False)
+
+    wram = pyboy.memory.wram
+    assert wram.shape == (0x2000,)
+    assert list(wram[0x100:0x110]) == pyboy.memory[0xC100:0xC110]
+    wram[0x10:0x14] = [1, 2, 3, 4]
+    assert pyboy.memory[0xC010:0xC014] == [1, 2, 3, 4]
+    pyboy.memory[0xC020] = 123
+    assert wram[0x20] == 123
+
+    hram = pyboy.memory.hram
+    assert hram.shape == (0x7F,)
+    hram[0] = 42
+    assert pyboy.memory[0xFF80] == 42
+
+    oam = pyboy.memory.oam
+    assert list(oam) == pyboy.memory[0xFE00:0xFEA0]
+
+    vram = pyboy.memory.vram(0)
+    assert list(vram) == pyboy.memory[0x8000:0xA000]
+    with pytest.raises(ValueError):
+        vram[0] = 1
+    with pytest.raises(PyBoyInvalidInputException):
+        pyboy.memory.vram(1)
+
+    assert list(pyboy.memory.rom(0)[:0x100]) == pyboy.memory[0, 0:0x100]
+    assert list(pyboy.memory.rom(1)[:0x100]) == pyboy.memory[1, 0x4000:0x4100]
+    with pytest.raises(PyBoyOutOfBoundsException):
+        pyboy.memory.rom(1000)
+
+    pyboy.stop(save=False)
+
+
 def test_boundaries(default_rom):
     pyboy = PyBoy(default_rom, window="null")
     pyboy.set_emulation_speed(0)
@@ -196,3 +232,47 @@ def test_boundaries(default_rom):
     assert pyboy.memory[0x0000] == 1
     assert pyboy.memory[0x3FFF] == 1
     assert pyboy.memory[0x4000] == 123
+
+
+def test_bank_switching_registers(default_rom):
+    pyboy = PyBoy(default_rom, window="null", cgb=True)
+    pyboy.set_emulation_speed(0)
+
+    # WRAM bank is selected through SVBK (0xFF70). Bank 0 selects bank 1.
+    pyboy.memory[1, 0xD000] = 1
+    pyboy.memory[2, 0xD000] = 2
+    pyboy.memory[0xFF70] = 0
+    assert pyboy.memory[0xD000] == 1
+    pyboy.memory[0xFF70] = 2
+    assert pyboy.memory[0xD000] == 2
+    assert pyboy.memory[0xF000] == 2  # Echo RAM follows the selected bank
+    pyboy.memory[0xF001] = 3
+    assert pyboy.memory[2, 0xD001] == 3
+    assert pyboy.memory[1, 0xD001] == 0
+
+    # VRAM bank is selected through VBK (0xFF4F)
+    pyboy.memory[0, 0x9800] = 4
+    pyboy.memory[1, 0x9800] = 5
+    pyboy.memory[0xFF4F] = 1
+    assert pyboy.memory[0x9800] == 5
+    pyboy.memory[0xFF4F] = 0
+    assert pyboy.memory[0x9800] == 4
+
+    pyboy.stop(save=False)
+
+
+def test_memory_view_oam_sprites(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy.tick(60, True)
+    pyboy.memory[0x8FF0:0x9000] = [0xFF] * 16  # Tile 255 in color 3
+    pyboy.memory[0xFF40] = pyboy.memory[0xFF40] | 0b10  # Sprites on
+    pyboy.tick(1, True)
+    assert (pyboy.screen.ndarray[10:18, 20:28, :3] != 0).all()
+
+    # The sprites are picked up by the renderer on the next tick
+    oam = pyboy.memory.oam
+    oam[0:4] = [16 + 10, 8 + 20, 0xFF, 0]
+    pyboy.tick(1, True)
+    assert (pyboy.screen.ndarray[10:18, 20:28, :3] == 0).all()
+    pyboy.stop(save=False)
+
@@ -4,11 +4,16 @@
 #
 import copy
 import io
+import os
+import shutil
+import zlib
 
 import pytest
 
 from pyboy import PyBoy
-from pyboy.utils import IntIOWrapper, cython_compiled
+from pyboy.api import IncrementalSnapshot, Snapshot, StateFile
+from pyboy.api.state_file import write_state_file
+from pyboy.utils import STATE_VERSION, IntIOInterface, IntIOWrapper, PyBoyException, cython_compiled
 
 
 def copy_attrs(obj, allowed_types=("int", "str", "float", "array", "dict", "list", "bool")):
@@ -44,6 +49,10 @@ ignored_attrs = [
     "_tilecache0_raw",
     "_tilecache0_state",
     "sprites_to_render",
+    "sprites_dirty",
+    "sprites_height",
+    "_sprite_buckets",
+    "_sprite_bucket_count",
     "serialbuffer",
     "serialbuffer_count",
     "disable_renderer",  # Not set before calling .tick()
@@ -342,3 +351,395 @@ def test_submodule_states(tetris_rom):
     assert compare_attributes(module_attrs, module_attrs2)  # class attributes
     assert compare_IntIOWrapper(modules, states1, states2)  # class states
     assert saved_state1.getvalue() == saved_state2.getvalue()  # full state
+
+
+@pytest.mark.parametrize("cgb", [False, True])
+def test_state_tile_cache(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy.tick(1, True, False)
+    state_blank = io.BytesIO()
+    pyboy.save_state(state_blank)
+
+    pyboy.tick(60, True, False)
+    state_logo = io.BytesIO()
+    pyboy.save_state(state_logo)
+
+    # Only the tiles changed between the states are invalidated
+    for state in [state_blank, state_logo, state_logo]:
+        state.seek(0)
+        pyboy.load_state(state)
+    pyboy.tick(1, True, False)
+
+    pyboy_fresh = PyBoy(default_rom, window="null", cgb=cgb)
+    state_logo.seek(0)
+    pyboy_fresh.load_state(state_logo)
+    pyboy_fresh.tick(1, True, False)
+    assert (pyboy.screen.ndarray == pyboy_fresh.screen.ndarray).all()
+
+    if not cython_compiled:
+        renderer = pyboy.mb.lcd.renderer
+        state_logo.seek(0)
+        pyboy.load_state(state_logo)
+        for t in range(len(renderer._tilecache0_state)):
+            renderer._tilecache0_state[t] = 1
+        state_logo.seek(0)
+        pyboy.load_state(state_logo)
+        assert all(renderer._tilecache0_state)
+        state_blank.seek(0)
+        pyboy.load_state(state_blank)
+        assert 0 < renderer._tilecache0_state.count(0) < len(renderer._tilecache0_state)
+
+    pyboy.stop(save=False)
+    pyboy_fresh.stop(save=False)
+
+
+@pytest.mark.parametrize("cgb", [False, True])
+def test_state_screen_indexed(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb, screen_indexed=True)
+    pyboy.tick(30, True, False)
+    screen = pyboy.screen.ndarray.copy()
+    frame_hash = pyboy.screen.frame_hash
+    state = io.BytesIO()
+    pyboy.save_state(state)
+    snapshot = pyboy.snapshot()
+    clone = pyboy.clone()
+
+    pyboy.tick(90, True, False)
+    assert (pyboy.screen.ndarray != screen).any()
+    state.seek(0)
+    pyboy.load_state(state)
+    assert (pyboy.screen.ndarray == screen).all()
+    assert pyboy.screen.frame_hash == frame_hash
+
+    pyboy.tick(90, True, False)
+    pyboy.restore(snapshot)
+    assert (pyboy.screen.ndarray == screen).all()
+    assert pyboy.screen.frame_hash == frame_hash
+
+    assert (clone.screen.ndarray == screen).all()
+    assert clone.screen.frame_hash == frame_hash
+
+    # The palette indices are skipped when loaded without indexed mode, and blank when loaded in indexed mode
+    pyboy_rgba = PyBoy(default_rom, window="null", cgb=cgb)
+    state.seek(0)
+    pyboy_rgba.load_state(state)
+    state_rgba = io.BytesIO()
+    pyboy_rgba.save_state(state_rgba)
+    state_rgba.seek(0)
+    pyboy.load_state(state_rgba)
+    assert not pyboy.screen.ndarray.any()
+
+    pyboy.stop(save=False)
+    clone.stop(save=False)
+    pyboy_rgba.stop(save=False)
+
+
+class ByteIO(IntIOInterface):
+    # Only implements single bytes, like the rewind buffers. Buffers are written and read byte by byte.
+    def __init__(self, buf):
+        self.buf = buf
+
+    def write(self, byte):
+        return self.buf.write(bytes([byte]))
+
+    def read(self):
+        return self.buf.read(1)[0]
+
+    def flush(self):
+        pass
+
+
+@pytest.mark.skipif(cython_compiled, reason="This test requires access to internal registers not available in Cython")
+@pytest.mark.parametrize("cgb", [False, True])
+def test_state_buffers(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy.tick(60, True, False)
+
+    # Writing whole buffers gives the same state as writing byte by byte
+    state = io.BytesIO()
+    pyboy.save_state(state)
+    state_bytes = io.BytesIO()
+    pyboy.mb.save_state(ByteIO(state_bytes))
+    assert state.getvalue() == state_bytes.getvalue()
+
+    pyboy.tick(60, True, False)
+    state_bytes.seek(0)
+    pyboy.mb.load_state(ByteIO(state_bytes))
+    state_reloaded = io.BytesIO()
+    pyboy.save_state(state_reloaded)
+    assert state_reloaded.getvalue() == state.getvalue()
+
+    # Same as the state saved byte by byte before the buffers were introduced (state version 14), except for the
+    # version and the indexed screen flag at the end of the renderer
+    with open(f"tests/test_results/{'cgb' if cgb else 'dmg'}_default_rom_v14.state.zlib", "rb") as f:
+        state_v14 = zlib.decompress(f.read())
+    sections = []
+    pyboy.mb.save_state(Snapshot(), sections)
+    renderer_end = dict(sections)["ram"] - 1
+    expected = bytes([STATE_VERSION]) + state_v14[1:renderer_end] + bytes([0]) + state_v14[renderer_end:]
+    assert state.getvalue() == expected
+
+    pyboy.load_state(io.BytesIO(state_v14))
+    state_reloaded = io.BytesIO()
+    pyboy.save_state(state_reloaded)
+    assert state_reloaded.getvalue() == expected
+
+    # A truncated state doesn't load
+    with pytest.raises(PyBoyException):
+        pyboy.load_state(io.BytesIO(state.getvalue()[:-1000]))
+
+    pyboy.stop(save=False)
+
+
+@pytest.mark.parametrize("cgb", [False, True])
+def test_snapshot(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy.tick(60, False, False)
+
+    base_line = io.BytesIO()
+    pyboy.save_state(base_line)
+    snapshot = pyboy.snapshot()
+    assert snapshot.tell() == len(base_line.getvalue())
+
+    # Same content as a state file
+    state = io.BytesIO()
+    snapshot.save_state(state)
+    assert state.getvalue() == base_line.getvalue()
+
+    pyboy.tick(60, True, False)
+    base_line.seek(0)
+    pyboy.load_state(base_line)
+    pyboy.tick(60, True, False)
+    state1 = io.BytesIO()
+    pyboy.save_state(state1)
+
+    # Restoring the same snapshot twice is the same as loading the state
+    for _ in range(2):
+        pyboy.restore(snapshot)
+        pyboy.tick(60, True, False)
+        state2 = io.BytesIO()
+        pyboy.save_state(state2)
+        assert state1.getvalue() == state2.getvalue()
+
+    # Reusing a snapshot overwrites it
+    assert pyboy.snapshot(snapshot) is snapshot
+    state3 = io.BytesIO()
+    snapshot.save_state(state3)
+    assert state3.getvalue() == state2.getvalue()
+
+    # Loading from a state file
+    base_line.seek(0)
+    pyboy.restore(Snapshot.from_state(base_line))
+    state4 = io.BytesIO()
+    pyboy.save_state(state4)
+    assert state4.getvalue() == base_line.getvalue()
+
+    with pytest.raises(PyBoyException):
+        pyboy.restore(base_line)
+
+    pyboy.stop(save=False)
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data):
+        self.data = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        return self.data.readinto(buffer)
+
+
+@pytest.mark.parametrize("compression", ["zlib", "lzma"])
+def test_state_file(default_rom, compression):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy.tick(60, False, False)
+
+    base_line = io.BytesIO()
+    pyboy.save_state(base_line)
+    state = io.BytesIO()
+    pyboy.save_state(state, compression=compression)
+    assert len(state.getvalue()) < len(base_line.getvalue())
+
+    state.seek(0)
+    state_file = StateFile(state)
+    assert state_file.title == pyboy.cartridge_title
+    assert state_file.frame_count == pyboy.frame_count
+    assert state_file.options["cgb"] is False
+    assert "symbols" not in state_file.options and "bootrom" not in state_file.options
+    assert state_file.compression == compression
+    assert "ram" in state_file.sections
+    assert len(state_file.read_section("ram")) > 0
+    assert state_file.read_section("cpu") + state_file.read_section("lcd") in base_line.getvalue()
+
+    # Loads the same as the plain state
+    pyboy.tick(60, True, False)
+    state.seek(0)
+    pyboy.load_state(state)
+    state2 = io.BytesIO()
+    pyboy.save_state(state2)
+    assert state2.getvalue() == base_line.getvalue()
+
+    # Plain states still load
+    base_line.seek(0)
+    pyboy.load_state(base_line)
+
+    # Both formats load from streams which cannot seek, like pipes
+    for saved in [state, base_line]:
+        stream = io.BufferedReader(NonSeekable(saved.getvalue() + b"next"))
+        pyboy.load_state(stream)
+        assert stream.read() == b"next"
+        state2 = io.BytesIO()
+        pyboy.save_state(state2)
+        assert state2.getvalue() == base_line.getvalue()
+
+    # The ROM has to match
+    other_rom = io.BytesIO()
+    write_state_file(
+        other_rom,
+        base_line.getvalue(),
+        [("motherboard", 0)],
+        {"rom_sha256": "0" * 64, "title": "OTHER", "frame_count": 0, "options": {}},
+        compression,
+    )
+    other_rom.seek(0)
+    with pytest.raises(PyBoyException):
+        pyboy.load_state(other_rom)
+
+    pyboy.stop(save=False)
+
+
+@pytest.mark.parametrize("cgb", [False, True])
+def test_snapshot_incremental(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy.tick(60, False, False)
+
+    # A chain of a snapshot per frame
+    chain = [pyboy.snapshot()]
+    states = []
+    for _ in range(10):
+        pyboy.tick(1, True, False)
+        chain.append(pyboy.snapshot_incremental(chain[-1]))
+        state = io.BytesIO()
+        pyboy.save_state(state)
+        states.append(state.getvalue())
+
+    for snapshot, expected in zip(chain[1:], states):
+        assert isinstance(snapshot, IncrementalSnapshot)
+        state = io.BytesIO()
+        snapshot.save_state(state)
+        assert state.getvalue() == expected
+
+        state = io.BytesIO()
+        snapshot.materialize().save_state(state)
+        assert state.getvalue() == expected
+
+    # Only the changed pages are copied
+    pages = chain[-1]._get_pages()
+    assert sum(a is not b for a, b in zip(pages, chain[-2]._get_pages())) < len(pages)
+
+    # Branching from a restored snapshot
+    pyboy.restore(chain[3])
+    state = io.BytesIO()
+    pyboy.save_state(state)
+    assert state.getvalue() == states[2]
+    pyboy.memory[0xC000] = 0x42
+    branch = pyboy.snapshot_incremental(chain[3])
+    state = io.BytesIO()
+    branch.save_state(state)
+    assert state.getvalue() != states[2]
+    pyboy.restore(branch)
+    assert pyboy.memory[0xC000] == 0x42
+
+    # Writes to a specific bank are tracked as well, also when the parent isn't the last snapshot
+    pyboy.memory[0, 0xC010] = 0x43
+    branch2 = pyboy.snapshot_incremental(chain[5])
+    pyboy.restore(branch2)
+    assert pyboy.memory[0xC000] == 0x42
+    assert pyboy.memory[0xC010] == 0x43
+
+    pyboy.stop(save=False)
+
+
+@pytest.mark.parametrize("cgb", [False, True])
+def test_clone(default_rom, cgb):
+    pyboy = PyBoy(default_rom, window="null", cgb=cgb)
+    pyboy.tick(60, False, False)
+    rom_value = pyboy.memory[0, 0x2000]
+    pyboy.hook_register(0, 0x2000, lambda _: None, None)
+
+    clone = pyboy.clone()
+    assert clone.frame_count == pyboy.frame_count
+    # The hook is patched into the ROM of the original only
+    assert clone.memory[0, 0x2000] == rom_value
+
+    state = io.BytesIO()
+    pyboy.save_state(state)
+    state_clone = io.BytesIO()
+    clone.save_state(state_clone)
+    assert state.getvalue() == state_clone.getvalue()
+
+    # Overriding the ROM of a clone doesn't affect the clone it was made from
+    pyboy.hook_deregister(0, 0x2000)
+    clone2 = clone.clone()
+    if not cython_compiled:
+        assert clone2.mb.cpu.decode_cache is clone.mb.cpu.decode_cache
+    clone2.memory[0, 0x2001] = 0xAA
+    assert clone2.memory[0, 0x2001] == 0xAA
+    assert clone.memory[0, 0x2001] != 0xAA
+    assert pyboy.memory[0, 0x2001] != 0xAA
+    if not cython_compiled:
+        # The decoded instructions are copied with the ROM
+        assert clone2.mb.cpu.decode_cache is not clone.mb.cpu.decode_cache
+
+    # The emulators run independently
+    clone.tick(60, True, False)
+    assert clone.frame_count == pyboy.frame_count + 60
+
+    for p in [pyboy, clone, clone2]:
+        p.stop(save=False)
+
+
+def test_clone_ram_hook(default_rom):
+    pyboy = PyBoy(default_rom, window="null")
+    pyboy.tick(60, False, False)
+    pyboy.memory[0xC100:0xC103] = [0x00, 0x18, 0xFD]  # NOP; JR -3
+    pyboy.memory[0xFFFF] = 0
+    pyboy.register_file.PC = 0xC100
+    calls = []
+    pyboy.hook_register(0, 0xC100, lambda context: context.append(1), calls)
+
+    # The hook is patched into the RAM of the original only
+    clone = pyboy.clone()
+    assert clone.memory[0xC100] == 0x00
+    assert clone.tick(1, False, False)
+    assert 0xC100 <= clone.register_file.PC < 0xC103
+
+    pyboy.tick(1, False, False)
+    assert len(calls) > 0
+
+    for p in [pyboy, clone]:
+        p.stop(save=False)
+
+
+def test_clone_ram(default_rom, tmp_path):
+    rom = str(tmp_path / "default_rom.gb")
+    shutil.copyfile(default_rom, rom)
+    pyboy = PyBoy(rom, window="null")
+    pyboy.tick(60, False, False)
+    snapshot = pyboy.snapshot()
+    pyboy.memory[0xC000] = 0xAA
+
+    clone = pyboy.clone()
+    assert clone.memory[0xC000] == 0xAA
+    if not cython_compiled:
+        # Cloning doesn't reset the changes tracked since the last snapshot
+        assert pyboy._dirty_since is snapshot
+        assert pyboy.mb.ram.internal_ram0_dirty[0]
+
+    # The clone doesn't overwrite the cartridge RAM of the original
+    clone.stop()
+    assert not os.path.exists(rom + ".ram")
+    pyboy.stop()
+    assert os.path.exists(rom + ".ram")